@@ -4,18 +4,40 @@ A content-based movie recommender using TF-IDF and cosine similarity.
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
-from PIL import Image
-import base64
 import os
 import sys
-import json
-import urllib.parse
-import urllib.request
+import time
+
+from recommender import load_model, metrics, resolve_posters, telemetry
+from recommender.artifacts import DEFAULT_ARTIFACT_DIR
+from recommender.poster_cache import DEFAULT_DB_PATH, SQLitePosterCache
+from recommender.posters import DEFAULT_DEADLINE
+from recommender.reload import DEFAULT_POLL_INTERVAL, ModelReloader
+from recommender.thumbnails import DEFAULT_THUMBNAIL_DIR, ThumbnailCache
+from recommender.warmup import top_rated_rows
+
+ARTIFACT_DIR = os.environ.get("RECOMMENDER_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+# movies.csv, or a columnar directory from ``python -m recommender columnar convert``
+CATALOG_PATH = os.environ.get("RECOMMENDER_CATALOG", "movies.csv")
+# "tfidf" (fitted vectorizer + neighbor index) or "bitset" (genre bitsets, nothing fitted)
+ENGINE = os.environ.get("RECOMMENDER_ENGINE", "tfidf")
+POSTER_CACHE_PATH = os.environ.get("POSTER_CACHE_PATH", DEFAULT_DB_PATH)
+# Seconds between checks for a changed catalog; 0 disables hot reload
+RELOAD_INTERVAL = float(os.environ.get("RECOMMENDER_RELOAD_INTERVAL", DEFAULT_POLL_INTERVAL))
+THUMBNAIL_DIR = os.environ.get("THUMBNAIL_DIR", DEFAULT_THUMBNAIL_DIR)
+# Served at app/static/ (server.enableStaticServing); thumbnails stored here are linked by URL
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Prometheus metrics: a /metrics sidecar on this port, and/or a file rewritten every 15s
+METRICS_PORT = int(os.environ.get("RECOMMENDER_METRICS_PORT", "0"))
+METRICS_FILE = os.environ.get("RECOMMENDER_METRICS_FILE")
+# Sidebar panel with this rerun's stage timings and cache counters (or ?debug=1)
+DEBUG_PANEL = os.environ.get("RECOMMENDER_DEBUG_PANEL") == "1"
+# Seconds a Top Rated render may wait for posters and thumbnails together
+POSTER_DEADLINE = DEFAULT_DEADLINE
+# Cards are about 240 CSS px wide; the 2x thumbnail keeps them sharp on HiDPI screens
+POSTER_CARD_WIDTH = 480
 
 st.set_page_config(
     page_title="Cinematic — AI Movie Recommender",
@@ -24,6 +46,12 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Stage timings and cache counters for this rerun, logged as one JSON line
+st.session_state.reruns = st.session_state.get("reruns", 0) + 1
+_ctx = get_script_run_ctx()
+trace = telemetry.RerunTrace(session=_ctx.session_id if _ctx else None,
+                             rerun=st.session_state.reruns)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # MODERN 2026 UI — Glassmorphism, gradient mesh, micro-interactions
 # ─────────────────────────────────────────────────────────────────────────────
@@ -775,143 +803,102 @@ div[data-baseweb="notification"] {
 ::-webkit-scrollbar-thumb:hover { background: rgba(167, 139, 250, 0.5); }
 </style>
 """, unsafe_allow_html=True)
+trace.mark("css")
 
 
-@st.cache_data
-def load_movies(csv_path="movies.csv"):
-    """Load and preprocess the movie dataset."""
-    if not os.path.exists(csv_path):
-        st.error(f"Movie dataset not found at: {csv_path}")
-        st.info("Please ensure 'movies.csv' is in the same directory as this script.")
-        sys.exit(1)
+@st.cache_resource(show_spinner=False)
+def get_reloader(csv_path=CATALOG_PATH):
+    """Load the catalog and build the model once per process, then keep it fresh.
+
+    ``cache_resource`` hands every session the same reloader without pickling
+    or copying it. Its models must be treated as read-only; when the catalog
+    file changes a new model is built in the background and swapped in.
+    Fitted artifacts are reused from ``ARTIFACT_DIR`` while the catalog
+    fingerprint is unchanged.
+    """
+    def load(path):
+        return load_model(path, artifact_dir=ARTIFACT_DIR, engine=ENGINE)
 
+    reloader = ModelReloader(csv_path, load, poll_interval=RELOAD_INTERVAL,
+                             artifact_dir=ARTIFACT_DIR).start()
+    metrics.register_reloader(reloader)
+    return reloader
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_exporter():
+    """Expose ``metrics.REGISTRY`` once per process, as configured by the environment."""
+    if METRICS_PORT:
+        try:
+            metrics.serve(METRICS_PORT)
+        except OSError as e:
+            # Another server process on this host already owns the port
+            telemetry.logger.warning(f"metrics port {METRICS_PORT} unavailable: {e}")
+    if METRICS_FILE:
+        metrics.write_periodically(METRICS_FILE)
+    return True
+
+
+def get_model():
+    """The current model snapshot; the first caller waits for the initial build."""
+    reloader = get_reloader()
     try:
-        movies_df = pd.read_csv(csv_path)
-        required_columns = ['title', 'description']
-        if not all(col in movies_df.columns for col in required_columns):
-            st.error(f"CSV file must contain columns: {required_columns}")
-            sys.exit(1)
-
-        movies_df['genres'] = movies_df['description'].str.split(',').apply(lambda x: [g.strip() for g in x])
-        unique_genres_list = sorted({g for gl in movies_df['genres'] for g in gl})
-        return movies_df, unique_genres_list
+        if reloader.ready:
+            return reloader.model
+        with st.spinner("Building the recommender…"):
+            return reloader.wait()
+    except FileNotFoundError as e:
+        st.error(str(e))
+        st.info("Please ensure 'movies.csv' is in the same directory as this script.")
+        sys.exit(1)
     except Exception as e:
         st.error(f"Error loading movie data: {str(e)}")
         sys.exit(1)
 
 
-@st.cache_data
-def compute_similarity_matrix(movies_df):
-    """Pre-compute the TF-IDF similarity matrix for better performance."""
-    tfidf = TfidfVectorizer(ngram_range=(1, 2), min_df=1, stop_words='english')
-    tfidf_matrix = tfidf.fit_transform(movies_df['description'])
-    similarity_matrix = cosine_similarity(tfidf_matrix)
-    return similarity_matrix, tfidf
+@st.cache_data(max_entries=1024, show_spinner=False)
+def get_hybrid_recommendations(_model, catalog_version, movie_title, year=None, top_n=5,
+                               rating_weight=0.3, year_weight=0.1, genre_weight=0.6):
+    """Get movie recommendations using hybrid approach (genre + rating + recency).
 
+    Keyed on the catalog version, the (title, year) seed, weights and
+    ``top_n``; the model snapshot itself is not hashed (leading underscore).
+    """
+    telemetry.miss("recommendations")
+    return _model.recommend(
+        movie_title, year=year, top_n=top_n, rating_weight=rating_weight,
+        year_weight=year_weight, genre_weight=genre_weight,
+    )
 
-@st.cache_data
-def get_hybrid_recommendations(movie_title, movies_df, similarity_matrix, top_n=5,
-                               rating_weight=0.3, year_weight=0.1, genre_weight=0.6):
-    """Get movie recommendations using hybrid approach (genre + rating + recency)."""
-    try:
-        idx = movies_df[movies_df['title'] == movie_title].index[0]
-        genre_sim = similarity_matrix[idx]
-        rating_sim = np.zeros(len(movies_df))
-        year_sim = np.zeros(len(movies_df))
-
-        if 'rating' in movies_df.columns and pd.notna(movies_df.iloc[idx]['rating']):
-            selected_rating = movies_df.iloc[idx]['rating']
-            ratings = movies_df['rating'].fillna(movies_df['rating'].mean())
-            rating_diff = np.abs(ratings - selected_rating)
-            rating_sim = 1 - (rating_diff / 10.0)
-
-        if 'year' in movies_df.columns and pd.notna(movies_df.iloc[idx]['year']):
-            selected_year = movies_df.iloc[idx]['year']
-            years = movies_df['year'].fillna(movies_df['year'].median())
-            year_diff = np.abs(years - selected_year)
-            year_sim = 1 - (year_diff / 100.0)
-            year_sim = np.clip(year_sim, 0, 1)
-
-        combined_sim = (
-            genre_weight * genre_sim +
-            rating_weight * rating_sim +
-            year_weight * year_sim
-        )
 
-        sim_scores = list(enumerate(combined_sim))
-        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-        sim_idx = [i for i, score in sim_scores if i != idx][:top_n]
-        sim_values = [score for i, score in sim_scores if i != idx][:top_n]
+@st.cache_resource(show_spinner=False)
+def get_poster_cache():
+    """Durable poster cache shared by every session (and every server process).
 
-        result = movies_df.iloc[sim_idx].copy()
-        result['similarity_score'] = [round(score * 100, 1) for score in sim_values]
-        return result
-    except IndexError:
-        raise ValueError(f"Movie '{movie_title}' not found in database")
+    One connection for the process; callers pick the catalog version per
+    rerun with ``with_version``, so hot reloads do not open new ones.
+    """
+    return SQLitePosterCache(POSTER_CACHE_PATH)
 
 
-def _wiki_summary(slug):
-    """Hit Wikipedia REST API for a page summary; return dict or None."""
-    encoded = urllib.parse.quote(slug.replace(" ", "_"), safe="_(),%")
-    url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{encoded}"
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "CinematicRecommender/1.0"})
-        with urllib.request.urlopen(req, timeout=5) as r:
-            return json.loads(r.read().decode("utf-8", errors="ignore"))
-    except Exception:
-        return None
-
-
-def _wiki_search(query):
-    """Fallback: use MediaWiki search to find a matching page title."""
-    params = urllib.parse.urlencode({
-        "action": "query", "list": "search", "srsearch": query,
-        "format": "json", "srlimit": 3,
-    })
-    url = f"https://en.wikipedia.org/w/api.php?{params}"
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "CinematicRecommender/1.0"})
-        with urllib.request.urlopen(req, timeout=5) as r:
-            data = json.loads(r.read().decode("utf-8", errors="ignore"))
-        return [h["title"] for h in data.get("query", {}).get("search", [])]
-    except Exception:
-        return []
-
-
-@st.cache_data(ttl=604800, show_spinner=False)
-def fetch_poster(title, year=None):
-    """Return a poster image URL for a movie, sourced from Wikipedia. None if not found."""
-    candidates = []
-    if year and pd.notna(year):
-        candidates.append(f"{title} ({int(year)} film)")
-    candidates += [f"{title} (film)", title]
-
-    def _extract(summary):
-        if not summary:
-            return None
-        img = (summary.get("originalimage") or {}).get("source") \
-              or (summary.get("thumbnail") or {}).get("source")
-        return img
-
-    for slug in candidates:
-        img = _extract(_wiki_summary(slug))
-        if img:
-            return img
-
-    # Search fallback
-    query = f"{title} film" + (f" {int(year)}" if year and pd.notna(year) else "")
-    for hit in _wiki_search(query):
-        img = _extract(_wiki_summary(hit))
-        if img:
-            return img
-    return None
+@st.cache_resource(show_spinner=False)
+def get_thumbnail_cache():
+    """On-disk card thumbnails, served as static files the browser can cache."""
+    root = os.path.abspath(THUMBNAIL_DIR)
+    base_url = None
+    if os.path.commonpath([root, STATIC_DIR]) == STATIC_DIR and root != STATIC_DIR:
+        base_url = "app/static/" + os.path.relpath(root, STATIC_DIR).replace(os.sep, "/")
+    return ThumbnailCache(THUMBNAIL_DIR, base_url=base_url)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Load data
 # ─────────────────────────────────────────────────────────────────────────────
-movies, unique_genres = load_movies()
-similarity_matrix, tfidf_vectorizer = compute_similarity_matrix(movies)
+start_metrics_exporter()
+model = get_model()
+movies, unique_genres = model.movies, model.genres
+trace.fields["catalog_version"] = model.catalog_version
+trace.mark("model")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # HERO
@@ -927,6 +914,7 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+trace.mark("hero")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SIDEBAR
@@ -943,6 +931,7 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### Library")
 
+    catalog_mb = model.catalog.memory_footprint["total"] / 2**20
     year_range = ""
     if 'year' in movies.columns:
         year_range = f"{int(movies['year'].min())}–{int(movies['year'].max())}"
@@ -952,10 +941,13 @@ with st.sidebar:
         <div class="metric-chip"><span class="label">Movies</span><span class="value">{len(movies)}</span></div>
         <div class="metric-chip"><span class="label">Genres</span><span class="value">{len(unique_genres)}</span></div>
         {f'<div class="metric-chip"><span class="label">Era</span><span class="value">{year_range}</span></div>' if year_range else ''}
+        <div class="metric-chip"><span class="label">In memory</span><span class="value">{catalog_mb:.1f} MB</span></div>
         """,
         unsafe_allow_html=True,
     )
 
+trace.mark("sidebar")
+
 # ─────────────────────────────────────────────────────────────────────────────
 # TOP RATED
 # ─────────────────────────────────────────────────────────────────────────────
@@ -991,15 +983,30 @@ if 'rating' in movies.columns:
         if opt in movies.columns:
             top_cols.append(opt)
 
-    top_rated = movies.nlargest(10, 'rating')[top_cols].reset_index(drop=True)
+    top_rated = movies.loc[top_rated_rows(movies), top_cols]
+    # Resolve the whole grid at once under one deadline for the render: posters
+    # first, thumbnails in whatever time is left. Anything not back by then
+    # keeps its gradient placeholder (or links the remote image) for this
+    # render and is picked up from the caches on a later one.
+    render_deadline = time.monotonic() + POSTER_DEADLINE
+    with trace.span("top_rated.posters"):
+        posters = resolve_posters(
+            [model.titles.key(row) for row in top_rated.index], deadline=POSTER_DEADLINE,
+            cache=telemetry.CountingCache(
+                get_poster_cache().with_version(model.catalog_version), "posters"),
+        )
+    thumbnails = get_thumbnail_cache()
+    with trace.span("top_rated.thumbnails"):
+        thumbnails.ensure(posters.values(),
+                          deadline=max(0.0, render_deadline - time.monotonic()))
 
     poster_cols = st.columns(5, gap="small")
 
-    for i, (_, m) in enumerate(top_rated.iterrows()):
+    for i, (row, m) in enumerate(top_rated.iterrows()):
         with poster_cols[i % 5]:
-            c1, c2 = palette_for(m['title'])
-            year_val = m['year'] if 'year' in m and pd.notna(m['year']) else None
-            year_str = f"{int(year_val)}" if year_val is not None else "—"
+            title, year_val = model.titles.key(row)
+            c1, c2 = palette_for(title)
+            year_str = f"{year_val}" if year_val is not None else "—"
             director_str = m['director'] if 'director' in m and pd.notna(m.get('director')) else "Unknown"
             primary_genre = "Film"
             if 'description' in m and pd.notna(m.get('description')):
@@ -1010,10 +1017,13 @@ if 'rating' in movies.columns:
             elif i == 1: tier_class = "top2"
             elif i == 2: tier_class = "top3"
 
-            poster_url = fetch_poster(m['title'], year_val)
+            poster_url = posters.get((title, year_val))
+            if poster_url:
+                # Link the cached thumbnail; the remote original is only a fallback
+                poster_url = thumbnails.url(poster_url, POSTER_CARD_WIDTH) or poster_url
 
             if poster_url:
-                image_html = f'<img class="poster-img" src="{poster_url}" alt="{m["title"]}" loading="lazy" referrerpolicy="no-referrer" />'
+                image_html = f'<img class="poster-img" src="{poster_url}" alt="{title}" loading="lazy" referrerpolicy="no-referrer" />'
             else:
                 image_html = (
                     f'<div class="poster-bg" style="--p1: linear-gradient(135deg, {c1} 0%, {c2} 100%);"></div>'
@@ -1035,7 +1045,7 @@ if 'rating' in movies.columns:
                         </div>
                     </div>
                     <div class="poster-info">
-                        <div class="title">{m['title']}</div>
+                        <div class="title">{title}</div>
                         <div class="meta">
                             <span>{year_str}</span>
                             <span class="dot"></span>
@@ -1047,6 +1057,8 @@ if 'rating' in movies.columns:
                 unsafe_allow_html=True,
             )
 
+trace.mark("top_rated")
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SEARCH + GENRE
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1067,32 +1079,43 @@ with search_col:
         key="search_input",
     )
 
+if search_term:
+    # Ranked lookup in the prebuilt trigram index instead of a regex scan per rerun
+    filtered_by_search = movies.iloc[model.search(search_term)]
+else:
+    filtered_by_search = movies
+
+genre_index = model.catalog.genre_index
+search_rows = filtered_by_search.index.to_numpy() if search_term else None
+# Facet counts for the current search, from the packed genre bitmaps
+genre_counts = genre_index.counts(search_rows)
+
 with genre_col:
     st.markdown('<span class="field-label">Filter by genre</span>', unsafe_allow_html=True)
-    genre = st.selectbox(
+    selected_genres = st.multiselect(
         "Genre",
-        ["All"] + unique_genres,
+        unique_genres,
+        format_func=lambda g: f"{g} ({genre_counts[g]})",
+        placeholder="All genres",
         label_visibility="collapsed",
+        key="genre_filter",
     )
+    match_all = len(selected_genres) > 1 and st.toggle("Match all selected genres", key="genre_match_all")
 
-if search_term:
-    filtered_by_search = movies[
-        movies['title'].str.contains(search_term, case=False, na=False) |
-        (movies['director'].str.contains(search_term, case=False, na=False) if 'director' in movies.columns else False)
-    ]
-else:
-    filtered_by_search = movies
+filtered = filtered_by_search
+if selected_genres:
+    keep = genre_index.filter(selected_genres, match="all" if match_all else "any", rows=search_rows)
+    filtered = filtered_by_search[keep]
 
-filtered = filtered_by_search.copy()
-if genre != "All":
-    filtered = filtered[filtered['genres'].apply(lambda gs: genre in gs)]
+trace.mark("explore")
 
 # Status line
 status_parts = []
 if search_term:
     status_parts.append(f'matching <strong style="color:var(--accent)">"{search_term}"</strong>')
-if genre != "All":
-    status_parts.append(f'in <strong style="color:var(--accent)">{genre}</strong>')
+if selected_genres:
+    joiner = " + " if match_all else " / "
+    status_parts.append(f'in <strong style="color:var(--accent)">{joiner.join(selected_genres)}</strong>')
 status_text = " ".join(status_parts) if status_parts else "in the catalog"
 st.markdown(
     f"""<div style="color: var(--text-mute); font-size: 0.85rem; margin: 0.5rem 0 1rem; font-family: 'JetBrains Mono', monospace;">
@@ -1119,6 +1142,7 @@ if not filtered.empty:
     )
 else:
     st.warning("No movies match your filters. Try a broader search.")
+trace.mark("table")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # RECOMMENDATIONS
@@ -1132,9 +1156,10 @@ pick_col, btn_col = st.columns([3, 1], gap="medium")
 
 with pick_col:
     st.markdown('<span class="field-label">Pick a movie you love</span>', unsafe_allow_html=True)
-    movie = st.selectbox(
+    movie_row = st.selectbox(
         "Movie",
-        filtered['title'].tolist() if not filtered.empty else [],
+        filtered.index.tolist() if not filtered.empty else [],
+        format_func=model.titles.label,
         index=0 if filtered.empty else None,
         label_visibility="collapsed",
         placeholder="Select a film…",
@@ -1145,11 +1170,13 @@ with btn_col:
     get_recs = st.button("Get recommendations →", key="recommend_btn", use_container_width=True)
 
 if get_recs:
-    if movie:
+    if movie_row is not None:
+        movie, movie_year = model.titles.key(movie_row)
         try:
-            with st.spinner(""):
+            with st.spinner(""), trace.span("recommendations.compute"), \
+                    trace.lookup("recommendations", metrics.RECOMMENDATION_SECONDS):
                 recommendations = get_hybrid_recommendations(
-                    movie, movies, similarity_matrix,
+                    model, model.catalog_version, movie, movie_year,
                     top_n=num_recommendations,
                     rating_weight=rating_weight,
                     year_weight=year_weight,
@@ -1203,6 +1230,8 @@ if get_recs:
     else:
         st.warning("Please select a movie first.")
 
+trace.mark("recommendations")
+
 # ─────────────────────────────────────────────────────────────────────────────
 # FOOTER
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1223,3 +1252,22 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+trace.mark("footer")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DEBUG PANEL
+# ─────────────────────────────────────────────────────────────────────────────
+rerun_stats = trace.finish()
+if DEBUG_PANEL or st.query_params.get("debug") == "1":
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown(f"### Debug · rerun {rerun_stats['rerun']}")
+        st.dataframe(
+            pd.DataFrame({"stage": list(rerun_stats["spans"]),
+                          "ms": list(rerun_stats["spans"].values())}),
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption(f"Total {rerun_stats['total_ms']:.1f} ms")
+        for name, counts in rerun_stats["caches"].items():
+            st.caption(f"{name} cache: {counts['hits']} hits · {counts['misses']} misses")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark: st.cache_data vs a shared st.cache_resource model under concurrent sessions.
+
+Each simulated session is a thread (as in the Streamlit server) that performs
+a number of "reruns": fetch the catalog/model from the cache and request
+recommendations for a random title. ``before`` reproduces the old layout where
+every object, including the dense N×N similarity matrix, went through
+``st.cache_data`` and the recommendation key hashed the whole DataFrame and
+matrix; ``after`` uses the shared model.
+
+Usage:
+    python benchmarks/bench_cache_sharing.py --sessions 50 --rows 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+WEIGHTS = [(0.6, 0.3, 0.1), (0.8, 0.1, 0.1), (0.4, 0.4, 0.2)]
+
+
+def current_rss_mb():
+    """Resident set size of this process in MiB (Linux /proc)."""
+    with open('/proc/self/status') as fh:
+        for line in fh:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024.0
+    return float('nan')
+
+
+def peak_rss_mb():
+    """Peak resident set size in MiB.
+
+    Reads ``VmHWM``, which starts afresh at exec; ``ru_maxrss`` would carry
+    over the peak of a large parent that spawned this process.
+    """
+    with open('/proc/self/status') as fh:
+        for line in fh:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def write_scaled_catalog(rows, path):
+    """Tile movies.csv up to ``rows`` rows with unique titles."""
+    base = pd.read_csv(os.path.join(ROOT, 'movies.csv'))
+    reps = -(-rows // len(base))
+    scaled = pd.concat([base] * reps, ignore_index=True).head(rows)
+    copy_no = scaled.index // len(base)
+    scaled['title'] = scaled['title'].where(copy_no == 0, scaled['title'] + ' #' + copy_no.astype(str))
+    scaled.to_csv(path, index=False)
+    return scaled['title'].tolist()
+
+
+def make_before(csv_path):
+    """The pre-change layout: dense N×N matrix, everything behind st.cache_data."""
+    import numpy as np
+    import streamlit as st
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    @st.cache_data
+    def load_movies(path):
+        movies_df = pd.read_csv(path)
+        movies_df['genres'] = movies_df['description'].str.split(',').apply(lambda x: [g.strip() for g in x])
+        return movies_df, sorted({g for gl in movies_df['genres'] for g in gl})
+
+    @st.cache_data
+    def compute_similarity_matrix(movies_df):
+        tfidf = TfidfVectorizer(ngram_range=(1, 2), min_df=1, stop_words='english')
+        return cosine_similarity(tfidf.fit_transform(movies_df['description'])), tfidf
+
+    @st.cache_data
+    def get_hybrid_recommendations(title, movies_df, similarity_matrix, top_n, rw, yw, gw):
+        idx = movies_df[movies_df['title'] == title].index[0]
+        ratings = movies_df['rating'].fillna(movies_df['rating'].mean())
+        rating_sim = 1 - (np.abs(ratings - movies_df.iloc[idx]['rating']) / 10.0)
+        years = movies_df['year'].fillna(movies_df['year'].median())
+        year_sim = np.clip(1 - (np.abs(years - movies_df.iloc[idx]['year']) / 100.0), 0, 1)
+        combined_sim = gw * similarity_matrix[idx] + rw * rating_sim + yw * year_sim
+        sim_scores = sorted(enumerate(combined_sim), key=lambda x: x[1], reverse=True)
+        sim_idx = [i for i, score in sim_scores if i != idx][:top_n]
+        sim_values = [score for i, score in sim_scores if i != idx][:top_n]
+        result = movies_df.iloc[sim_idx].copy()
+        result['similarity_score'] = [round(score * 100, 1) for score in sim_values]
+        return result
+
+    def rerun(title, weights, top_n):
+        movies, _ = load_movies(csv_path)
+        similarity_matrix, _ = compute_similarity_matrix(movies)
+        gw, rw, yw = weights
+        return get_hybrid_recommendations(title, movies, similarity_matrix, top_n, rw, yw, gw)
+
+    return rerun
+
+
+def make_after(csv_path):
+    """The shared-model layout used by app.py."""
+    import streamlit as st
+    from recommender import load_model
+
+    @st.cache_resource
+    def get_model(path):
+        return load_model(path)
+
+    @st.cache_data(max_entries=1024)
+    def get_hybrid_recommendations(title, top_n, rw, yw, gw):
+        return get_model(csv_path).recommend(title, top_n=top_n, rating_weight=rw,
+                                             year_weight=yw, genre_weight=gw)
+
+    def rerun(title, weights, top_n):
+        get_model(csv_path)
+        gw, rw, yw = weights
+        return get_hybrid_recommendations(title, top_n, rw, yw, gw)
+
+    return rerun
+
+
+def run_mode(mode, rows, sessions, reruns, seed):
+    """Run one layout in this process and return a result dict."""
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'movies.csv')
+        titles = write_scaled_catalog(rows, csv_path)
+        rss_start = current_rss_mb()
+        rerun = (make_before if mode == 'before' else make_after)(csv_path)
+
+        t0 = time.perf_counter()
+        rerun(titles[0], WEIGHTS[0], 5)
+        warm_s = time.perf_counter() - t0
+
+        latencies = []
+        lock = threading.Lock()
+        # A small pool of popular titles so the recommendation cache gets hits
+        popular = random.Random(seed).sample(titles, min(len(titles), 25))
+
+        def session(sid):
+            rng = random.Random(seed + sid)
+            local = []
+            for _ in range(reruns):
+                start = time.perf_counter()
+                rerun(rng.choice(popular), rng.choice(WEIGHTS), rng.choice((5, 10)))
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall_s = time.perf_counter() - t0
+
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    return {
+        'mode': mode, 'rows': rows, 'sessions': sessions, 'reruns': len(ms),
+        'warm_s': round(warm_s, 3), 'wall_s': round(wall_s, 3),
+        'p50_ms': round(statistics.median(ms), 3),
+        'p95_ms': round(ms[int(0.95 * (len(ms) - 1))], 3),
+        'p99_ms': round(ms[int(0.99 * (len(ms) - 1))], 3),
+        'rss_start_mb': round(rss_start, 1),
+        'rss_end_mb': round(current_rss_mb(), 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--mode', choices=('before', 'after', 'both'), default='both')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--reruns', type=int, default=20, help='reruns per session')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if args.mode != 'both':
+        print(json.dumps(run_mode(args.mode, args.rows, args.sessions, args.reruns, args.seed)))
+        return
+
+    # Each layout runs in a fresh interpreter so RSS numbers don't bleed together
+    results = []
+    for mode in ('before', 'after'):
+        out = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--rows', str(args.rows),
+             '--sessions', str(args.sessions), '--reruns', str(args.reruns),
+             '--seed', str(args.seed)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    cols = ['mode', 'warm_s', 'wall_s', 'p50_ms', 'p95_ms', 'p99_ms', 'rss_end_mb', 'peak_rss_mb']
+    print(f"rows={args.rows} sessions={args.sessions} reruns/session={args.reruns}")
+    print('  '.join(f'{c:>11}' for c in cols))
+    for r in results:
+        print('  '.join(f'{r[c]:>11}' for c in cols))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading the catalog from movies.csv vs the columnar directory format.
+
+Each loader runs in a fresh interpreter. ``load_s`` is the wall time of the
+load, ``rss_mb`` the growth of the resident set over the post-import
+baseline, ``peak_mb`` the process peak and ``frame_mb`` the deep in-memory
+size of the resulting DataFrame. ``*-raw`` only reads the table; ``csv`` and
+``columnar`` run the full ``read_catalog`` (genre lists, genre index, title
+index, features).
+
+Usage:
+    python benchmarks/bench_catalog_format.py --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_cache_sharing import current_rss_mb, peak_rss_mb, write_scaled_catalog
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from recommender import read_catalog
+from recommender.columnar import memory_report, read_columnar, write_columnar
+
+LOADERS = {
+    'csv-raw': pd.read_csv,
+    'columnar-raw': read_columnar,
+    'csv': lambda path: read_catalog(path).movies,
+    'columnar': lambda path: read_catalog(path).movies,
+}
+
+
+def run_loader(name, path):
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    movies = LOADERS[name](path)
+    elapsed = time.perf_counter() - start
+    return {
+        'loader': name,
+        'load_s': round(elapsed, 3),
+        'rss_mb': round(current_rss_mb() - baseline, 1),
+        'peak_mb': round(peak_rss_mb(), 1),
+        'frame_mb': round(memory_report(movies)['total'] / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--loader', choices=sorted(LOADERS))
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.loader:
+        print(json.dumps(run_loader(args.loader, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'movies.csv')
+        cols_path = os.path.join(tmp, 'movies.cols')
+        write_scaled_catalog(args.rows, csv_path)
+        start = time.perf_counter()
+        write_columnar(pd.read_csv(csv_path), cols_path)
+        convert_s = time.perf_counter() - start
+        sizes = {
+            'csv': os.path.getsize(csv_path),
+            'columnar': sum(e.stat().st_size for e in os.scandir(cols_path)),
+        }
+
+        results = []
+        for name in ('csv-raw', 'columnar-raw', 'csv', 'columnar'):
+            path = csv_path if name.startswith('csv') else cols_path
+            out = subprocess.run(
+                [sys.executable, __file__, '--loader', name, '--path', path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"rows={args.rows} convert_s={convert_s:.2f} "
+          f"on_disk: csv {sizes['csv'] / 2**20:.1f} MB, columnar {sizes['columnar'] / 2**20:.1f} MB")
+    cols = ['loader', 'load_s', 'rss_mb', 'peak_mb', 'frame_mb']
+    print('  '.join(f'{c:>12}' for c in cols))
+    for r in results:
+        print('  '.join(f'{r[c]:>12}' for c in cols))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start model load with and without persisted artifacts.
+
+Every measurement runs in a fresh interpreter so module imports and file
+reads are as cold as they are after a deploy. Three cases are reported:
+no artifact directory (fit every time), first start with an empty artifact
+directory (fit + save), and a start that finds matching artifacts.
+
+Usage:
+    python benchmarks/bench_cold_start.py --rows 291 20000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_cache_sharing import ROOT, write_scaled_catalog
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from recommender import load_model
+t1 = time.perf_counter()
+model = load_model({csv!r}, artifact_dir={artifacts!r})
+t2 = time.perf_counter()
+print(json.dumps({{"import_s": t1 - t0, "load_s": t2 - t1,
+                  "from_artifacts": model.loaded_from_artifacts}}))
+"""
+
+
+def cold_start(csv_path, artifact_dir):
+    code = _CHILD.format(root=ROOT, csv=csv_path, artifacts=artifact_dir)
+    out = subprocess.run([sys.executable, '-c', code], check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[291, 20000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'case':<16}  {'import_s':>8}  {'load_s':>8}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'movies.csv')
+            write_scaled_catalog(rows, csv_path)
+            artifact_dir = os.path.join(tmp, 'artifacts')
+            cases = [
+                ('no artifacts', None),
+                ('first build', artifact_dir),
+                ('from artifacts', artifact_dir),
+            ]
+            for name, directory in cases:
+                r = cold_start(csv_path, directory)
+                print(f"{rows:>8}  {name:<16}  {r['import_s']:>8.2f}  {r['load_s']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: applying a daily catalog delta incrementally vs rebuilding the model.
+
+The delta appends ``--append`` new titles, re-genres ``--update`` titles
+and deletes ``--delete`` titles. ``rebuild_s`` refits TF-IDF and rebuilds the
+neighbor index on the edited catalog, ``delta_s`` runs ``apply_delta``.
+``short_lists`` counts neighbor lists left below K by deletions, and
+``scores@5`` is the share of random seeds whose top-5 hybrid scores are the
+same from both models (tiled catalogs are full of exact ties, so the rows
+themselves may differ between equally good picks).
+
+Usage:
+    python benchmarks/bench_incremental.py --rows 20000 100000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench_cache_sharing import write_scaled_catalog
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import build_model, hybrid_recommendations, read_catalog
+from recommender.catalog import Catalog
+
+
+def make_delta(movies, n_append, n_update, n_delete, rng):
+    columns = [c for c in movies.columns if c != 'genres']
+    rows = rng.choice(len(movies), n_append + n_update + n_delete, replace=False)
+    append = movies.iloc[rows[:n_append]][columns].reset_index(drop=True)
+    append['title'] = append['title'] + ' (new)'
+    update = movies.iloc[rows[n_append:n_append + n_update]][columns].copy()
+    update.index = rows[n_append:n_append + n_update]
+    update['description'] = movies['description'].iloc[
+        rng.choice(len(movies), n_update)].astype(str).to_numpy()
+    return append, update, rows[n_append + n_update:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[20000])
+    parser.add_argument('--append', type=int, default=300)
+    parser.add_argument('--update', type=int, default=50)
+    parser.add_argument('--delete', type=int, default=50)
+    parser.add_argument('--seeds', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'rebuild_s':>9}  {'delta_s':>8}  {'short_lists':>11}  {'scores@5':>8}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'movies.csv')
+            write_scaled_catalog(rows, csv_path)
+            model = build_model(read_catalog(csv_path))
+
+        rng = np.random.default_rng(0)
+        append, update, delete = make_delta(model.movies, args.append, args.update,
+                                            args.delete, rng)
+        start = time.perf_counter()
+        edited = model.apply_delta(append=append, update=update, delete=delete)
+        delta_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rebuilt = build_model(Catalog.from_frame(
+            edited.movies.drop(columns='genres').copy()), top_k=model.top_k)
+        rebuild_s = time.perf_counter() - start
+
+        index = edited.neighbor_index
+        short = int(((index.indices >= 0).sum(axis=1) < index.k).sum())
+        seeds = rng.choice(len(edited), min(args.seeds, len(edited)), replace=False)
+        same = statistics.mean(
+            hybrid_recommendations(s, edited.catalog, edited.similarity)['similarity_score'].tolist()
+            == hybrid_recommendations(s, rebuilt.catalog, rebuilt.similarity)['similarity_score'].tolist()
+            for s in seeds)
+        print(f"{rows:>8}  {rebuild_s:>9.2f}  {delta_s:>8.2f}  {short:>11}  {same:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
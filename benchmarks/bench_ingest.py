@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: whole-file CSV conversion vs chunked streaming ingestion.
+
+``full`` reads the whole CSV with ``pd.read_csv`` and writes the columnar
+directory with ``write_columnar``. ``stream`` runs ``recommender.ingest``
+with the given chunk size. Each mode runs in a fresh interpreter, and
+``peak_mb`` is that process's peak resident set.
+
+Usage:
+    python benchmarks/bench_ingest.py --rows 1000000 --chunksize 100000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_cache_sharing import current_rss_mb, peak_rss_mb, write_scaled_catalog
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from recommender.columnar import write_columnar
+from recommender.ingest import ingest
+
+
+def run_mode(mode, csv_path, out_path, chunksize):
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    if mode == 'full':
+        write_columnar(pd.read_csv(csv_path), out_path)
+    else:
+        ingest(csv_path, out_path, chunksize=chunksize)
+    return {
+        'mode': mode,
+        'chunksize': chunksize if mode == 'stream' else '-',
+        'wall_s': round(time.perf_counter() - start, 2),
+        'baseline_mb': round(baseline, 1),
+        'peak_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, nargs='+', default=[100_000])
+    parser.add_argument('--modes', nargs='+', choices=('full', 'stream'), default=['full', 'stream'])
+    parser.add_argument('--csv', help='existing catalog to ingest instead of a tiled one')
+    parser.add_argument('--run', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, csv_path, out_path, chunksize = args.run
+        print(json.dumps(run_mode(mode, csv_path, out_path, int(chunksize))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv or os.path.join(tmp, 'movies.csv')
+        if not args.csv:
+            write_scaled_catalog(args.rows, csv_path)
+        runs = [('full', 0)] if 'full' in args.modes else []
+        runs += [('stream', size) for size in args.chunksize] if 'stream' in args.modes else []
+        results = []
+        for mode, chunksize in runs:
+            out = subprocess.run(
+                [sys.executable, __file__, '--run', mode, csv_path,
+                 os.path.join(tmp, 'movies.cols'), str(chunksize)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"csv={args.csv}" if args.csv else f"rows={args.rows}")
+    cols = ['mode', 'chunksize', 'wall_s', 'baseline_mb', 'peak_mb']
+    print('  '.join(f'{c:>11}' for c in cols))
+    for r in results:
+        print('  '.join(f'{r[c]:>11}' for c in cols))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Load harness: concurrent app.py sessions driven through Streamlit's AppTest.
+
+Each simulated user is a thread with its own ``AppTest`` session. All
+sessions share this process, and with it the ``st.cache_resource`` model and
+the ``st.cache_data`` recommendation cache, just as they share one server
+process. Every session loads the page and then repeats a realistic flow, one
+rerun per step:
+
+1. move the genre/rating/era weight sliders
+2. search for a title prefix
+3. pick a genre from the filter
+4. select a movie and click "Get recommendations"
+
+Posters resolve against a local fake Wikipedia serving real JPEGs, so the
+Top Rated grid, the poster cache and the thumbnails all run offline. For each
+session count the harness reports rerun latency percentiles, reruns per
+second, and process RSS: the current value and the peak during that level.
+``--json`` keeps the results.
+
+Usage:
+    python benchmarks/bench_load.py --sessions 1 2 4 8 16 --iterations 3
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_cache_sharing import ROOT, current_rss_mb, peak_rss_mb
+from bench_suite import reset_peak_rss
+from synthetic_catalog import write_catalog
+
+sys.path.insert(0, ROOT)
+
+from tests.fake_wikipedia import FakeWikipedia
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+
+def _jpeg(seed):
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.new('RGB', (600, 900), ((seed * 37) % 256, (seed * 91) % 256, 120)).save(out, 'JPEG')
+    return out.getvalue()
+
+
+def poster_pages(movies):
+    """``({page title: image path}, {image path: JPEG bytes})`` for every title.
+
+    Each title's poster is the page image of its '(year film)' page; the first
+    50 paths serve real JPEGs and the rest fail to download.
+    """
+    from recommender.posters import candidate_slugs
+
+    pages = {}
+    for i, (title, year) in enumerate(zip(movies['title'], movies['year'])):
+        pages[candidate_slugs(title, year)[0]] = f'/img/{i}.jpg'
+    images = {path: _jpeg(i) for i, path in enumerate(list(pages.values())[:50])}
+    return pages, images
+
+
+def share_runtime():
+    """Make concurrent AppTest sessions share process state as one server does.
+
+    ``AppTest.run`` installs a mock runtime singleton and clears it when it
+    returns, which pulls it from under any other session still running, so
+    reads fall back to the last runtime installed. Each run also compiles
+    app.py into a fresh ``ScriptCache``; a server compiles once, and
+    concurrent compiles can trip a CPython 3.11 AST bug, so one cache is
+    shared. Runs patch ``global.appTest`` in and out around themselves as
+    well, so it is set for good.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    config.set_option("global.appTest", True)
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    last = []
+
+    def current(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        return last[0] if last else None
+
+    def instance(cls):
+        runtime = current(cls)
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: current(cls) is not None)
+
+
+def search_terms(movies, n, rng):
+    titles = movies['title'].dropna().to_numpy()
+    return [str(t).split()[0][:4] for t in rng.choice(titles, n)]
+
+
+class Session(threading.Thread):
+    """One simulated user running ``iterations`` flows; records each rerun's latency."""
+
+    def __init__(self, seed, iterations, terms, genres, latencies, errors, timeout):
+        super().__init__(daemon=True)
+        self.rng = random.Random(seed)
+        self.iterations = iterations
+        self.terms = terms
+        self.genres = genres
+        self.latencies = latencies
+        self.errors = errors
+        self.timeout = timeout
+
+    def rerun(self, at):
+        start = time.perf_counter()
+        at.run(timeout=self.timeout)
+        self.latencies.append(time.perf_counter() - start)
+        if at.exception:
+            self.errors.append(at.exception[0].value)
+
+    def run(self):
+        from streamlit.testing.v1 import AppTest
+
+        try:
+            at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+            self.rerun(at)
+            for _ in range(self.iterations):
+                sliders = at.sidebar.slider
+                for slider in sliders[:3]:
+                    slider.set_value(round(self.rng.uniform(0, 1), 1))
+                self.rerun(at)
+
+                at.text_input(key='search_input').set_value(self.rng.choice(self.terms))
+                self.rerun(at)
+
+                genre_filter = at.multiselect(key='genre_filter')
+                if genre_filter.options:
+                    genre_filter.set_value([self.rng.choice(self.genres)])
+                    self.rerun(at)
+
+                picker = at.selectbox[0]
+                if not picker.options:
+                    at.multiselect(key='genre_filter').set_value([])
+                    at.text_input(key='search_input').set_value('')
+                    self.rerun(at)
+                    picker = at.selectbox[0]
+                picker.select_index(self.rng.randrange(len(picker.options)))
+                at.button(key='recommend_btn').click()
+                self.rerun(at)
+        except Exception as e:
+            self.errors.append(repr(e))
+
+
+def run_level(sessions, args, terms, genres):
+    latencies, errors = [], []
+    reset_peak_rss()
+    start = time.perf_counter()
+    threads = [Session(args.seed * 1000 + i, args.iterations, terms, genres, latencies, errors,
+                       args.timeout) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    ms = np.array(latencies) * 1e3
+    return {
+        "sessions": sessions, "reruns": len(latencies), "wall_s": wall,
+        "reruns_per_s": len(latencies) / wall,
+        "p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)), "max_ms": float(ms.max()),
+        "rss_mb": current_rss_mb(), "peak_rss_mb": peak_rss_mb(), "errors": errors[:5],
+        "error_count": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--iterations', type=int, default=3, help='flows per session')
+    parser.add_argument('--rows', type=int, help='synthetic catalog size (default: movies.csv)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300.0, help='per-rerun timeout')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_path = os.path.join(ROOT, 'movies.csv')
+        if args.rows:
+            catalog_path = os.path.join(tmp, 'movies.csv')
+            write_catalog(args.rows, catalog_path, seed=args.seed)
+        movies = pd.read_csv(catalog_path)
+        with FakeWikipedia() as wiki:
+            # recommender.posters reads WIKIPEDIA_BASE_URL on import, so set it first
+            os.environ.update({
+                'RECOMMENDER_CATALOG': catalog_path,
+                'RECOMMENDER_ARTIFACT_DIR': os.path.join(tmp, 'artifacts'),
+                'RECOMMENDER_RELOAD_INTERVAL': '0',
+                'RECOMMENDER_RERUN_LOG': '0',
+                'POSTER_CACHE_PATH': os.path.join(tmp, 'posters.sqlite3'),
+                'THUMBNAIL_DIR': os.path.join(tmp, 'thumbnails'),
+                'WIKIPEDIA_BASE_URL': wiki.url,
+            })
+            pages, images = poster_pages(movies)
+            wiki.images.update(images)
+            wiki.pages.update({title: wiki.url + path for title, path in pages.items()})
+            rng = np.random.default_rng(args.seed)
+            terms = search_terms(movies, 50, rng)
+            genres = sorted({g.strip() for d in movies['description'].dropna() for g in d.split(',')})
+
+            share_runtime()
+            # Build the model and warm the poster caches once, outside the timings
+            Session(args.seed, 0, terms, genres, [], [], args.timeout).run()
+
+            print(f"{'sessions':>8}  {'reruns':>6}  {'reruns/s':>8}  {'p50_ms':>7}  {'p95_ms':>7}  "
+                  f"{'p99_ms':>7}  {'max_ms':>8}  {'rss_mb':>7}  {'peak_mb':>7}  errors")
+            results = []
+            for sessions in args.sessions:
+                r = run_level(sessions, args, terms, genres)
+                results.append(r)
+                print(f"{sessions:>8}  {r['reruns']:>6}  {r['reruns_per_s']:>8.1f}  {r['p50_ms']:>7.0f}  "
+                      f"{r['p95_ms']:>7.0f}  {r['p99_ms']:>7.0f}  {r['max_ms']:>8.0f}  "
+                      f"{r['rss_mb']:>7.0f}  {r['peak_rss_mb']:>7.0f}  {r['error_count']}")
+                for error in r['errors']:
+                    print(f"          {error}")
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({"catalog_rows": len(movies), "iterations": args.iterations,
+                       "results": results}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
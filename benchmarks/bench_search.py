@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: str.contains scan vs the trigram SearchIndex for Explore search.
+
+The catalog is movies.csv tiled up to the requested size (every copy gets a
+``#n`` title suffix), so common words match a realistic share of rows.
+
+Usage:
+    python benchmarks/bench_search.py --rows 10000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_cache_sharing import write_scaled_catalog
+from bench_topk import best_of
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender.search import SearchIndex
+
+QUERIES = ['nolan', 'dark knight', 'pulp', 'amélie', 'kill bill', 'zzz', 'the', 'ki']
+
+
+def legacy_search(movies, term):
+    return movies[
+        movies['title'].str.contains(term, case=False, na=False) |
+        movies['director'].str.contains(term, case=False, na=False)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'movies.csv')
+            write_scaled_catalog(rows, csv_path)
+            movies = pd.read_csv(csv_path)
+
+        t0 = time.perf_counter()
+        index = SearchIndex(movies)
+        build_s = time.perf_counter() - t0
+        print(f"\n{rows} rows, index build {build_s:.2f}s")
+        print(f"{'query':<14}  {'matches':>8}  {'scan_ms':>9}  {'index_ms':>9}  {'top50_ms':>9}  same")
+        for term in QUERIES:
+            scan_s, old = best_of(lambda: legacy_search(movies, term), args.repeat)
+            index_s, new = best_of(lambda: index.search(term), args.repeat)
+            top_s, _ = best_of(lambda: index.search(term, limit=50), args.repeat)
+            same = set(old.index) == set(new.tolist())
+            print(f"{term:<14}  {len(new):>8}  {scan_s * 1000:>9.2f}  {index_s * 1000:>9.3f}  "
+                  f"{top_s * 1000:>9.3f}  {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TF-IDF + neighbor index vs the bitset genre-similarity engine.
+
+Reports build time, stored bytes and per-click latency of each engine, and
+how closely the bitset engine reproduces the TF-IDF ranking: ``overlap@K``
+is the share of the TF-IDF top-K it returns, ``captured@K`` the share of the
+TF-IDF top-K similarity mass its own top-K carries under TF-IDF scoring
+(ties-aware, since tiled catalogs are full of exact ties), and ``hybrid@5``
+the overlap of the final recommendations with default weights.
+
+Usage:
+    python benchmarks/bench_similarity.py --rows 291 20000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench_cache_sharing import write_scaled_catalog
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from recommender import build_model, hybrid_recommendations, read_catalog
+
+K = 10
+
+
+def agreement(seeds, tfidf_model, bitset_model):
+    overlap, captured, hybrid = [], [], []
+    for seed in seeds:
+        exact = cosine_similarity(tfidf_model.feature_matrix[seed], tfidf_model.feature_matrix)[0]
+        approx = bitset_model.similarity.dense_row(seed)
+        exact[seed] = approx[seed] = -np.inf
+        top_exact = np.argsort(-exact, kind='stable')[:K]
+        top_approx = np.argsort(-approx, kind='stable')[:K]
+        overlap.append(len(set(top_exact) & set(top_approx)) / K)
+        best = exact[top_exact].sum()
+        captured.append(exact[top_approx].sum() / best if best > 0 else 1.0)
+
+        a = hybrid_recommendations(seed, tfidf_model.catalog, tfidf_model.similarity)
+        b = hybrid_recommendations(seed, bitset_model.catalog, bitset_model.similarity)
+        hybrid.append(len(set(a.index) & set(b.index)) / len(a))
+    return statistics.mean(overlap), statistics.mean(captured), statistics.mean(hybrid)
+
+
+def per_click_ms(model, seeds):
+    start = time.perf_counter()
+    for seed in seeds:
+        hybrid_recommendations(seed, model.catalog, model.similarity)
+    return (time.perf_counter() - start) / len(seeds) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[291, 20000])
+    parser.add_argument('--seeds', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'engine':<7}  {'build_s':>8}  {'stored_MB':>9}  {'click_ms':>8}  "
+          f"{'overlap@10':>10}  {'captured@10':>11}  {'hybrid@5':>8}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'movies.csv')
+            write_scaled_catalog(rows, csv_path)
+            catalog = read_catalog(csv_path)
+
+        t0 = time.perf_counter()
+        tfidf = build_model(catalog, engine='tfidf')
+        tfidf_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        bitset = build_model(catalog, engine='bitset')
+        bitset_s = time.perf_counter() - t0
+
+        seeds = np.random.default_rng(0).choice(rows, min(args.seeds, rows), replace=False)
+        overlap, captured, hybrid = agreement(seeds, tfidf, bitset)
+        matrix = tfidf.feature_matrix
+        tfidf_mb = (tfidf.neighbor_index.nbytes + tfidf.similarity.nbytes + matrix.data.nbytes
+                    + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20
+        bitset_mb = bitset.similarity.nbytes / 2**20
+
+        print(f"{rows:>8}  {'tfidf':<7}  {tfidf_s:>8.2f}  {tfidf_mb:>9.2f}  "
+              f"{per_click_ms(tfidf, seeds):>8.2f}")
+        print(f"{rows:>8}  {'bitset':<7}  {bitset_s:>8.3f}  {bitset_mb:>9.4f}  "
+              f"{per_click_ms(bitset, seeds):>8.2f}  {overlap:>10.3f}  {captured:>11.3f}  {hybrid:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup timeline of the app (import, load, fit, first paint).
+
+Each stage runs in a fresh interpreter, as it does after a deploy:
+
+- ``import_s``: running app.py's own leading import statements, read from
+  the file so the stage never drifts from the app
+- ``load_s``: ``load_model`` from prebuilt artifacts
+- ``fit_s``: fitting the model from the catalog, without artifacts
+- ``first_paint_s``: interpreter start to the end of the first app run under
+  ``AppTest``, with prebuilt artifacts and posters from a local fake Wikipedia
+
+``heavy_modules`` lists sklearn/scipy modules loaded by the serving path
+(import + load from artifacts + one recommendation) and should stay empty.
+Use ``--json`` to keep the timeline for comparison between releases.
+
+The run fails (exit status 1) when ``import_s`` exceeds the import budget
+(``--max-import-s``, 0 disables it) or ``heavy_modules`` is not empty.
+
+Usage:
+    python benchmarks/bench_startup.py --rows 291 20000 --json startup.json
+    python benchmarks/bench_startup.py --max-import-s 1.5     # CI budget check
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_cache_sharing import ROOT, write_scaled_catalog
+
+sys.path.insert(0, ROOT)
+
+from tests.fake_wikipedia import FakeWikipedia
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+# app.py measured 0.9s on one CPU at the lazy-import change; headroom for CI noise
+DEFAULT_MAX_IMPORT_S = 1.5
+
+
+def app_imports(path=APP_PATH):
+    """Source of the import statements at the top of app.py, up to its first other statement."""
+    with open(path, encoding='utf-8') as fh:
+        source = fh.read()
+    block = []
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            block.append(ast.get_source_segment(source, node))
+        elif not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)):
+            break
+    return "\n".join(block)
+
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+{imports}
+t1 = time.perf_counter()
+{stage}
+t2 = time.perf_counter()
+heavy = sorted({{m.split('.')[0] for m in sys.modules if m.startswith(('sklearn', 'scipy'))}})
+print(json.dumps({{"import_s": t1 - t0, "stage_s": t2 - t1, "heavy_modules": heavy}}))
+"""
+
+_STAGES = {
+    "import": "",
+    "load": "from recommender import load_model\n"
+            "load_model({csv!r}, artifact_dir={artifacts!r}).recommend('Pulp Fiction')",
+    "fit": "from recommender import build_model, read_catalog\n"
+           "build_model(read_catalog({csv!r}))",
+    "first_paint": "from streamlit.testing.v1 import AppTest\n"
+                   "AppTest.from_file({app!r}, default_timeout=600).run()",
+}
+
+
+def run_stage(stage, csv_path, artifact_dir, env):
+    imports = "" if stage == "first_paint" else app_imports()
+    code = _CHILD.format(root=ROOT, imports=imports, stage=_STAGES[stage].format(
+        csv=csv_path, artifacts=artifact_dir, app=APP_PATH))
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                         text=True, cwd=ROOT, env=env).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def timeline(rows, tmp, wiki_url):
+    csv_path = os.path.join(tmp, 'movies.csv')
+    write_scaled_catalog(rows, csv_path)
+    artifact_dir = os.path.join(tmp, 'artifacts')
+    env = dict(os.environ, RECOMMENDER_CATALOG=csv_path, RECOMMENDER_ARTIFACT_DIR=artifact_dir,
+               RECOMMENDER_RELOAD_INTERVAL='0', WIKIPEDIA_BASE_URL=wiki_url,
+               POSTER_CACHE_PATH=os.path.join(tmp, 'posters.sqlite3'),
+               THUMBNAIL_DIR=os.path.join(tmp, 'thumbnails'))
+    # Prebuild the artifacts the load and first paint stages read
+    run_stage('load', csv_path, artifact_dir, env)
+
+    imported = run_stage('import', csv_path, artifact_dir, env)
+    loaded = run_stage('load', csv_path, artifact_dir, env)
+    return {
+        "rows": rows,
+        "import_s": imported["import_s"],
+        "load_s": loaded["stage_s"],
+        "fit_s": run_stage('fit', csv_path, artifact_dir, env)["stage_s"],
+        "first_paint_s": run_stage('first_paint', csv_path, artifact_dir, env)["stage_s"],
+        "heavy_modules": loaded["heavy_modules"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[291])
+    parser.add_argument('--json', help='also write the timeline to this file')
+    parser.add_argument('--max-import-s', type=float, default=DEFAULT_MAX_IMPORT_S,
+                        help=f'import budget in seconds (default: {DEFAULT_MAX_IMPORT_S}; 0 disables)')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>8}  {'import_s':>8}  {'load_s':>8}  {'fit_s':>8}  {'first_paint_s':>13}  heavy_modules")
+    with FakeWikipedia() as wiki:
+        for rows in args.rows:
+            with tempfile.TemporaryDirectory() as tmp:
+                r = timeline(rows, tmp, wiki.url)
+            results.append(r)
+            print(f"{rows:>8}  {r['import_s']:>8.2f}  {r['load_s']:>8.2f}  {r['fit_s']:>8.2f}  "
+                  f"{r['first_paint_s']:>13.2f}  {','.join(r['heavy_modules']) or '-'}")
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({"python": sys.version.split()[0], "timeline": results}, fh, indent=2)
+
+    failures = []
+    for r in results:
+        if args.max_import_s and r['import_s'] > args.max_import_s:
+            failures.append(f"{r['rows']} rows: import took {r['import_s']:.2f}s "
+                            f"(budget {args.max_import_s:.2f}s)")
+        if r['heavy_modules']:
+            failures.append(f"{r['rows']} rows: serving imported {', '.join(r['heavy_modules'])}")
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
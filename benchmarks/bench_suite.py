@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: per-stage scaling on synthetic catalogs.
+
+For each catalog size a deterministic catalog is generated
+(``synthetic_catalog.py``) and the serving stages run in a fresh interpreter:
+
+- ``load``: ``read_catalog`` (CSV parse, title and genre indexes)
+- ``search_index``: the title/director trigram index, built on first search
+- ``similarity``: ``build_model`` (TF-IDF fit and neighbor index, or bitsets)
+- ``recommend``: ``model.recommend`` for random seed titles, the uncached
+  work behind the app's ``get_hybrid_recommendations``
+- ``explore``: the Explore tab for random queries: search, genre facet
+  counts and a two-genre filter
+- ``posters``: ``resolve_posters`` for random titles, uncached, against a
+  local fake Wikipedia with a fixed per-request delay (most titles have a
+  direct page, some need the search fallback and some have no poster)
+
+Each stage reports wall time, peak RSS (the stage's high-water mark, reset
+through ``/proc/self/clear_refs`` before it starts) and throughput in rows/s
+or queries/s, with p50/p95/max latency for the per-query stages. ``--json``
+writes the results in a form ``regression_gate.py`` can compare.
+
+The TF-IDF neighbor build grows as N², so it is skipped above
+``--max-similarity-rows`` (the later stages are then skipped too).
+
+Usage:
+    python benchmarks/bench_suite.py --rows 10000 100000 1000000 --json bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench_cache_sharing import ROOT, current_rss_mb, peak_rss_mb
+from synthetic_catalog import write_catalog
+
+sys.path.insert(0, ROOT)
+
+from tests.fake_wikipedia import FakeWikipedia
+
+STAGES = ("load", "search_index", "similarity", "recommend", "explore", "posters")
+FAKE_WIKI_DELAY = 0.002
+SCHEMA_VERSION = 1
+
+
+def reset_peak_rss():
+    """Start a new ``VmHWM`` window (Linux 4.0+); a no-op elsewhere."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as fh:
+            fh.write('5')
+    except OSError:
+        pass
+
+
+def measure(stage, rows, fn, count=None, unit='rows/s'):
+    """Run ``fn`` once and return its result and stage record.
+
+    ``fn`` may return per-query latencies in seconds as its second value.
+    """
+    reset_peak_rss()
+    start = time.perf_counter()
+    result, latencies = fn()
+    wall = time.perf_counter() - start
+    record = {
+        "rows": rows, "stage": stage, "wall_s": wall, "peak_rss_mb": peak_rss_mb(),
+        "rss_mb": current_rss_mb(), "throughput": (count or rows) / wall if wall else None,
+        "unit": unit,
+    }
+    if latencies is not None:
+        record["p50_ms"] = float(np.percentile(latencies, 50) * 1e3)
+        record["p95_ms"] = float(np.percentile(latencies, 95) * 1e3)
+        record["max_ms"] = float(np.max(latencies) * 1e3)
+    return result, record
+
+
+def _timed(calls):
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_stages(csv_path, rows, queries, seed, engine, top_k, max_similarity_rows):
+    """All stages on one catalog, in this process; returns the stage records."""
+    from recommender import build_model, read_catalog
+
+    records = []
+    catalog, record = measure('load', rows, lambda: (read_catalog(csv_path), None))
+    records.append(record)
+    _, record = measure('search_index', rows, lambda: (catalog.search_index, None))
+    records.append(record)
+    if engine == 'tfidf' and rows > max_similarity_rows:
+        return records
+
+    model, record = measure('similarity', rows, lambda: (
+        build_model(catalog, top_k=top_k, engine=engine), None))
+    records.append(record)
+
+    rng = np.random.default_rng(seed)
+    keys = [model.titles.key(row) for row in rng.choice(len(model), queries)]
+    _, record = measure('recommend', rows, lambda: (None, _timed(
+        lambda key=key: model.recommend(*key) for key in keys)), count=queries, unit='queries/s')
+    records.append(record)
+
+    genres = model.genres
+    terms = [model.movies['title'].iloc[row].split()[0][:4].lower()
+             for row in rng.choice(len(model), queries)]
+    picks = [[genres[i] for i in rng.choice(len(genres), 2, replace=False)] for _ in terms]
+    index = model.catalog.genre_index
+
+    def explore(term, pick):
+        found = model.search(term)
+        index.counts(found)
+        return index.filter(pick, match='any', rows=found)
+
+    _, record = measure('explore', rows, lambda: (None, _timed(
+        lambda t=t, p=p: explore(t, p) for t, p in zip(terms, picks))),
+        count=queries, unit='queries/s')
+    records.append(record)
+
+    records.append(poster_stage(rows, keys, rng))
+    return records
+
+
+def poster_stage(rows, keys, rng):
+    """Resolve posters for ``keys`` against a fake Wikipedia; returns the stage record."""
+    from recommender.posters import candidate_slugs, resolve_posters, search_query
+
+    keys = list(dict.fromkeys(keys))
+    pages, search = {}, {}
+    for title, year in keys:
+        kind = rng.random()
+        if kind < 0.75:
+            pages[candidate_slugs(title, year)[0]] = f"http://img/{len(pages)}.jpg"
+        elif kind < 0.9:
+            page = f"{title} (movie)"
+            pages[page] = f"http://img/{len(pages)}.jpg"
+            search[search_query(title, year)] = [page]
+    with FakeWikipedia(pages, search=search, delay=FAKE_WIKI_DELAY) as wiki:
+        _, record = measure('posters', rows, lambda: (None, _timed(
+            [lambda: resolve_posters(keys, base_url=wiki.url, deadline=60, cache=None)])),
+            count=len(keys), unit='titles/s')
+    return record
+
+
+def run_size(rows, args):
+    """Generate a ``rows`` catalog and run the stages on it in a fresh interpreter."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'movies.csv')
+        write_catalog(rows, csv_path, seed=args.seed)
+        cmd = [sys.executable, os.path.abspath(__file__), '--worker', csv_path,
+               '--rows', str(rows), '--queries', str(args.queries), '--seed', str(args.seed),
+               '--engine', args.engine, '--top-k', str(args.top_k),
+               '--max-similarity-rows', str(args.max_similarity_rows)]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def environment(args):
+    return {
+        "schema": SCHEMA_VERSION, "python": platform.python_version(),
+        "platform": platform.platform(), "cpus": os.cpu_count(), "seed": args.seed,
+        "engine": args.engine, "top_k": args.top_k, "queries": args.queries,
+    }
+
+
+def print_table(records):
+    print(f"{'rows':>8}  {'stage':<12}  {'wall_s':>8}  {'peak_mb':>8}  {'throughput':>16}  "
+          f"{'p50_ms':>7}  {'p95_ms':>7}  {'max_ms':>8}")
+    for r in records:
+        p50 = f"{r['p50_ms']:>7.2f}" if 'p50_ms' in r else f"{'':>7}"
+        p95 = f"{r['p95_ms']:>7.2f}" if 'p95_ms' in r else f"{'':>7}"
+        worst = f"{r['max_ms']:>8.1f}" if 'max_ms' in r else f"{'':>8}"
+        print(f"{r['rows']:>8}  {r['stage']:<12}  {r['wall_s']:>8.3f}  {r['peak_rss_mb']:>8.1f}  "
+              f"{r['throughput']:>10.0f} {r['unit']:<5}  {p50}  {p95}  {worst}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', choices=('tfidf', 'bitset'), default='tfidf')
+    parser.add_argument('--top-k', type=int, default=256)
+    parser.add_argument('--max-similarity-rows', type=int, default=100000)
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_stages(args.worker, args.rows[0], args.queries, args.seed,
+                                    args.engine, args.top_k, args.max_similarity_rows)))
+        return
+
+    records = []
+    for rows in args.rows:
+        records += run_size(rows, args)
+    print_table(records)
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({"environment": environment(args), "results": records}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
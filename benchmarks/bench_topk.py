@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Python ``sorted`` top-K vs NumPy partition top-K in the hybrid scorer.
+
+A synthetic catalog and a random neighbor index are used so the benchmark
+isolates the per-click scoring and selection cost from the index build.
+
+Usage:
+    python benchmarks/bench_topk.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from recommender import Catalog, NeighborIndex, hybrid_recommendations
+
+
+def synthetic(rows, k=64, seed=0):
+    rng = np.random.default_rng(seed)
+    movies = pd.DataFrame({
+        'title': [f'Movie {i}' for i in range(rows)],
+        'description': 'Drama',
+        'year': rng.integers(1930, 2024, rows).astype(float),
+        'rating': np.round(rng.uniform(4, 9.5, rows), 1),
+    })
+    indices = rng.integers(0, rows, size=(rows, k), dtype=np.int32)
+    scores = np.sort(rng.random((rows, k), dtype=np.float32), axis=1)[:, ::-1].copy()
+    return Catalog(movies, ['Drama']), NeighborIndex(indices, scores)
+
+
+def legacy_recommendations(seed_row, movies_df, neighbor_index, top_n=5,
+                           rating_weight=0.3, year_weight=0.1, genre_weight=0.6):
+    idx = seed_row
+    genre_sim = neighbor_index.dense_row(idx)
+    ratings = movies_df['rating'].fillna(movies_df['rating'].mean())
+    rating_sim = 1 - (np.abs(ratings - movies_df.iloc[idx]['rating']) / 10.0)
+    years = movies_df['year'].fillna(movies_df['year'].median())
+    year_sim = np.clip(1 - (np.abs(years - movies_df.iloc[idx]['year']) / 100.0), 0, 1)
+    combined_sim = genre_weight * genre_sim + rating_weight * rating_sim + year_weight * year_sim
+    # The pre-change selection: enumerate + sorted + two filtering passes
+    sim_scores = sorted(enumerate(combined_sim), key=lambda x: x[1], reverse=True)
+    sim_idx = [i for i, score in sim_scores if i != idx][:top_n]
+    sim_values = [score for i, score in sim_scores if i != idx][:top_n]
+    result = movies_df.iloc[sim_idx].copy()
+    result['similarity_score'] = [round(score * 100, 1) for score in sim_values]
+    return result
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}  {'legacy_ms':>10}  {'partition_ms':>12}  {'speedup':>8}  same")
+    for rows in args.rows:
+        catalog, index = synthetic(rows)
+        seed = rows // 2
+        old_s, old = best_of(lambda: legacy_recommendations(seed, catalog.movies, index, args.top_n), args.repeat)
+        new_s, new = best_of(lambda: hybrid_recommendations(seed, catalog, index, args.top_n), args.repeat)
+        same = old.equals(new)
+        print(f"{rows:>10}  {old_s * 1000:>10.1f}  {new_s * 1000:>12.1f}  {old_s / new_s:>7.1f}x  {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate: a fresh benchmark run against a committed baseline.
+
+The suite (``bench_suite.py``) is rerun with the configuration recorded in
+the baseline: sizes, seed, engine, top-K and query count. Each run is
+repeated ``--repeat`` times and the best value per metric is kept, which
+filters out one-off scheduler noise. Compared per ``(rows, stage)``:
+
+- latency: ``wall_s`` for every stage, plus ``p50_ms``/``p95_ms`` for the
+  per-query stages (recommend, explore, posters)
+- memory: ``peak_rss_mb``
+
+A metric regresses when it exceeds the baseline by more than the relative
+tolerance *and* by more than an absolute floor, so sub-millisecond jitter
+never fails the gate. The tolerances come from the command line and can be
+overridden per stage by a ``"tolerances"`` object in the baseline, e.g.
+``{"posters": {"latency": 1.0}}``. Everything runs offline: catalogs are
+synthetic and posters come from a local fake Wikipedia.
+
+The exit status is 1 when any stage regressed or is missing, and a table
+naming the stages is printed. Timings only compare on the same kind of
+machine. A note is printed when the Python version or CPU count differ from
+the baseline's; re-baseline with ``--update`` when the CI host changes, and
+in the same commit as any change that deliberately moves a stage's cost
+(e.g. the index dtype or block size), so the gate passes on its own tree.
+
+Usage:
+    python benchmarks/regression_gate.py                      # check
+    python benchmarks/regression_gate.py --update             # re-baseline
+    python benchmarks/regression_gate.py --current run.json   # compare a saved run
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import bench_suite
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_ROWS = [10000]
+LATENCY_METRICS = ("wall_s", "p50_ms", "p95_ms")
+MEMORY_METRICS = ("peak_rss_mb",)
+
+
+def run_suite(config, rows, repeat):
+    """Run the suite ``repeat`` times; keep the lowest value of every metric."""
+    args = argparse.Namespace(
+        seed=config.get("seed", 0), engine=config.get("engine", "tfidf"),
+        top_k=config.get("top_k", 256), queries=config.get("queries", 200),
+        max_similarity_rows=max(rows))
+    best = {}
+    for _ in range(repeat):
+        for n in rows:
+            for record in bench_suite.run_size(n, args):
+                key = (record["rows"], record["stage"])
+                if key not in best:
+                    best[key] = dict(record)
+                    continue
+                for metric in LATENCY_METRICS + MEMORY_METRICS:
+                    if metric in record:
+                        best[key][metric] = min(best[key][metric], record[metric])
+                best[key]["throughput"] = max(best[key]["throughput"], record["throughput"])
+    return {"environment": bench_suite.environment(args), "results": list(best.values())}
+
+
+def compare(baseline, current, latency_tol, memory_tol, min_latency_ms, min_memory_mb):
+    """Return ``(rows, failed)``: one table row per compared metric and the failing stages."""
+    overrides = baseline.get("tolerances", {})
+    now = {(r["rows"], r["stage"]): r for r in current["results"]}
+    table, failed = [], []
+    for base in baseline["results"]:
+        key = (base["rows"], base["stage"])
+        tol = overrides.get(base["stage"], {})
+        record = now.pop(key, None)
+        if record is None:
+            table.append((*key, "-", None, None, None, "MISSING"))
+            failed.append(key)
+            continue
+        regressed = False
+        for metric in LATENCY_METRICS + MEMORY_METRICS:
+            if metric not in base or metric not in record:
+                continue
+            if metric in MEMORY_METRICS:
+                limit, floor = tol.get("memory", memory_tol), min_memory_mb
+            else:
+                limit = tol.get("latency", latency_tol)
+                floor = min_latency_ms / (1e3 if metric == "wall_s" else 1)
+            old, new = base[metric], record[metric]
+            bad = new > old * (1 + limit) and new - old > floor
+            regressed |= bad
+            table.append((*key, metric, old, new, limit, "REGRESSED" if bad else "ok"))
+        if regressed:
+            failed.append(key)
+    for key in now:
+        table.append((*key, "-", None, None, None, "NEW"))
+    return table, failed
+
+
+def print_table(table):
+    print(f"{'rows':>8}  {'stage':<12}  {'metric':<11}  {'baseline':>10}  {'current':>10}  "
+          f"{'change':>8}  {'limit':>6}  status")
+    for rows, stage, metric, old, new, limit, status in table:
+        if old is None:
+            print(f"{rows:>8}  {stage:<12}  {metric:<11}  {'':>10}  {'':>10}  {'':>8}  {'':>6}  {status}")
+            continue
+        change = f"{(new - old) / old:+.0%}" if old else "n/a"
+        print(f"{rows:>8}  {stage:<12}  {metric:<11}  {old:>10.3f}  {new:>10.3f}  {change:>8}  "
+              f"{f'+{limit:.0%}':>6}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--current', help='compare this bench_suite --json file instead of running')
+    parser.add_argument('--update', action='store_true', help='write a fresh run as the baseline')
+    parser.add_argument('--rows', type=int, nargs='+',
+                        help='catalog sizes (default: those in the baseline, or 10000)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency-tolerance', type=float, default=0.5,
+                        help='allowed relative slowdown (default: 0.5 = +50%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.2,
+                        help='allowed relative peak RSS growth (default: 0.2 = +20%%)')
+    parser.add_argument('--min-latency-ms', type=float, default=2.0,
+                        help='slowdowns smaller than this never fail')
+    parser.add_argument('--min-memory-mb', type=float, default=16.0,
+                        help='peak RSS growth smaller than this never fails')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    config = baseline["environment"] if baseline else {}
+    rows = args.rows or sorted({r["rows"] for r in baseline["results"]} if baseline else DEFAULT_ROWS)
+
+    if args.current:
+        with open(args.current) as fh:
+            current = json.load(fh)
+    else:
+        current = run_suite(config, rows, args.repeat)
+
+    if args.update:
+        if baseline and "tolerances" in baseline:
+            current["tolerances"] = baseline["tolerances"]
+        with open(args.baseline, 'w') as fh:
+            json.dump(current, fh, indent=2)
+            fh.write('\n')
+        bench_suite.print_table(current["results"])
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; run with --update first", file=sys.stderr)
+        return 2
+
+    for field in ("python", "cpus"):
+        if baseline["environment"].get(field) != current["environment"].get(field):
+            print(f"note: baseline {field} {baseline['environment'].get(field)} "
+                  f"!= current {current['environment'].get(field)}")
+    table, failed = compare(baseline, current, args.latency_tolerance, args.memory_tolerance,
+                            args.min_latency_ms, args.min_memory_mb)
+    print_table(table)
+    if failed:
+        names = ", ".join(f"{stage} ({rows} rows)" for rows, stage in failed)
+        print(f"\nFAIL: regressed or missing: {names}")
+        return 1
+    print("\nOK: no stage regressed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic movie catalogs in the movies.csv schema.
+
+Unlike tiling movies.csv, the generated catalog has its own title words,
+director pool and genre combinations at every size, so search, genre
+filters and TF-IDF see realistic cardinalities. Genres are drawn from the
+movies.csv vocabulary with its observed frequencies. Years lean towards recent
+decades, ratings are roughly normal around 6.5, and a small share of titles
+are remakes that reuse an earlier title with another year. The same
+``(rows, seed)`` always produces the same bytes.
+
+Usage:
+    python benchmarks/synthetic_catalog.py --rows 100000 --out movies_100k.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Genre -> weight, from the genre counts in movies.csv
+GENRES = {
+    "Drama": 184, "Adventure": 77, "Crime": 76, "Action": 66, "Thriller": 59,
+    "Sci-Fi": 42, "Mystery": 41, "Comedy": 36, "Biography": 33, "Fantasy": 33,
+    "Horror": 30, "Romance": 20, "Animation": 18, "War": 15, "Family": 14,
+    "History": 9, "Music": 8, "Western": 2, "Sport": 2, "Musical": 2, "Documentary": 1,
+}
+_WORDS = (
+    "night day dark light last first lost city star road river king queen war "
+    "love blood fire ice iron glass silent secret hidden broken golden black white "
+    "red blue wild lone long short deep high cold hot stone shadow storm rain "
+    "sun moon ghost heart house garden ocean desert mountain island empire kingdom "
+    "return rise fall escape hunt chase dream memory promise legend story tale "
+    "machine code signal echo circle line edge zero one two seven hundred thousand"
+).split()
+_FIRST = (
+    "Ada Alan Alice Anna Ben Carla Chen David Elena Emil Fatima Frank Grace Hugo Ines "
+    "James Jun Kate Leo Lina Marco Maria Mei Nadia Omar Paul Priya Rosa Sam Sofia "
+    "Tom Vera Wei Yusuf Zoe"
+).split()
+_LAST = (
+    "Abbott Bauer Costa Duval Eriksen Fischer Garcia Haddad Ito Jensen Kowalski Lopez "
+    "Moreau Nakamura Okafor Petrov Quinn Rossi Silva Tanaka Ueda Varga Walsh Xu Young Zhou"
+).split()
+
+MISSING_FRACTION = 0.01
+REMAKE_FRACTION = 0.02
+
+
+def _choice(rng, words, size):
+    return np.asarray(words, dtype=object)[rng.choice(len(words), size=size)]
+
+
+def _titles(rng, rows):
+    n_words = rng.choice([1, 2, 3, 4], size=rows, p=[0.25, 0.4, 0.25, 0.1])
+    words = _choice(rng, _WORDS, (rows, 4))
+    titles = pd.Series([" ".join(w[:n]).title() for w, n in zip(words, n_words)])
+    # Sequels rather than exact duplicates, except for the remakes below
+    repeat = titles.groupby(titles).cumcount()
+    titles = titles.where(repeat == 0, titles + " " + (repeat + 1).astype(str))
+    remakes = np.flatnonzero(rng.random(rows) < REMAKE_FRACTION)
+    remakes = remakes[remakes > 0]
+    titles.iloc[remakes] = titles.iloc[rng.integers(0, remakes)].to_numpy()
+    return titles
+
+
+def _descriptions(rng, rows):
+    names = list(GENRES)
+    weights = np.array(list(GENRES.values()), dtype=float)
+    counts = rng.choice([1, 2, 3], size=rows, p=[0.3, 0.45, 0.25])
+    picks = np.argsort(rng.random((rows, len(names))) ** (1.0 / weights), axis=1)[:, ::-1]
+    return pd.Series([", ".join(names[g] for g in row[:n]) for row, n in zip(picks, counts)])
+
+
+def generate_catalog(rows, seed=0, missing=MISSING_FRACTION):
+    """A ``rows``-title DataFrame with the movies.csv columns, fully determined by ``seed``."""
+    rng = np.random.default_rng(seed)
+    titles = _titles(rng, rows)
+    descriptions = _descriptions(rng, rows)
+    years = np.clip(np.round(2024 - rng.gamma(2.0, 12.0, rows)), 1920, 2024)
+    ratings = np.clip(np.round(rng.normal(6.5, 1.0, rows), 1), 1.0, 10.0)
+
+    n_directors = max(50, rows // 5)
+    pool = pd.Series(_choice(rng, _FIRST, n_directors) + " " + _choice(rng, _LAST, n_directors))
+    pool = pool.where(~pool.duplicated(), pool + " " + pool.index.astype(str))
+    popularity = 1.0 / np.arange(1, n_directors + 1) ** 0.8
+    directors = pool.to_numpy()[rng.choice(n_directors, size=rows, p=popularity / popularity.sum())]
+
+    movies = pd.DataFrame({
+        "title": titles,
+        "description": descriptions,
+        "year": pd.array(years, dtype="Int64"),
+        "rating": ratings,
+        "director": directors,
+    })
+    for column in ("year", "rating", "director"):
+        blank = rng.random(rows) < missing
+        if column == "year":
+            # A remake needs its year to be told apart from the original
+            blank &= ~titles.duplicated(keep=False).to_numpy()
+        movies.loc[blank, column] = None
+    return movies
+
+
+def write_catalog(rows, path, seed=0):
+    """Write ``generate_catalog(rows, seed)`` to ``path`` as CSV and return the frame."""
+    movies = generate_catalog(rows, seed)
+    movies.to_csv(path, index=False)
+    return movies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_catalog(args.rows, args.out, args.seed)
+
+
+if __name__ == '__main__':
+    main()
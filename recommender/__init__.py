@@ -0,0 +1,31 @@
+"""
+Recommendation engine used by the Streamlit app.
+"""
+
+from recommender.catalog import Catalog, TitleIndex, read_catalog
+from recommender.features import FeatureArrays
+from recommender.genre_similarity import BitsetSimilarity
+from recommender.model import RecommenderModel, build_model, load_model
+from recommender.neighbors import NeighborIndex, build_neighbor_index
+from recommender.posters import PosterCache, fetch_poster, resolve_posters
+from recommender.scoring import hybrid_recommendations, hybrid_scores
+from recommender.tfidf_similarity import TfidfSimilarity
+
+__all__ = [
+    "BitsetSimilarity",
+    "Catalog",
+    "FeatureArrays",
+    "NeighborIndex",
+    "PosterCache",
+    "RecommenderModel",
+    "TfidfSimilarity",
+    "TitleIndex",
+    "build_model",
+    "build_neighbor_index",
+    "fetch_poster",
+    "hybrid_recommendations",
+    "hybrid_scores",
+    "load_model",
+    "read_catalog",
+    "resolve_posters",
+]
@@ -0,0 +1,44 @@
+"""
+Command-line entry point for the recommender's maintenance tools.
+
+The package ``__init__`` imports ``columnar`` and ``artifacts`` (through the
+catalog and the model), so ``python -m recommender.columnar`` would run a
+second copy of a module that is already in ``sys.modules``, and runpy warns
+about it. This module is never imported by the package, and each tool's
+``main`` is looked up here and called with the remaining arguments.
+
+Usage:
+    python -m recommender columnar convert --csv movies.csv --out movies.cols
+    python -m recommender columnar info movies.cols
+    python -m recommender artifacts build --csv movies.csv --out .artifacts
+    python -m recommender poster_cache warm --csv movies.csv
+    python -m recommender warmup run
+"""
+
+import argparse
+import importlib
+import sys
+
+TOOLS = {
+    "artifacts": "build model artifacts for a catalog",
+    "columnar": "convert and inspect columnar catalogs",
+    "poster_cache": "manage the durable poster cache",
+    "warmup": "warm up the recommender before traffic arrives",
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m recommender",
+                                     description="Recommender maintenance tools.")
+    sub = parser.add_subparsers(dest="tool", required=True)
+    for name, help_text in TOOLS.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+    tool = importlib.import_module(f"recommender.{args.tool}")
+    # The tools' parsers take their usage line from argv[0]
+    sys.argv[0] = f"{parser.prog} {args.tool}"
+    return tool.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Persistent model artifacts keyed by a catalog fingerprint.
+
+A build writes the TF-IDF vocabulary and IDF weights and the feature matrix
+into ``<root>/<fingerprint>/`` as JSON/npy/npz files; no sklearn object is
+pickled. The arrays the scorer reads on every click (neighbor index, exact
+TF-IDF rows, rating and year features) go into one page-aligned ``scoring.bin`` that is mapped
+read-only, so all server processes share it through the page cache.
+
+The fingerprint hashes the CSV bytes together with the model parameters and
+the artifact format version, so any change to one of them selects a fresh
+directory and triggers a rebuild.
+
+Each process holds a shared ``flock`` lease on the directory of every model
+it still uses (``acquire_lease``). ``prune_artifacts`` deletes the
+directories of older fingerprints that nobody holds, so hot reloads don't
+fill the disk.
+
+Loading the scoring arrays needs only NumPy. The vectorizer and feature
+matrix, which are used only to edit the model, are restored separately by
+``load_fitted`` together with their sklearn and scipy imports.
+
+Usage:
+    python -m recommender artifacts build --csv movies.csv --out .artifacts
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): directories are never pruned
+    fcntl = None
+
+from recommender.features import FeatureArrays
+from recommender.neighbors import NeighborIndex
+from recommender.store import open_store, write_store
+from recommender.tfidf_similarity import FIELDS as _SIMILARITY_FIELDS, TfidfSimilarity
+
+FORMAT_VERSION = 6
+DEFAULT_ARTIFACT_DIR = ".artifacts"
+
+_META = "meta.json"
+_VOCABULARY = "vocabulary.json"
+_IDF = "idf.npy"
+_FEATURES = "features.npz"
+_SCORING = "scoring.bin"
+
+_FEATURE_FIELDS = ("ratings", "rating_known", "years", "year_known")
+
+
+def catalog_version(csv_path):
+    """Hex digest of the catalog contents alone.
+
+    A columnar catalog directory hashes the names and bytes of its files.
+    """
+    digest = hashlib.sha256()
+    if os.path.isdir(csv_path):
+        paths = [os.path.join(csv_path, name) for name in sorted(os.listdir(csv_path))]
+    else:
+        paths = [csv_path]
+    for path in paths:
+        if path != csv_path:
+            digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+
+def catalog_fingerprint(csv_path, params, version=None):
+    """Hex digest over the catalog version, the model parameters and the format version."""
+    digest = hashlib.sha256()
+    digest.update((version or catalog_version(csv_path)).encode("utf-8"))
+    digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    digest.update(f"format={FORMAT_VERSION}".encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+def artifact_path(root, fingerprint):
+    return os.path.join(root, fingerprint)
+
+
+def has_artifacts(root, fingerprint):
+    """True if a complete artifact directory exists for ``fingerprint``."""
+    return os.path.exists(os.path.join(artifact_path(root, fingerprint), _META))
+
+
+def save_artifacts(root, fingerprint, params, vectorizer, feature_matrix, neighbor_index,
+                   similarity, features):
+    """Write one artifact directory; published atomically by renaming a temp dir."""
+    import scipy.sparse as sp
+
+    os.makedirs(root, exist_ok=True)
+    final = artifact_path(root, fingerprint)
+    tmp = tempfile.mkdtemp(prefix=f".{fingerprint}-", dir=root)
+    try:
+        terms = [None] * len(vectorizer.vocabulary_)
+        for term, col in vectorizer.vocabulary_.items():
+            terms[col] = term
+        with open(os.path.join(tmp, _VOCABULARY), "w", encoding="utf-8") as fh:
+            json.dump(terms, fh)
+        np.save(os.path.join(tmp, _IDF), vectorizer.idf_)
+        sp.save_npz(os.path.join(tmp, _FEATURES), sp.csr_matrix(feature_matrix), compressed=False)
+        scoring = {
+            "neighbor_indices": neighbor_index.indices,
+            "neighbor_scores": neighbor_index.scores,
+        }
+        for field, array in similarity.arrays.items():
+            scoring[f"tfidf_{field}"] = array
+        for field in _FEATURE_FIELDS:
+            if getattr(features, field) is not None:
+                scoring[field] = getattr(features, field)
+        layout = write_store(os.path.join(tmp, _SCORING), scoring)
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "params": params,
+            "rows": int(feature_matrix.shape[0]),
+            "scoring_layout": layout,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with open(os.path.join(tmp, _META), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+
+        try:
+            os.rename(tmp, final)
+        except OSError:
+            # Another process published the same fingerprint first
+            if not has_artifacts(root, fingerprint):
+                raise
+    finally:
+        if os.path.exists(tmp):
+            shutil.rmtree(tmp, ignore_errors=True)
+    return final
+
+
+def acquire_lease(root, fingerprint):
+    """Share-lock the artifact directory for as long as the returned file stays open.
+
+    ``prune_artifacts`` never deletes a directory that some process holds a
+    lease on. Returns None if the directory does not exist (any more).
+    """
+    try:
+        fh = open(os.path.join(artifact_path(root, fingerprint), _META), "rb")
+    except FileNotFoundError:
+        return None
+    if fcntl is not None:
+        fcntl.flock(fh, fcntl.LOCK_SH)
+    # A pruner may have removed the directory while we waited for the lock
+    if not has_artifacts(root, fingerprint):
+        fh.close()
+        return None
+    return fh
+
+
+def prune_artifacts(root, keep=()):
+    """Delete the artifact directories not in ``keep`` that no process holds a lease on.
+
+    Returns the fingerprints removed. Directories still being written
+    (hidden temp dirs) are left alone.
+    """
+    if fcntl is None or not os.path.isdir(root):
+        return []
+    removed = []
+    for name in sorted(os.listdir(root)):
+        if name.startswith(".") or name in keep:
+            continue
+        try:
+            fh = open(os.path.join(root, name, _META), "rb")
+        except OSError:
+            continue
+        with fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        removed.append(name)
+    return removed
+
+
+def _read_meta(path):
+    with open(os.path.join(path, _META), encoding="utf-8") as fh:
+        meta = json.load(fh)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format in {path}: {meta.get('format_version')}")
+    return meta
+
+
+def load_artifacts(root, fingerprint):
+    """Return ``(neighbor_index, similarity, features, meta)``.
+
+    The neighbor index, the ``TfidfSimilarity`` and the feature arrays are
+    read-only ``np.memmap`` views of ``scoring.bin``; no bytes are copied
+    until the scorer touches them.
+    """
+    path = artifact_path(root, fingerprint)
+    meta = _read_meta(path)
+    mapped = open_store(os.path.join(path, _SCORING), meta["scoring_layout"])
+    neighbor_index = NeighborIndex(mapped["neighbor_indices"], mapped["neighbor_scores"])
+    similarity = TfidfSimilarity(**{field: mapped[f"tfidf_{field}"]
+                                    for field in _SIMILARITY_FIELDS})
+    features = FeatureArrays(*(mapped.get(field) for field in _FEATURE_FIELDS))
+    return neighbor_index, similarity, features, meta
+
+
+def load_fitted(root, fingerprint):
+    """Return ``(vectorizer, feature_matrix)`` restored from the artifact directory."""
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    path = artifact_path(root, fingerprint)
+    params = _read_meta(path)["params"]
+    with open(os.path.join(path, _VOCABULARY), encoding="utf-8") as fh:
+        terms = json.load(fh)
+    vectorizer = TfidfVectorizer(
+        ngram_range=tuple(params["ngram_range"]), min_df=params["min_df"],
+        stop_words=params["stop_words"],
+    )
+    vectorizer.vocabulary_ = {term: col for col, term in enumerate(terms)}
+    vectorizer.idf_ = np.load(os.path.join(path, _IDF))
+    feature_matrix = sp.load_npz(os.path.join(path, _FEATURES)).tocsr()
+    return vectorizer, feature_matrix
+
+
+def main(argv=None):
+    from recommender.columnar import format_report
+    from recommender.model import load_model
+
+    parser = argparse.ArgumentParser(description="Build recommender model artifacts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build (or reuse) artifacts for a catalog")
+    build.add_argument("--csv", default="movies.csv")
+    build.add_argument("--out", default=DEFAULT_ARTIFACT_DIR)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    model = load_model(args.csv, artifact_dir=args.out)
+    elapsed = time.perf_counter() - start
+    source = "reused" if model.loaded_from_artifacts else "built"
+    print(f"{source} {artifact_path(args.out, model.fingerprint)} "
+          f"({len(model)} movies, {elapsed:.2f}s)")
+    print(f"catalog memory: {format_report(model.catalog.memory_footprint)}")
+
+
+if __name__ == "__main__":
+    # The package imports this module, so running it with -m executes a second copy
+    raise SystemExit("usage: python -m recommender artifacts ...")
@@ -0,0 +1,168 @@
+"""
+Catalog loading: read movies.csv (or its columnar conversion) and derive the
+genre columns and lookup indexes.
+"""
+
+import os
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from recommender.columnar import is_columnar, memory_report, read_arrays, read_columnar
+from recommender.features import FeatureArrays
+from recommender.genres import GenreIndex
+from recommender.search import SearchIndex
+
+REQUIRED_COLUMNS = ['title', 'description']
+FEATURE_FIELDS = ("ratings", "rating_known", "years", "year_known")
+
+
+def _normalize_year(year):
+    return int(year) if year is not None and pd.notna(year) else None
+
+
+def _normalize_years(years):
+    """``_normalize_year`` over a whole column, without a per-row ``notna``."""
+    values = pd.Series(years, dtype="object").to_numpy(dtype=np.float64, na_value=np.nan)
+    known = ~np.isnan(values)
+    return [y if k else None for y, k in zip(np.where(known, values, 0).astype(np.int64).tolist(),
+                                               known.tolist())]
+
+
+class TitleIndex:
+    """Hash index from title, or ``(title, year)``, to catalog row id.
+
+    Rows that repeat the same title and year are the same film listed twice;
+    they resolve to the first such row.
+    """
+
+    def __init__(self, titles, years=None):
+        self._titles = list(titles)
+        self._years = _normalize_years(years) if years is not None \
+            else [None] * len(self._titles)
+        self._by_title = {}
+        self._by_title_year = {}
+        for row, (title, year) in enumerate(zip(self._titles, self._years)):
+            if (title, year) not in self._by_title_year:
+                self._by_title_year[(title, year)] = row
+                self._by_title.setdefault(title, []).append(row)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def __contains__(self, title):
+        return title in self._by_title
+
+    def years(self, title):
+        """Distinct release years listed for ``title``."""
+        return [self._years[row] for row in self._by_title.get(title, [])]
+
+    def lookup(self, title, year=None):
+        """Return the row id for ``title``; ``year`` picks between same-named films.
+
+        Raises ``ValueError`` if the title is unknown, or if it names films from
+        several years and no ``year`` was given.
+        """
+        if year is not None:
+            row = self._by_title_year.get((title, _normalize_year(year)))
+            if row is None:
+                raise ValueError(f"Movie '{title}' ({int(year)}) not found in database")
+            return row
+
+        rows = self._by_title.get(title)
+        if not rows:
+            raise ValueError(f"Movie '{title}' not found in database")
+        if len(rows) > 1:
+            years = ", ".join(str(y) for y in self.years(title))
+            raise ValueError(f"Movie '{title}' is ambiguous ({years}); pass a year")
+        return rows[0]
+
+    def key(self, row):
+        """The ``(title, year)`` pair that identifies ``row``."""
+        return self._titles[row], self._years[row]
+
+    def label(self, row):
+        """Display label: the title, plus the year when the title alone is ambiguous."""
+        title, year = self.key(row)
+        if len(self._by_title.get(title, ())) > 1 and year is not None:
+            return f"{title} ({year})"
+        return title
+
+
+class Catalog:
+    """The movie table plus the lookup structures derived from it at load time."""
+
+    def __init__(self, movies, genres, features=None, genre_index=None):
+        self.movies = movies
+        self.genres = genres
+        self.genre_index = genre_index if genre_index is not None \
+            else GenreIndex.from_descriptions(movies['description'])
+        self.titles = TitleIndex(
+            movies['title'], movies['year'] if 'year' in movies.columns else None,
+        )
+        self.features = features if features is not None else FeatureArrays.from_frame(movies)
+
+    @classmethod
+    def from_frame(cls, movies_df, features=None):
+        """Derive the genre list column and indexes for a loaded movie table.
+
+        Adds the ``genres`` column to ``movies_df`` in place.
+        """
+        if not all(col in movies_df.columns for col in REQUIRED_COLUMNS):
+            raise ValueError(f"CSV file must contain columns: {REQUIRED_COLUMNS}")
+        movies_df['genres'] = _genre_lists(movies_df['description'])
+        genre_index = GenreIndex.from_descriptions(movies_df['description'])
+        return cls(movies_df, genre_index.vocabulary, features=features, genre_index=genre_index)
+
+    def __len__(self):
+        return len(self.movies)
+
+    @cached_property
+    def memory_footprint(self):
+        """Deep in-memory bytes per column of the movie table, plus ``"total"``."""
+        return memory_report(self.movies)
+
+    @cached_property
+    def search_index(self):
+        """Title/director search index, built on first use."""
+        return SearchIndex(self.movies)
+
+
+def _genre_lists(descriptions):
+    """Per-row genre lists, parsed once per distinct description.
+
+    Rows with the same description share one list object.
+    """
+    if isinstance(descriptions.dtype, pd.CategoricalDtype):
+        codes, uniques = descriptions.cat.codes.to_numpy(), descriptions.cat.categories
+    else:
+        codes, uniques = pd.factorize(descriptions.astype("object"))
+    lists = np.empty(len(uniques) + 1, dtype=object)
+    lists[:] = [[g.strip() for g in str(desc).split(',')] for desc in uniques] + [[]]
+    return lists[codes]
+
+
+def read_catalog(csv_path="movies.csv", features=None):
+    """Load and preprocess the movie dataset into a ``Catalog``.
+
+    ``csv_path`` is either a CSV file or a columnar catalog directory written
+    by ``recommender.columnar``. ``features`` supplies precomputed
+    ``FeatureArrays`` (e.g. memory-mapped from artifacts) instead of imputing
+    them from the table; a directory written by ``recommender.ingest``
+    carries its own.
+
+    Raises ``FileNotFoundError`` if the catalog is missing and ``ValueError``
+    if it lacks the required columns.
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Movie dataset not found at: {csv_path}")
+
+    if is_columnar(csv_path):
+        movies_df = read_columnar(csv_path)
+        stored = read_arrays(csv_path)
+        if features is None and stored:
+            features = FeatureArrays(*(stored.get(field) for field in FEATURE_FIELDS))
+    else:
+        movies_df = pd.read_csv(csv_path)
+    return Catalog.from_frame(movies_df, features=features)
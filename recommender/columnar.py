@@ -0,0 +1,284 @@
+"""
+Columnar binary catalog: one typed file per column in a directory.
+
+``pd.read_csv`` gives every column a 64-bit or Python-object dtype. The
+columnar format stores each column in its serving dtype instead, so loading
+is a handful of ``np.load`` calls rather than CSV parsing:
+
+* ``title`` (and other free-text columns): UTF-8, NUL-separated, decoded
+  with one ``split``;
+* ``director``, ``description`` (the genre list) and other repetitive text:
+  categorical, as the smallest integer codes that fit plus a category list;
+* ``year``: ``int16``, ``rating``: ``float32``; missing values are kept in a
+  separate validity mask (integers) or as NaN (floats).
+
+Layout of ``movies.cols/``::
+
+    meta.json                       # rows, column order and kinds
+    title.txt
+    director.codes.npy  director.categories.json
+    year.npy  year.valid.npy
+    rating.npy
+
+pyarrow is not a dependency of this project, so Parquet/Arrow is not used.
+
+``convert`` streams the CSV through ``recommender.ingest``.
+
+Usage:
+    python -m recommender columnar convert --csv movies.csv --out movies.cols
+    python -m recommender columnar info movies.cols
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+_META = "meta.json"
+
+# Columns stored as categories regardless of their cardinality
+CATEGORICAL_COLUMNS = ("director", "description")
+INT16_COLUMNS = ("year",)
+FLOAT32_COLUMNS = ("rating",)
+
+
+def is_columnar(path):
+    """True if ``path`` is a columnar catalog directory."""
+    return os.path.isfile(os.path.join(path, _META))
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _kind(name, column):
+    if name in CATEGORICAL_COLUMNS:
+        return "category"
+    if name in INT16_COLUMNS:
+        return "int16"
+    if name in FLOAT32_COLUMNS or pd.api.types.is_float_dtype(column):
+        return "float32"
+    if pd.api.types.is_integer_dtype(column):
+        return "int64"
+    # Free text that repeats a lot is cheaper as a category
+    return "category" if column.nunique() <= len(column) // 2 else "string"
+
+
+class _Column:
+    """Streams one column's chunks into raw part files under the writer's temp dir."""
+
+    def __init__(self, base, name, kind):
+        self.base, self.name, self.kind = base, name, kind
+        self.categories = {}
+        mode = {"string": "txt"}.get(kind, "part")
+        self._data = open(f"{base}.{mode}", "wb")
+        self._valid = open(f"{base}.valid.part", "wb") if kind in ("string", "int16", "int64") else None
+
+    def append(self, column, first):
+        if self.kind == "string":
+            if column.map(lambda v: isinstance(v, str) and "\0" in v).any():
+                raise ValueError(f"Column {self.name!r} contains NUL characters")
+            text = "\0".join(column.fillna("").astype(str))
+            if len(column):
+                self._data.write(("" if first else "\0").encode("utf-8") + text.encode("utf-8"))
+        elif self.kind == "category":
+            codes, uniques = pd.factorize(column.astype("object"))
+            lookup = np.array([self.categories.setdefault(str(v), len(self.categories)) for v in uniques],
+                              dtype=np.int32)
+            out = np.full(len(codes), -1, dtype=np.int32)
+            known = codes >= 0
+            out[known] = lookup[codes[known]]
+            self._data.write(out.tobytes())
+        elif self.kind == "float32":
+            self._data.write(column.to_numpy(dtype=np.float32, na_value=np.nan).tobytes())
+        else:
+            values = column.to_numpy(dtype=np.float64, na_value=0)
+            self._data.write(values.astype(self.kind).tobytes())
+        if self._valid is not None:
+            self._valid.write(column.notna().to_numpy().tobytes())
+
+    def close(self, rows):
+        self._data.close()
+        if self._valid is not None:
+            self._valid.close()
+            _npy_from_part(f"{self.base}.valid.part", f"{self.base}.valid.npy", np.bool_, np.bool_, rows)
+        if self.kind == "category":
+            _npy_from_part(f"{self.base}.part", f"{self.base}.codes.npy", np.int32,
+                           _code_dtype(len(self.categories)), rows)
+            with open(f"{self.base}.categories.json", "w", encoding="utf-8") as fh:
+                json.dump(list(self.categories), fh, ensure_ascii=False)
+        elif self.kind != "string":
+            _npy_from_part(f"{self.base}.part", f"{self.base}.npy", self.kind, self.kind, rows)
+
+
+def _npy_from_part(part, dest, dtype, out_dtype, rows, block=1 << 20):
+    """Copy a raw part file into an ``.npy`` file block by block, then delete it."""
+    out = np.lib.format.open_memmap(dest, mode="w+", dtype=out_dtype, shape=(rows,))
+    itemsize = np.dtype(dtype).itemsize
+    for start in range(0, rows, block):
+        count = min(block, rows - start)
+        out[start:start + count] = np.fromfile(part, dtype=dtype, count=count, offset=start * itemsize)
+    out.flush()
+    del out
+    os.remove(part)
+
+
+class ColumnarWriter:
+    """Write a columnar catalog directory from a stream of DataFrame chunks.
+
+    Column kinds are fixed by the first chunk, and every later chunk must have
+    the same columns. Memory use is bounded by the chunk plus the category
+    dictionaries. The directory is written to a temporary sibling and renamed
+    into place on ``close``. Used as a context manager, it is discarded if the
+    block raises.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._tmp = tempfile.mkdtemp(prefix=".columnar-", dir=parent)
+        self._columns = None
+        self._arrays = []
+
+    def append(self, chunk):
+        if self._columns is None:
+            self._columns = [_Column(os.path.join(self._tmp, name), name, _kind(name, chunk[name]))
+                             for name in chunk.columns]
+        elif list(chunk.columns) != [c.name for c in self._columns]:
+            raise ValueError(f"Chunk columns {list(chunk.columns)} do not match "
+                             f"{[c.name for c in self._columns]}")
+        for column in self._columns:
+            column.append(chunk[column.name], first=self.rows == 0)
+        self.rows += len(chunk)
+
+    def save_array(self, name, array):
+        """Store an extra array alongside the columns; see ``read_arrays``."""
+        np.save(os.path.join(self._tmp, f"_{name}.npy"), array)
+        self._arrays.append(name)
+
+    def close(self):
+        columns = self._columns or []
+        for column in columns:
+            column.close(self.rows)
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": [{"name": c.name, "kind": c.kind} for c in columns],
+            "arrays": self._arrays,
+        }
+        with open(os.path.join(self._tmp, _META), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.rename(self._tmp, self.path)
+        return self.path
+
+    def abort(self):
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_columnar(movies, path):
+    """Write ``movies`` (a DataFrame) as a columnar catalog directory at ``path``."""
+    with ColumnarWriter(path) as writer:
+        writer.append(movies)
+    return path
+
+
+def read_columnar(path):
+    """Load a columnar catalog directory into a DataFrame with compact dtypes.
+
+    Categorical columns come back as ``category``, integer columns as
+    nullable ``Int16``/``Int64``, floats as ``float32``.
+    """
+    with open(os.path.join(path, _META), encoding="utf-8") as fh:
+        meta = json.load(fh)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format in {path}: {meta.get('format_version')}")
+
+    data = {}
+    for column in meta["columns"]:
+        name, kind = column["name"], column["kind"]
+        base = os.path.join(path, name)
+        if kind == "string":
+            with open(f"{base}.txt", "rb") as fh:
+                values = np.array(fh.read().decode("utf-8").split("\0"), dtype=object)
+            if meta["rows"] == 0:
+                values = values[:0]
+            values[~np.load(f"{base}.valid.npy")] = None
+            data[name] = values
+        elif kind == "category":
+            with open(f"{base}.categories.json", encoding="utf-8") as fh:
+                categories = json.load(fh)
+            data[name] = pd.Categorical.from_codes(np.load(f"{base}.codes.npy"), categories)
+        elif kind == "float32":
+            data[name] = np.load(f"{base}.npy")
+        else:
+            values = np.load(f"{base}.npy")
+            mask = ~np.load(f"{base}.valid.npy")
+            data[name] = pd.arrays.IntegerArray(values, mask)
+    return pd.DataFrame(data)
+
+
+def read_arrays(path):
+    """The extra arrays stored with ``ColumnarWriter.save_array``, by name."""
+    with open(os.path.join(path, _META), encoding="utf-8") as fh:
+        names = json.load(fh).get("arrays", [])
+    return {name: np.load(os.path.join(path, f"_{name}.npy")) for name in names}
+
+
+def memory_report(movies):
+    """Deep in-memory size of each column of ``movies``, in bytes, plus ``"total"``."""
+    usage = movies.memory_usage(deep=True, index=False)
+    report = {name: int(size) for name, size in usage.items()}
+    report["total"] = sum(report.values())
+    return report
+
+
+def format_report(report):
+    return ", ".join(f"{name} {size / 2**20:.1f} MB" for name, size in report.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and inspect columnar catalogs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="convert a CSV catalog to the columnar format")
+    convert.add_argument("--csv", default="movies.csv")
+    convert.add_argument("--out", default="movies.cols")
+    convert.add_argument("--chunksize", type=int, default=100_000,
+                         help="rows read from the CSV at a time")
+    sub.add_parser("info", help="show the in-memory size of a catalog").add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        from recommender.ingest import ingest
+
+        rows = ingest(args.csv, args.out, chunksize=args.chunksize)
+        movies = read_columnar(args.out)
+        print(f"wrote {args.out} ({rows} movies)")
+    else:
+        movies = read_columnar(args.path) if is_columnar(args.path) else pd.read_csv(args.path)
+    print(format_report(memory_report(movies)))
+
+
+if __name__ == "__main__":
+    # The package imports this module, so running it with -m executes a second copy
+    raise SystemExit("usage: python -m recommender columnar ...")
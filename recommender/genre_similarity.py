@@ -0,0 +1,75 @@
+"""
+Genre similarity straight from the packed genre bitsets.
+
+The ``description`` column is only a genre list, so instead of a fitted
+TF-IDF vectorizer and a precomputed neighbor index, similarity to a seed can
+be computed on demand from ``GenreIndex`` bitsets. Each genre gets the
+smoothed IDF weight sklearn uses, ``ln((1 + n) / (1 + df)) + 1``, and the
+weighted popcount of a bitset is summed from per-byte lookup tables (one
+256-entry table per byte of the mask), so scoring a seed is a handful of
+vectorized table lookups over the distinct genre combinations plus one
+gather over the rows. Nothing of size N×N or N×K is stored.
+"""
+
+import numpy as np
+
+METRICS = ("cosine", "jaccard")
+
+
+def _byte_tables(weights, words):
+    """``tables[b, v]``: summed weight of the bits set in value ``v`` of mask byte ``b``."""
+    padded = np.zeros(words * 64, dtype=np.float64)
+    padded[:len(weights)] = weights
+    values = np.arange(256, dtype=np.uint8)[:, None]
+    bits = np.unpackbits(values, axis=1, bitorder="little").astype(np.float64)
+    return (bits @ padded.reshape(words * 8, 8).T).T.astype(np.float32)
+
+
+class BitsetSimilarity:
+    """IDF-weighted cosine or Jaccard similarity between genre bitsets.
+
+    Exposes ``dense_row`` like ``NeighborIndex``, so the hybrid scorer can use
+    either engine.
+    """
+
+    def __init__(self, genre_index, metric="cosine"):
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, not {metric!r}")
+        self.genre_index = genre_index
+        self.metric = metric
+
+        n_rows = len(genre_index)
+        df = np.array(list(genre_index.counts().values()), dtype=np.float64)
+        self.idf = np.log((1 + n_rows) / (1 + df)) + 1
+        # Cosine sums w² over the intersection; Jaccard sums w
+        weights = self.idf ** 2 if metric == "cosine" else self.idf
+        self._tables = _byte_tables(weights, genre_index.patterns.shape[1])
+        self._byte_ids = np.arange(self._tables.shape[0])
+        totals = self._weighted_popcount(genre_index.patterns)
+        self._norms = np.sqrt(totals) if metric == "cosine" else totals
+
+    def __len__(self):
+        return len(self.genre_index)
+
+    @property
+    def nbytes(self):
+        return self._tables.nbytes + self._norms.nbytes
+
+    def _weighted_popcount(self, patterns):
+        bytes_ = patterns.astype("<u8").view(np.uint8)
+        return self._tables[self._byte_ids, bytes_].sum(axis=1, dtype=np.float32)
+
+    def pattern_scores(self, pattern):
+        """Similarity of every genre combination to combination ``pattern``."""
+        patterns = self.genre_index.patterns
+        inter = self._weighted_popcount(patterns & patterns[pattern])
+        if self.metric == "cosine":
+            denom = self._norms * self._norms[pattern]
+        else:
+            denom = self._norms + self._norms[pattern] - inter
+        return np.divide(inter, denom, out=np.zeros_like(inter), where=denom > 0)
+
+    def dense_row(self, row):
+        """Similarity of every title to ``row`` as a length-N float32 vector."""
+        codes = self.genre_index.codes
+        return self.pattern_scores(codes[row])[codes]
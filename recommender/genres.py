@@ -0,0 +1,98 @@
+"""
+Genre bitmaps for vectorized filtering and counting.
+
+Every distinct genre combination is packed once into a bitmask (``uint64``
+words, bit ``g`` set for ``vocabulary[g]``) and each row stores the int32 id
+of its combination, a dictionary-encoded bitmask column. Catalogs reuse a
+few hundred combinations, so filtering by one or several genres is a
+bitwise test over those patterns plus one gather over the rows, and
+per-genre counts are a ``bincount`` of the row ids weighted by the pattern
+bits, with no per-row Python.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _unpack(patterns, width):
+    # Little-endian words viewed as bytes keep bit g at unpacked column g
+    bytes_ = patterns.astype("<u8").view(np.uint8)
+    return np.unpackbits(bytes_, axis=1, bitorder="little")[:, :width]
+
+
+class GenreIndex:
+    """Dictionary-encoded multi-hot genre bitmaps over the catalog rows."""
+
+    def __init__(self, vocabulary, patterns, codes):
+        self.vocabulary = list(vocabulary)
+        self.patterns = patterns
+        self.codes = codes
+        self._ids = {genre: i for i, genre in enumerate(self.vocabulary)}
+
+    @classmethod
+    def from_descriptions(cls, descriptions):
+        """Build from comma-separated genre strings, e.g. ``"Action, Crime"``.
+
+        Only the distinct descriptions are parsed; missing descriptions have
+        no genres. A categorical column is used as is.
+        """
+        descriptions = pd.Series(descriptions)
+        if isinstance(descriptions.dtype, pd.CategoricalDtype):
+            codes, uniques = descriptions.cat.codes.to_numpy(), descriptions.cat.categories
+        else:
+            codes, uniques = pd.factorize(descriptions.astype("object"))
+        parsed = [{g.strip() for g in str(desc).split(',') if g.strip()} for desc in uniques]
+        vocabulary = sorted(set().union(*parsed))
+        ids = {genre: i for i, genre in enumerate(vocabulary)}
+
+        words = max(1, -(-len(vocabulary) // 64))
+        # The last pattern is the empty one, for the -1 code of missing descriptions
+        patterns = np.zeros((len(uniques) + 1, words), dtype=np.uint64)
+        for row, genres in enumerate(parsed):
+            for genre in genres:
+                g = ids[genre]
+                patterns[row, g // 64] |= np.uint64(1) << np.uint64(g % 64)
+        codes = np.where(codes < 0, len(uniques), codes).astype(np.int32)
+        return cls(vocabulary, patterns, codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self):
+        return self.patterns.nbytes + self.codes.nbytes
+
+    @property
+    def bits(self):
+        """The per-row bitmask matrix, materialized."""
+        return self.patterns[self.codes]
+
+    def mask(self, genres):
+        """The bitmask selecting ``genres``; raises ``ValueError`` for unknown ones."""
+        mask = np.zeros(self.patterns.shape[1], dtype=np.uint64)
+        for genre in genres:
+            g = self._ids.get(genre)
+            if g is None:
+                raise ValueError(f"Unknown genre: {genre}")
+            mask[g // 64] |= np.uint64(1) << np.uint64(g % 64)
+        return mask
+
+    def filter(self, genres, match="any", rows=None):
+        """Boolean array over ``rows`` (default: all rows) of those having the genres.
+
+        ``match="any"`` keeps rows with at least one of ``genres`` (OR),
+        ``match="all"`` keeps rows with every one of them (AND).
+        """
+        if match not in ("any", "all"):
+            raise ValueError(f"match must be 'any' or 'all', not {match!r}")
+        mask = self.mask(genres)
+        hit = self.patterns & mask
+        keep = (hit == mask).all(axis=1) if match == "all" else hit.any(axis=1)
+        return keep[self.codes if rows is None else self.codes[rows]]
+
+    def counts(self, rows=None):
+        """``{genre: number of rows}`` over ``rows`` (default: all rows)."""
+        codes = self.codes if rows is None else self.codes[rows]
+        per_pattern = np.bincount(codes, minlength=len(self.patterns))
+        totals = per_pattern @ _unpack(self.patterns, len(self.vocabulary)).astype(np.int64)
+        return dict(zip(self.vocabulary, totals.tolist()))
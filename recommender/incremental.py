@@ -0,0 +1,115 @@
+"""
+Incremental catalog edits: append, update and delete titles without a full refit.
+
+The fitted TF-IDF vocabulary and IDF weights stay frozen. New and edited
+descriptions are transformed with them, and the neighbor index is carried
+over by ``update_neighbor_index``, so a delta costs time in proportion to
+the rows it touches. Two things force a full rebuild with a fresh fit
+instead:
+
+* a delta whose descriptions contain terms outside the fitted vocabulary,
+  since a frozen vocabulary would silently drop those genres;
+* a delta that brings the rows changed since the last full fit above
+  ``REFIT_FRACTION`` of the catalog, since the frozen IDF weights drift
+  from what a refit would give.
+
+The bitset engine has nothing fitted and is simply rebuilt, which takes
+milliseconds.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from recommender.catalog import REQUIRED_COLUMNS, Catalog
+from recommender.model import RecommenderModel, build_model
+from recommender.neighbors import update_neighbor_index
+from recommender.tfidf_similarity import TfidfSimilarity
+
+REFIT_FRACTION = 0.1
+
+
+def _row_ids(rows, n_rows, what):
+    rows = np.unique(np.asarray(rows, dtype=np.int64))
+    if len(rows) and (rows[0] < 0 or rows[-1] >= n_rows):
+        raise IndexError(f"{what} rows must be in [0, {n_rows})")
+    return rows
+
+
+def _edited_frame(movies, append, update, update_rows, keep):
+    """The new movie table, with the original column dtypes restored."""
+    columns = [c for c in movies.columns if c != 'genres']
+    dtypes = movies[columns].dtypes
+    base = movies[columns].astype({c: object for c in columns if dtypes[c] == 'category'})
+    if len(update_rows):
+        base = base.copy()
+        base.iloc[update_rows, [base.columns.get_loc(c) for c in update.columns]] = \
+            update.to_numpy(dtype=object)
+    frames = [base[keep]]
+    if append is not None and len(append):
+        frames.append(append.reindex(columns=columns))
+    edited = pd.concat(frames, ignore_index=True)
+    return edited.astype({c: ('category' if dtypes[c] == 'category' else dtypes[c])
+                          for c in columns})
+
+
+def _new_terms(vectorizer, descriptions):
+    analyze = vectorizer.build_analyzer()
+    vocabulary = vectorizer.vocabulary_
+    return any(term not in vocabulary
+               for desc in descriptions.dropna().astype(str).unique() for term in analyze(desc))
+
+
+def apply_delta(model, append=None, update=None, delete=None):
+    """Return a new ``RecommenderModel`` with the edits applied; ``model`` is untouched.
+
+    ``update`` is a DataFrame indexed by the row ids it replaces, ``delete``
+    an iterable of row ids, both in ``model``'s numbering. Deleted rows are
+    removed, later rows shift down, and ``append`` rows go at the end.
+
+    Raises ``ValueError`` for edits missing the required columns, or that
+    update and delete the same row, and ``IndexError`` for unknown row ids.
+    """
+    n_old = len(model)
+    for frame in (append, update):
+        if frame is not None and not all(col in frame.columns for col in REQUIRED_COLUMNS):
+            raise ValueError(f"Edits must contain columns: {REQUIRED_COLUMNS}")
+    update_rows = _row_ids(update.index if update is not None else [], n_old, "Updated")
+    delete_rows = _row_ids(delete if delete is not None else [], n_old, "Deleted")
+    if np.intersect1d(update_rows, delete_rows).size:
+        raise ValueError("A row cannot be both updated and deleted")
+    if update is not None:
+        update = update.loc[update_rows]
+    n_append = len(append) if append is not None else 0
+
+    keep = np.ones(n_old, dtype=bool)
+    keep[delete_rows] = False
+    moved = np.full(n_old, -1, dtype=np.int64)
+    moved[keep] = np.arange(int(keep.sum()))
+    stale = ~keep
+    stale[update_rows] = True
+    changed = np.concatenate((moved[update_rows], np.arange(keep.sum(), keep.sum() + n_append)))
+
+    catalog = Catalog.from_frame(_edited_frame(model.movies, append, update, update_rows, keep))
+    if model.engine == "bitset":
+        return build_model(catalog, engine="bitset", metric=model.similarity.metric)
+
+    changes = model.changes_since_fit + len(update_rows) + len(delete_rows) + n_append
+    descriptions = catalog.movies['description'].iloc[changed]
+    if changes > REFIT_FRACTION * len(catalog) or _new_terms(model.vectorizer, descriptions):
+        return build_model(catalog, top_k=model.top_k)
+
+    # Old rows that survive unchanged keep their vectors; the rest are re-transformed
+    fresh = model.vectorizer.transform(descriptions) if len(changed) \
+        else sp.csr_matrix((0, model.feature_matrix.shape[1]))
+    source = np.empty(len(catalog), dtype=np.int64)
+    source[moved[keep]] = np.flatnonzero(keep)
+    source[changed] = n_old + np.arange(len(changed))
+    feature_matrix = sp.vstack([model.feature_matrix, fresh], format="csr")[source]
+
+    neighbor_index = update_neighbor_index(model.neighbor_index, feature_matrix, moved, stale,
+                                           changed, top_k=model.top_k)
+    similarity = TfidfSimilarity.from_matrix(feature_matrix, catalog.genre_index.codes)
+    return RecommenderModel(catalog, model.vectorizer, neighbor_index, feature_matrix,
+                            similarity=similarity, changes_since_fit=changes,
+                            top_k=model.top_k)
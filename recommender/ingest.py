@@ -0,0 +1,71 @@
+"""
+Streaming ingestion of movies.csv-style catalogs into the columnar format.
+
+``pd.read_csv`` on the whole file holds every row as Python objects at
+once. Here the CSV is read ``chunksize`` rows at a time. Each chunk is
+validated, its genre lists are normalized, and it is appended to a
+``ColumnarWriter`` and a ``FeatureBuilder``. Peak memory therefore depends on
+the chunk size plus the distinct directors and genre combinations, not on
+the number of rows. The imputed rating/year features are stored in the
+output directory, so ``read_catalog`` does not recompute them.
+"""
+
+import numpy as np
+import pandas as pd
+
+from recommender.catalog import FEATURE_FIELDS, REQUIRED_COLUMNS
+from recommender.columnar import ColumnarWriter
+from recommender.features import FeatureBuilder
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def normalize_genres(descriptions):
+    """Canonical ``"A, B"`` genre lists: names stripped, empty entries dropped.
+
+    Each distinct description is parsed once.
+    """
+    codes, uniques = pd.factorize(descriptions.astype("object"))
+    canonical = [", ".join(g.strip() for g in str(desc).split(',') if g.strip()) or None
+                 for desc in uniques]
+    lookup = np.array(canonical + [None], dtype=object)
+    return pd.Series(lookup[codes], index=descriptions.index)
+
+
+def iter_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield validated, genre-normalized DataFrame chunks of ``csv_path``.
+
+    Raises ``ValueError`` on the first chunk that lacks a required column or
+    has a row without a title or without any genre in its description.
+    """
+    offset = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        if not all(col in chunk.columns for col in REQUIRED_COLUMNS):
+            raise ValueError(f"CSV file must contain columns: {REQUIRED_COLUMNS}")
+        missing = chunk['title'].isna().to_numpy()
+        if missing.any():
+            raise ValueError(f"Row {offset + int(missing.argmax())} of {csv_path} has no title")
+        chunk['description'] = normalize_genres(chunk['description'])
+        missing = chunk['description'].isna().to_numpy()
+        if missing.any():
+            raise ValueError(
+                f"Row {offset + int(missing.argmax())} of {csv_path} has no description")
+        offset += len(chunk)
+        yield chunk
+
+
+def ingest(csv_path, out_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream ``csv_path`` into a columnar catalog directory at ``out_path``.
+
+    Returns the number of rows written.
+    """
+    features = FeatureBuilder()
+    with ColumnarWriter(out_path) as writer:
+        for chunk in iter_chunks(csv_path, chunksize):
+            writer.append(chunk)
+            features.add(chunk)
+        built = features.build()
+        for field in FEATURE_FIELDS:
+            if getattr(built, field) is not None:
+                writer.save_array(field, getattr(built, field))
+    return writer.rows
@@ -0,0 +1,311 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Histograms and counters live in a ``Registry`` and are updated in place: an
+observation is one bisect and two additions under a per-metric lock, cheap
+enough for the hot path. Gauges are callbacks read only at scrape time, such
+as catalog size and build duration from ``ModelReloader.metrics()``.
+
+The module-level ``REGISTRY`` holds the app's metrics:
+
+- ``recommender_recommendations_seconds{cache}``: ``get_hybrid_recommendations`` calls
+- ``recommender_wiki_request_seconds{endpoint}``: each Wikipedia HTTP call
+- ``recommender_rerun_seconds`` and ``recommender_rerun_stage_seconds{stage}``
+- ``recommender_cache_lookups_total{cache,result}``: hit ratios are
+  ``rate(..{result="hit"}) / rate(..)``
+- ``recommender_catalog_info{version}``, catalog size and model build/reload gauges,
+  once ``register_reloader`` is called
+
+``serve(port)`` exposes them from a sidecar HTTP thread at ``/metrics``.
+``write_periodically(path)`` rewrites a file for node_exporter's textfile
+collector instead.
+
+Usage:
+    RECOMMENDER_METRICS_PORT=9464 streamlit run app.py
+    RECOMMENDER_METRICS_FILE=/var/lib/node_exporter/recommender.prom streamlit run app.py
+"""
+
+import bisect
+import contextlib
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{v}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, *labels):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][slot] += 1
+            series[1] += value
+
+    @contextlib.contextmanager
+    def time(self, *labels):
+        """Observe the wall time of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                le = _labels(self.label_names, labels, [("le", _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """A value read from ``fn()`` at scrape time; ``fn`` may return ``{labels: value}``."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn, labels=()):
+        super().__init__(name, help_text, labels)
+        self.fn = fn
+
+    def render(self):
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        return self._header() + [
+            f"{self.name}{_labels(self.label_names, k if isinstance(k, tuple) else (k,))} "
+            f"{_format_value(v)}" for k, v in items
+        ]
+
+
+class Registry:
+    """Named metrics rendered together; registering a name again returns the existing metric."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, fn, labels=()):
+        """Register (or replace) the gauge ``name`` read from ``fn``."""
+        gauge = Gauge(name, help_text, fn, labels)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def render(self):
+        """All metrics in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+RECOMMENDATION_SECONDS = REGISTRY.histogram(
+    "recommender_recommendations_seconds",
+    "Latency of get_hybrid_recommendations, by result cache outcome.", labels=("cache",))
+WIKI_REQUEST_SECONDS = REGISTRY.histogram(
+    "recommender_wiki_request_seconds",
+    "Latency of Wikipedia HTTP calls, by endpoint.", labels=("endpoint",))
+RERUN_SECONDS = REGISTRY.histogram(
+    "recommender_rerun_seconds", "Wall time of one app.py script run.")
+RERUN_STAGE_SECONDS = REGISTRY.histogram(
+    "recommender_rerun_stage_seconds", "Wall time of each app.py stage per rerun.",
+    labels=("stage",))
+CACHE_LOOKUPS = REGISTRY.counter(
+    "recommender_cache_lookups_total", "Cache lookups, by cache and hit/miss.",
+    labels=("cache", "result"))
+
+
+def observe_rerun(stats):
+    """Record a finished ``RerunTrace`` (its ``to_dict()``) in the rerun metrics."""
+    RERUN_SECONDS.observe(stats["total_ms"] / 1e3)
+    for stage, ms in stats["spans"].items():
+        RERUN_STAGE_SECONDS.observe(ms / 1e3, stage)
+    for cache, counts in stats["caches"].items():
+        if counts["hits"]:
+            CACHE_LOOKUPS.inc(cache, "hit", amount=counts["hits"])
+        if counts["misses"]:
+            CACHE_LOOKUPS.inc(cache, "miss", amount=counts["misses"])
+
+
+def register_reloader(reloader, registry=REGISTRY):
+    """Expose catalog version and size, build duration and reload state of a ``ModelReloader``.
+
+    The version is an info-style gauge, ``recommender_catalog_info{version="..."} 1``,
+    so dashboards can join on it or count distinct versions across processes.
+    """
+    def field(name, convert=float):
+        def read():
+            value = reloader.metrics()[name]
+            return None if value is None else convert(value)
+        return read
+
+    def info():
+        version = reloader.metrics()["catalog_version"]
+        return None if version is None else {(str(version),): 1}
+
+    registry.gauge("recommender_catalog_info", "Catalog version of the serving model.",
+                   info, labels=("version",))
+    registry.gauge("recommender_catalog_movies", "Titles in the serving catalog.",
+                   field("movies", int))
+    registry.gauge("recommender_model_build_seconds", "Duration of the last model build.",
+                   field("last_build_seconds"))
+    registry.gauge("recommender_model_ready", "1 once a model is serving.", field("ready", int))
+    registry.gauge("recommender_model_reloads", "Hot reloads since the process started.",
+                   field("reloads", int))
+    registry.gauge("recommender_model_reload_failing", "1 while the last reload attempt failed.",
+                   lambda: int(reloader.metrics()["last_error"] is not None))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="0.0.0.0", registry=REGISTRY):
+    """Serve ``/metrics`` from a daemon thread; returns the server (``.server_port``)."""
+    handler = type("MetricsHandler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_file(path, registry=REGISTRY):
+    """Write the metrics to ``path`` atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(registry.render())
+    os.replace(tmp, path)
+
+
+def write_periodically(path, interval=15.0, registry=REGISTRY):
+    """Rewrite ``path`` every ``interval`` seconds from a daemon thread; returns a stop event."""
+    stop = threading.Event()
+
+    def run():
+        while True:
+            try:
+                write_file(path, registry)
+            except OSError:
+                pass
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=run, name="metrics-file", daemon=True).start()
+    return stop
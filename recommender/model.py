@@ -0,0 +1,214 @@
+"""
+The shared recommender model: catalog plus a genre-similarity engine.
+
+Two engines are available: ``"tfidf"`` fits a TF-IDF vectorizer on the
+genre descriptions, precomputes a top-K neighbor index and scores seeds
+with exact cosine rows from ``TfidfSimilarity``, ``"bitset"``
+scores IDF-weighted genre overlap on demand from the packed genre bitsets
+and needs nothing fitted or stored.
+
+One ``RecommenderModel`` is built per process and handed to every session
+by reference, so it must be treated as read-only once constructed; edits
+(``append``/``update``/``delete``) return a new model.
+
+sklearn and scipy are imported only when a model is fitted or edited. A model
+served from artifacts restores its vectorizer and feature matrix on first
+use, so serving never imports them.
+"""
+
+import threading
+
+from recommender import artifacts
+from recommender.catalog import read_catalog
+from recommender.genre_similarity import BitsetSimilarity
+from recommender.neighbors import DEFAULT_TOP_K, build_neighbor_index
+from recommender.scoring import hybrid_recommendations
+from recommender.tfidf_similarity import TfidfSimilarity
+
+TFIDF_PARAMS = {"ngram_range": (1, 2), "min_df": 1, "stop_words": "english"}
+ENGINES = ("tfidf", "bitset")
+DEFAULT_ENGINE = "tfidf"
+
+
+def model_params(top_k=DEFAULT_TOP_K):
+    """Everything that changes the built model, in JSON-friendly form."""
+    return {
+        "ngram_range": list(TFIDF_PARAMS["ngram_range"]),
+        "min_df": TFIDF_PARAMS["min_df"],
+        "stop_words": TFIDF_PARAMS["stop_words"],
+        "top_k": top_k,
+    }
+
+
+class RecommenderModel:
+    """Read-only bundle of everything needed to serve recommendations."""
+
+    def __init__(self, catalog, vectorizer, neighbor_index, feature_matrix=None,
+                 fingerprint=None, catalog_version=None, loaded_from_artifacts=False,
+                 similarity=None, changes_since_fit=0, top_k=DEFAULT_TOP_K, load_fitted=None,
+                 artifact_lease=None):
+        self.catalog = catalog
+        self._vectorizer = vectorizer
+        self.neighbor_index = neighbor_index
+        self._feature_matrix = feature_matrix
+        # Zero-argument callable returning ``(vectorizer, feature_matrix)``
+        self._load_fitted = load_fitted
+        self._fitted_lock = threading.Lock()
+        self.fingerprint = fingerprint
+        # Open file holding the artifact directory's lease while this model lives
+        self._artifact_lease = artifact_lease
+        self.catalog_version = catalog_version
+        self.loaded_from_artifacts = loaded_from_artifacts
+        # Rows edited incrementally since the vectorizer was fitted
+        self.changes_since_fit = changes_since_fit
+        self.top_k = top_k
+        # Whatever provides ``dense_row``: exact TF-IDF rows, the neighbor
+        # index, or a bitset engine
+        self.similarity = similarity if similarity is not None else neighbor_index
+        if neighbor_index is not None:
+            # Sessions share these arrays; make accidental writes fail loudly
+            neighbor_index.indices.setflags(write=False)
+            neighbor_index.scores.setflags(write=False)
+        if isinstance(self.similarity, TfidfSimilarity):
+            for array in self.similarity.arrays.values():
+                array.setflags(write=False)
+
+    def _restore_fitted(self):
+        if self._load_fitted is not None:
+            with self._fitted_lock:
+                if self._load_fitted is not None:
+                    self._vectorizer, self._feature_matrix = self._load_fitted()
+                    self._load_fitted = None
+
+    @property
+    def vectorizer(self):
+        """The fitted TF-IDF vectorizer (``None`` for the bitset engine)."""
+        self._restore_fitted()
+        return self._vectorizer
+
+    @property
+    def feature_matrix(self):
+        """TF-IDF rows of the catalog (``None`` for the bitset engine)."""
+        self._restore_fitted()
+        return self._feature_matrix
+
+    @property
+    def engine(self):
+        return "tfidf" if self.neighbor_index is not None else "bitset"
+
+    @property
+    def movies(self):
+        return self.catalog.movies
+
+    @property
+    def genres(self):
+        return self.catalog.genres
+
+    @property
+    def titles(self):
+        return self.catalog.titles
+
+    def __len__(self):
+        return len(self.catalog)
+
+    def search(self, query, limit=None):
+        """Catalog row ids matching ``query`` by title or director, best first."""
+        return self.catalog.search_index.search(query, limit=limit)
+
+    def apply_delta(self, append=None, update=None, delete=None):
+        """A new model with rows appended, updated and deleted; see ``recommender.incremental``."""
+        from recommender.incremental import apply_delta
+
+        return apply_delta(self, append=append, update=update, delete=delete)
+
+    def append(self, movies):
+        """A new model with the ``movies`` rows added at the end."""
+        return self.apply_delta(append=movies)
+
+    def update(self, movies):
+        """A new model with the rows ``movies.index`` replaced by ``movies``."""
+        return self.apply_delta(update=movies)
+
+    def delete(self, rows):
+        """A new model without ``rows``; later rows shift down."""
+        return self.apply_delta(delete=rows)
+
+    def recommend(self, movie_title, year=None, top_n=5, rating_weight=0.3,
+                  year_weight=0.1, genre_weight=0.6):
+        """Return the top-N hybrid recommendations for ``movie_title``.
+
+        ``year`` disambiguates titles shared by films from different years.
+        """
+        seed_row = self.catalog.titles.lookup(movie_title, year)
+        return hybrid_recommendations(
+            seed_row, self.catalog, self.similarity, top_n=top_n,
+            rating_weight=rating_weight, year_weight=year_weight,
+            genre_weight=genre_weight,
+        )
+
+
+def build_model(catalog, top_k=DEFAULT_TOP_K, engine=DEFAULT_ENGINE, metric="cosine"):
+    """Build the model with the given similarity ``engine``.
+
+    ``"tfidf"`` fits TF-IDF on the genre descriptions and builds the top-K
+    neighbor index and the exact per-description cosine rows; ``"bitset"`` wraps the catalog's genre bitsets with the
+    IDF-weighted ``metric`` (``"cosine"`` or ``"jaccard"``).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, not {engine!r}")
+    if engine == "bitset":
+        return RecommenderModel(catalog, None, None,
+                                similarity=BitsetSimilarity(catalog.genre_index, metric))
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    tfidf = TfidfVectorizer(**TFIDF_PARAMS)
+    tfidf_matrix = tfidf.fit_transform(catalog.movies['description'])
+    neighbor_index = build_neighbor_index(tfidf_matrix, top_k=top_k)
+    similarity = TfidfSimilarity.from_matrix(tfidf_matrix, catalog.genre_index.codes)
+    return RecommenderModel(catalog, tfidf, neighbor_index, feature_matrix=tfidf_matrix,
+                            similarity=similarity, top_k=top_k)
+
+
+def load_model(csv_path="movies.csv", top_k=DEFAULT_TOP_K, artifact_dir=None,
+               engine=DEFAULT_ENGINE):
+    """Read ``csv_path`` and build a ``RecommenderModel`` from it.
+
+    With ``artifact_dir`` the fitted model is loaded from the directory whose
+    fingerprint matches the CSV and parameters, and is built and saved there
+    only when no such directory exists yet. The ``"bitset"`` engine has
+    nothing fitted, so it never reads or writes artifacts.
+    """
+    if artifact_dir is None:
+        return build_model(read_catalog(csv_path), top_k=top_k, engine=engine)
+    if engine == "bitset":
+        model = build_model(read_catalog(csv_path), engine=engine)
+        model.catalog_version = artifacts.catalog_version(csv_path)
+        return model
+
+    params = model_params(top_k)
+    version = artifacts.catalog_version(csv_path)
+    fingerprint = artifacts.catalog_fingerprint(csv_path, params, version)
+    lease = artifacts.acquire_lease(artifact_dir, fingerprint)
+    if lease is not None:
+        neighbor_index, similarity, features, meta = artifacts.load_artifacts(
+            artifact_dir, fingerprint)
+        # Scoring arrays stay memory-mapped; the catalog reuses them instead
+        # of imputing its own copy
+        catalog = read_catalog(csv_path, features=features)
+        if meta["rows"] == len(catalog):
+            return RecommenderModel(
+                catalog, None, neighbor_index, similarity=similarity, fingerprint=fingerprint,
+                catalog_version=version, loaded_from_artifacts=True, top_k=top_k,
+                load_fitted=lambda: artifacts.load_fitted(artifact_dir, fingerprint),
+                artifact_lease=lease)
+        lease.close()
+
+    model = build_model(read_catalog(csv_path), top_k=top_k)
+    artifacts.save_artifacts(artifact_dir, fingerprint, params, model.vectorizer,
+                             model.feature_matrix, model.neighbor_index, model.similarity,
+                             model.catalog.features)
+    model._artifact_lease = artifacts.acquire_lease(artifact_dir, fingerprint)
+    model.fingerprint = fingerprint
+    model.catalog_version = version
+    return model
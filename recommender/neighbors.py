@@ -0,0 +1,226 @@
+"""
+Top-K neighbor index over TF-IDF feature vectors.
+
+Instead of the dense N×N cosine matrix, only the K most similar titles are
+kept for each row, so memory grows as N×K rather than N². The index is built
+block by block, and the rows per block are derived from a byte budget
+(``block_bytes``), so peak memory stays bounded as N grows. Scores stay
+float64, bit-identical to the dense matrix.
+
+Titles tied at the K-th score beyond the cut-off are dropped from a list, so
+the hybrid scorer reads exact rows from ``TfidfSimilarity`` instead.
+"""
+
+import numpy as np
+
+DEFAULT_TOP_K = 256
+DEFAULT_BLOCK_BYTES = 256 << 20
+# Peak bytes per cosine score in a block: the sparse product and its dense
+# float64 copy inside ``cosine_similarity``, then the float64 block plus
+# the partitioned copy or the int32 tie count and boolean masks
+_BYTES_PER_SCORE = 20
+
+
+class NeighborIndex:
+    """Fixed-width neighbor lists: ``indices[i]`` and ``scores[i]`` for row ``i``.
+
+    Rows are sorted by descending score. When the catalog has fewer than
+    K + 1 titles the unused slots hold index ``-1`` and score ``0``.
+    """
+
+    def __init__(self, indices: np.ndarray, scores: np.ndarray):
+        if indices.shape != scores.shape:
+            raise ValueError("indices and scores must have the same shape")
+        self.indices = indices
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return self.indices.shape[0]
+
+    @property
+    def k(self) -> int:
+        return self.indices.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.scores.nbytes
+
+    def neighbors(self, row: int):
+        """Return the ``(indices, scores)`` pair for one row, without padding."""
+        idx = self.indices[row]
+        valid = idx >= 0
+        return idx[valid], self.scores[row][valid]
+
+    def dense_row(self, row: int) -> np.ndarray:
+        """Scatter a row's neighbor scores into a length-N vector (zeros elsewhere)."""
+        dense = np.zeros(len(self), dtype=np.float64)
+        idx, scores = self.neighbors(row)
+        dense[idx] = scores
+        return dense
+
+
+def _cosine(a, b):
+    # sklearn is only needed to build or edit an index, never to serve one
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    return cosine_similarity(a, b)
+
+
+def block_rows(n_rows, block_bytes=DEFAULT_BLOCK_BYTES):
+    """Rows per block so that scoring them against ``n_rows`` rows fits ``block_bytes``."""
+    return max(1, block_bytes // (_BYTES_PER_SCORE * max(1, n_rows)))
+
+
+def _top_k_rows(feature_matrix, rows, k):
+    """Top-K cosine neighbors of ``rows`` against every row, best first."""
+    block = _cosine(feature_matrix[rows], feature_matrix)
+
+    # A title is never its own neighbor
+    block[np.arange(len(rows)), rows] = -np.inf
+
+    # Keep everything above the K-th score, then the lowest-id ties at it, as
+    # ``scoring.top_k_indices`` does for one row. Fancy indexing copies the
+    # K-th column out so the partitioned block is freed at once
+    kth = np.partition(block, block.shape[1] - k, axis=1)[:, [block.shape[1] - k]]
+    above = block > kth
+    ties = block == kth
+    need = k - above.sum(axis=1, keepdims=True)
+    keep = above | (ties & (np.cumsum(ties, axis=1, dtype=np.int32) <= need))
+    top = np.nonzero(keep)[1].reshape(len(rows), k)
+    top_scores = np.take_along_axis(block, top, axis=1)
+    # Highest score first; ties broken by the lower row id
+    order = np.lexsort((top, -top_scores))
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def build_neighbor_index(feature_matrix, top_k: int = DEFAULT_TOP_K, block_size=None,
+                         block_bytes: int = DEFAULT_BLOCK_BYTES) -> NeighborIndex:
+    """Compute the top-K cosine neighbors of every row, one block of rows at a time.
+
+    ``block_size`` fixes the rows per block; by default it follows from
+    ``block_bytes`` (see ``block_rows``).
+    """
+    n_rows = feature_matrix.shape[0]
+    block_size = block_size or block_rows(n_rows, block_bytes)
+    k = max(0, min(top_k, n_rows - 1))
+    indices = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float64)
+    if k == 0:
+        return NeighborIndex(indices, scores)
+
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        indices[start:stop], scores[start:stop] = _top_k_rows(
+            feature_matrix, np.arange(start, stop), k)
+
+    return NeighborIndex(indices, scores)
+
+
+def update_neighbor_index(index, feature_matrix, moved, stale, changed,
+                          top_k: int = DEFAULT_TOP_K, min_fill=None, block_size=None,
+                          block_bytes: int = DEFAULT_BLOCK_BYTES) -> NeighborIndex:
+    """Carry ``index`` over to an edited catalog without recomputing every row.
+
+    ``feature_matrix`` holds the new catalog's vectors. ``moved[old]`` is each
+    old row's new id (``-1`` once deleted). ``stale[old]`` marks old rows whose
+    vector is gone or replaced. ``changed`` lists the new ids of replaced and
+    appended rows.
+
+    Stale entries are dropped from every list. The lists of changed rows, and
+    of rows left with fewer than ``min_fill`` (default K/2) neighbors, are
+    recomputed. Every other list only merges in the changed rows that score at
+    least its last kept entry. Lists that lost a neighbor keep the survivors
+    (a prefix of their exact top K) until the next full build instead of
+    looking for their replacements.
+    """
+    n_rows = feature_matrix.shape[0]
+    block_size = block_size or block_rows(n_rows, block_bytes)
+    k = max(0, min(top_k, n_rows - 1))
+    if k != index.k:
+        return build_neighbor_index(feature_matrix, top_k, block_size)
+    if k == 0:
+        return NeighborIndex(np.full((n_rows, 0), -1, np.int32), np.zeros((n_rows, 0), np.float64))
+    min_fill = max(1, k // 2 if min_fill is None else min_fill)
+
+    # Old ids -> new ids, stale -> -1; the extra slot maps padding (-1) to -1
+    lookup = np.append(np.where(stale, -1, moved), -1).astype(np.int32)
+    survivors = np.flatnonzero(moved >= 0)
+    carried = lookup[index.indices[survivors]]
+    order = np.argsort(carried < 0, axis=1, kind="stable")
+    indices = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float64)
+    indices[moved[survivors]] = np.take_along_axis(carried, order, axis=1)
+    scores[moved[survivors]] = np.take_along_axis(
+        np.where(carried >= 0, index.scores[survivors], 0), order, axis=1)
+
+    filled = (indices >= 0).sum(axis=1)
+    dirty = filled < min_fill
+    dirty[changed] = True
+    for start in range(0, int(dirty.sum()), block_size):
+        rows = np.flatnonzero(dirty)[start:start + block_size]
+        indices[rows], scores[rows] = _top_k_rows(feature_matrix, rows, k)
+
+    # A changed row that ties or beats a clean row's last kept score is
+    # certainly in that row's top K, even when the list is short
+    last = np.maximum(filled, 1) - 1
+    threshold = scores[np.arange(n_rows), last]
+    threshold[dirty] = np.inf
+    # On a tie with a full list the lower row id wins, as in a full build
+    tie_below = np.where(filled < k, np.iinfo(np.int32).max, indices[np.arange(n_rows), last])
+    pair_rows, pair_ids, pair_scores = [], [], []
+    for start in range(0, len(changed), block_size):
+        ids = np.asarray(changed[start:start + block_size])
+        # Computed from each clean row's side, bit-identical to a full build
+        block = _cosine(feature_matrix, feature_matrix[ids]).T
+        beats = (block > threshold) | ((block == threshold) & (ids[:, None] < tie_below))
+        cand, row = np.nonzero(beats)
+        pair_rows.append(row)
+        pair_ids.append(ids[cand])
+        pair_scores.append(block[cand, row])
+    pair_rows = np.concatenate(pair_rows) if pair_rows else np.zeros(0, np.int64)
+    if len(pair_rows):
+        _merge(indices, scores, pair_rows, np.concatenate(pair_ids), np.concatenate(pair_scores))
+    return NeighborIndex(indices, scores)
+
+
+def _merge(indices, scores, rows, ids, values, chunk=1 << 16):
+    """Merge ``(row, id, score)`` entries into the lists of ``rows``, keeping the top K.
+
+    Lists are already sorted, so each entry's slot is the number of list
+    entries that beat it plus the number of new entries for the same row that
+    beat it; list entries shift down by the new entries placed before them.
+    """
+    k = indices.shape[1]
+    order = np.lexsort((ids, -values, rows))
+    rows, ids, values = rows[order], ids[order], values[order]
+    targets, first = np.unique(rows, return_index=True)
+    group = np.searchsorted(targets, rows)
+    rank = np.arange(len(rows)) - first[group]
+
+    # Slot among the existing entries: count of valid entries that beat it
+    before = np.empty(len(rows), dtype=np.int64)
+    for start in range(0, len(rows), chunk):
+        sl = slice(start, start + chunk)
+        idx, sc = indices[rows[sl]], scores[rows[sl]]
+        s, i = values[sl, None], ids[sl, None]
+        before[sl] = ((idx >= 0) & ((sc > s) | ((sc == s) & (idx < i)))).sum(axis=1)
+    slot = before + rank
+
+    # shift[t, p]: new entries of target t placed ahead of its entry at p
+    shift = np.zeros((len(targets), k + 1), dtype=np.int64)
+    np.add.at(shift, (group, np.minimum(before, k)), 1)
+    shift = np.cumsum(shift, axis=1)[:, :k]
+
+    old_idx, old_scores = indices[targets], scores[targets]
+    new_pos = np.arange(k)[None, :] + shift
+    keep_old = (old_idx >= 0) & (new_pos < k)
+    merged_idx = np.full((len(targets), k), -1, dtype=indices.dtype)
+    merged_scores = np.zeros((len(targets), k), dtype=scores.dtype)
+    t, p = np.nonzero(keep_old)
+    merged_idx[t, new_pos[t, p]] = old_idx[t, p]
+    merged_scores[t, new_pos[t, p]] = old_scores[t, p]
+    fits = slot < k
+    merged_idx[group[fits], slot[fits]] = ids[fits]
+    merged_scores[group[fits], slot[fits]] = values[fits]
+    indices[targets] = merged_idx
+    scores[targets] = merged_scores
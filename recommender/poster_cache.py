@@ -0,0 +1,176 @@
+"""
+Durable poster cache backed by SQLite.
+
+Hits and misses are both stored, each with its own TTL, so titles without a
+poster don't trigger the full lookup chain again after every restart. The
+database runs in WAL mode, so every server process on a host can share one
+file. Each row records the catalog version it was resolved under: misses
+from an older catalog are retried (the title may have been corrected), hits
+stay valid until their TTL.
+
+Usage:
+    python -m recommender.poster_cache warm --csv movies.csv
+"""
+
+import argparse
+import copy
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = os.path.join(".cache", "posters.sqlite3")
+HIT_TTL = 30 * 86400
+MISS_TTL = 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posters (
+    title           TEXT    NOT NULL,
+    year            INTEGER NOT NULL,
+    url             TEXT,
+    fetched_at      REAL    NOT NULL,
+    catalog_version TEXT,
+    PRIMARY KEY (title, year)
+)
+"""
+
+
+def _year_key(year):
+    # SQLite allows repeated NULLs in a primary key, so "no year" is stored as 0
+    return int(year) if year else 0
+
+
+class SQLitePosterCache:
+    """Poster cache with the same ``get``/``put`` interface as ``PosterCache``."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, catalog_version=None, hit_ttl=HIT_TTL,
+                 miss_ttl=MISS_TTL):
+        self.path = path
+        self.catalog_version = catalog_version
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def _fresh(self, url, fetched_at, version, now):
+        if url is None:
+            if self.catalog_version is not None and version != self.catalog_version:
+                return False
+            return now - fetched_at <= self.miss_ttl
+        return now - fetched_at <= self.hit_ttl
+
+    def get(self, key):
+        """Return ``(found, url)``; stale entries count as not found."""
+        title, year = key
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, fetched_at, catalog_version FROM posters WHERE title = ? AND year = ?",
+                (title, _year_key(year)),
+            ).fetchone()
+        if row is None or not self._fresh(*row, time.time()):
+            return False, None
+        return True, row[0]
+
+    def put(self, key, url):
+        self.put_many([(key, url)])
+
+    def put_many(self, items):
+        """Store many ``((title, year), url)`` results in one transaction."""
+        now = time.time()
+        rows = [(title, _year_key(year), url, now, self.catalog_version)
+                for (title, year), url in items]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO posters (title, year, url, fetched_at, catalog_version) "
+                    "VALUES (?, ?, ?, ?, ?)", rows,
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def stats(self):
+        """Counts of stored hits and misses."""
+        with self._lock:
+            hits, misses = self._conn.execute(
+                "SELECT COUNT(url), COUNT(*) - COUNT(url) FROM posters"
+            ).fetchone()
+        return {"hits": hits, "misses": misses}
+
+    def with_version(self, catalog_version):
+        """A view that reads and writes under ``catalog_version`` over this connection.
+
+        Lets one long-lived cache serve every catalog a hot reload swaps in
+        without opening a connection per version.
+        """
+        view = copy.copy(self)
+        view.catalog_version = catalog_version
+        return view
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def warm(cache, movies, batch_size=200, max_workers=16, deadline=120.0, base_url=None):
+    """Resolve every ``(title, year)`` not already fresh in ``cache``, in batches."""
+    from recommender.posters import resolve_posters
+
+    todo = []
+    seen = set()
+    for key in movies:
+        if key not in seen and not cache.get(key)[0]:
+            todo.append(key)
+        seen.add(key)
+
+    summary = {"titles": len(seen), "cached": len(seen) - len(todo),
+               "hits": 0, "misses": 0, "unresolved": 0}
+    for start in range(0, len(todo), batch_size):
+        batch = todo[start:start + batch_size]
+        resolved = resolve_posters(batch, base_url=base_url, max_workers=max_workers,
+                                   deadline=deadline, cache=None)
+        cache.put_many(resolved.items())
+        summary["hits"] += sum(1 for url in resolved.values() if url)
+        summary["misses"] += sum(1 for url in resolved.values() if not url)
+        summary["unresolved"] += len(batch) - len(resolved)
+    return summary
+
+
+def main(argv=None):
+    from recommender.artifacts import catalog_version
+    from recommender.catalog import read_catalog
+
+    parser = argparse.ArgumentParser(description="Manage the durable poster cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm_cmd = sub.add_parser("warm", help="prefetch posters for a whole catalog")
+    warm_cmd.add_argument("--csv", default="movies.csv")
+    warm_cmd.add_argument("--db", default=DEFAULT_DB_PATH)
+    warm_cmd.add_argument("--workers", type=int, default=16)
+    warm_cmd.add_argument("--batch-size", type=int, default=200)
+    sub.add_parser("stats", help="show cached hit/miss counts").add_argument(
+        "--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(SQLitePosterCache(args.db).stats())
+        return
+
+    catalog = read_catalog(args.csv)
+    cache = SQLitePosterCache(args.db, catalog_version=catalog_version(args.csv))
+    keys = [catalog.titles.key(row) for row in range(len(catalog))]
+    start = time.perf_counter()
+    summary = warm(cache, keys, batch_size=args.batch_size, max_workers=args.workers)
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
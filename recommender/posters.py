@@ -0,0 +1,401 @@
+"""
+Poster lookup against Wikipedia.
+
+``fetch_poster`` resolves one title sequentially through the REST summary
+endpoint. ``resolve_posters`` resolves many titles at once: the candidate
+slugs of every title are looked up through the MediaWiki action API, up to
+50 page titles per ``prop=pageimages`` query (redirects followed), with the
+queries running concurrently on a bounded thread pool over keep-alive
+connections. Only titles left without an image go on to the per-title
+search fallback. Whatever has not resolved when the deadline passes is left
+out so the caller can render its placeholder instead of blocking; it keeps
+resolving in the background and lands in the cache for the next render.
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from recommender.metrics import WIKI_REQUEST_SECONDS
+
+WIKIPEDIA_BASE_URL = os.environ.get("WIKIPEDIA_BASE_URL", "https://en.wikipedia.org")
+USER_AGENT = "CinematicRecommender/1.0"
+REQUEST_TIMEOUT = 5.0
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_DEADLINE = 3.0
+CACHE_TTL = 604800
+MAX_TITLES_PER_QUERY = 50
+
+
+class _ConnectionPool:
+    """Idle keep-alive HTTP(S) connections to one host, reused across threads."""
+
+    def __init__(self, base_url):
+        parts = urllib.parse.urlsplit(base_url)
+        self._conn_class = (http.client.HTTPSConnection if parts.scheme == "https"
+                            else http.client.HTTPConnection)
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _request(self, conn, path, timeout):
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request("GET", self._prefix + path, headers={"User-Agent": USER_AGENT})
+        resp = conn.getresponse()
+        return resp, resp.read()
+
+    def get(self, path, timeout=REQUEST_TIMEOUT):
+        """GET ``path`` and return the response body; non-200 raises."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        reused = conn is not None
+        if conn is None:
+            conn = self._conn_class(self._netloc, timeout=timeout)
+        try:
+            resp, body = self._request(conn, path, timeout)
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle connection; retry once on a fresh one
+            conn = self._conn_class(self._netloc, timeout=timeout)
+            resp, body = self._request(conn, path, timeout)
+        except Exception:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        if resp.status != 200:
+            raise http.client.HTTPException(f"HTTP {resp.status} for {path}")
+        return body
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(base_url):
+    with _pools_lock:
+        pool = _pools.get(base_url)
+        if pool is None:
+            pool = _pools[base_url] = _ConnectionPool(base_url)
+    return pool
+
+
+def _get_json(base_url, path, timeout=REQUEST_TIMEOUT):
+    body = _pool(base_url or WIKIPEDIA_BASE_URL).get(path, timeout)
+    return json.loads(body.decode("utf-8", errors="ignore"))
+
+
+def _get_bytes(url, timeout=REQUEST_TIMEOUT):
+    """Download ``url`` over the keep-alive pool for its host."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return _pool(f"{parts.scheme}://{parts.netloc}").get(path, timeout)
+
+
+def _wiki_summary(slug, base_url=None, timeout=REQUEST_TIMEOUT):
+    """Hit Wikipedia REST API for a page summary; return dict or None."""
+    encoded = urllib.parse.quote(slug.replace(" ", "_"), safe="_(),%")
+    try:
+        with WIKI_REQUEST_SECONDS.time("summary"):
+            return _get_json(base_url, f"/api/rest_v1/page/summary/{encoded}", timeout)
+    except Exception:
+        return None
+
+
+def _wiki_search(query, base_url=None, timeout=REQUEST_TIMEOUT):
+    """Fallback: use MediaWiki search to find a matching page title."""
+    params = urllib.parse.urlencode({
+        "action": "query", "list": "search", "srsearch": query,
+        "format": "json", "srlimit": 3,
+    })
+    try:
+        with WIKI_REQUEST_SECONDS.time("search"):
+            data = _get_json(base_url, f"/w/api.php?{params}", timeout)
+        return [h["title"] for h in data.get("query", {}).get("search", [])]
+    except Exception:
+        return []
+
+
+def _wiki_pageimages(titles, base_url=None, timeout=REQUEST_TIMEOUT):
+    """Look up the page image of up to 50 page titles in one action API query.
+
+    Returns ``{requested_title: url_or_None}``, following title normalization
+    and redirects, or ``None`` if the request failed.
+    """
+    params = urllib.parse.urlencode({
+        "action": "query", "prop": "pageimages", "piprop": "original|thumbnail",
+        "pithumbsize": 640, "redirects": 1, "format": "json", "formatversion": 2,
+        "titles": "|".join(titles),
+    })
+    try:
+        with WIKI_REQUEST_SECONDS.time("pageimages"):
+            data = _get_json(base_url, f"/w/api.php?{params}", timeout)
+    except Exception:
+        return None
+
+    query = data.get("query", {})
+    normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+    redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+    images = {}
+    for page in query.get("pages", []):
+        images[page.get("title")] = (page.get("original") or {}).get("source") \
+            or (page.get("thumbnail") or {}).get("source")
+
+    result = {}
+    for title in titles:
+        name = normalized.get(title, title)
+        name = redirects.get(name, name)
+        result[title] = images.get(name)
+    return result
+
+
+def _extract(summary):
+    if not summary:
+        return None
+    return (summary.get("originalimage") or {}).get("source") \
+        or (summary.get("thumbnail") or {}).get("source")
+
+
+def _has_year(year):
+    return bool(year) and pd.notna(year)
+
+
+def candidate_slugs(title, year=None):
+    """Page titles to try, most specific first."""
+    candidates = []
+    if _has_year(year):
+        candidates.append(f"{title} ({int(year)} film)")
+    candidates += [f"{title} (film)", title]
+    return candidates
+
+
+def search_query(title, year=None):
+    return f"{title} film" + (f" {int(year)}" if _has_year(year) else "")
+
+
+def fetch_poster(title, year=None, base_url=None):
+    """Return a poster image URL for a movie, sourced from Wikipedia. None if not found."""
+    for slug in candidate_slugs(title, year):
+        img = _extract(_wiki_summary(slug, base_url))
+        if img:
+            return img
+
+    for hit in _wiki_search(search_query(title, year), base_url):
+        img = _extract(_wiki_summary(hit, base_url))
+        if img:
+            return img
+    return None
+
+
+class PosterCache:
+    """Thread-safe in-process TTL cache of resolved posters (URL or ``None``)."""
+
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return ``(found, url)``; expired entries count as not found."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return False, None
+        return True, entry[1]
+
+    def put(self, key, url):
+        with self._lock:
+            self._entries[key] = (time.time(), url)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+poster_cache = PosterCache()
+
+# Titles being resolved for some cache, possibly after their call returned
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+
+class _TitleJob:
+    """Resolution state for one title: candidate slugs first, then search hits."""
+
+    def __init__(self, title, year):
+        self.title = title
+        self.year = year
+        self.slugs = candidate_slugs(title, year)
+        self.results = {}
+        self.searched = False
+        self.hits = None
+        self.done = False
+        self.url = None
+
+    def settle(self):
+        """Pick the best finished result in priority order, if it is decidable yet."""
+        order = self.slugs + (self.hits or [])
+        for slug in order:
+            if slug not in self.results:
+                return False
+            if self.results[slug]:
+                self.url = self.results[slug]
+                self.done = True
+                return True
+        if self.hits is not None:
+            self.done = True
+        return self.done
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_posters(movies, base_url=None, max_workers=DEFAULT_MAX_WORKERS,
+                    deadline=DEFAULT_DEADLINE, cache=poster_cache,
+                    batch_size=MAX_TITLES_PER_QUERY):
+    """Resolve posters for many ``(title, year)`` pairs concurrently.
+
+    Returns ``{(title, year): url_or_None}`` for every title that was settled
+    before ``deadline`` seconds elapsed; titles still in flight are omitted.
+    With a ``cache`` they keep resolving in the background and their results
+    go to the cache only, so a later render finds them; titles an earlier
+    call still has in flight are omitted instead of being looked up twice.
+    Without a cache, stragglers are dropped.
+    """
+    start = time.monotonic()
+    resolved = {}
+    jobs = {}
+    for title, year in movies:
+        key = (title, year)
+        if key in resolved or key in jobs:
+            continue
+        found, url = cache.get(key) if cache is not None else (False, None)
+        if found:
+            resolved[key] = url
+        else:
+            jobs[key] = _TitleJob(title, year)
+    if cache is not None:
+        with _in_flight_lock:
+            jobs = {key: job for key, job in jobs.items() if key not in _in_flight}
+            _in_flight.update(jobs)
+    if not jobs:
+        return resolved
+
+    slug_owners = {}
+    for key, job in jobs.items():
+        for slug in job.slugs:
+            slug_owners.setdefault(slug, []).append(key)
+
+    # Set once the caller has its result; from then on only the cache is written
+    background = False
+
+    def remaining():
+        return deadline - (time.monotonic() - start)
+
+    def timeout():
+        if cache is not None:
+            # Stragglers finish in the background, so a request cut short by
+            # the deadline would only cache a spurious miss
+            return REQUEST_TIMEOUT
+        return max(0.1, min(REQUEST_TIMEOUT, remaining()))
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poster")
+    pending = {}
+
+    def submit(task, fn, *args):
+        pending[pool.submit(fn, *args, base_url, timeout())] = task
+
+    def settled(key):
+        url = jobs[key].url
+        if not background:
+            resolved[key] = url
+        if cache is not None:
+            cache.put(key, url)
+            with _in_flight_lock:
+                _in_flight.discard(key)
+
+    def record(key, slug, url):
+        job = jobs[key]
+        if job.done:
+            return
+        job.results[slug] = url
+        if job.settle():
+            settled(key)
+        elif not job.searched and all(s in job.results for s in job.slugs):
+            # Every direct slug missed: fall back to search for this title
+            job.searched = True
+            submit(("search", key, None), _wiki_search, search_query(job.title, job.year))
+
+    def drain(until=None):
+        while pending and (until is None or time.monotonic() < until):
+            left = None if until is None else until - time.monotonic()
+            finished, _ = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                kind, key, arg = pending.pop(fut)
+                result = fut.result()
+                if kind in ("pages", "hits") and result is None:
+                    # The batched query failed: look these pages up one by one
+                    for slug in arg:
+                        submit(("summary", key, slug), _wiki_summary, slug)
+                elif kind == "pages":
+                    for slug, url in result.items():
+                        for owner in slug_owners[slug]:
+                            record(owner, slug, url)
+                elif kind == "hits":
+                    for slug, url in result.items():
+                        record(key, slug, url)
+                elif kind == "summary":
+                    owners = [key] if key is not None else slug_owners[arg]
+                    for owner in owners:
+                        record(owner, arg, _extract(result))
+                else:
+                    job = jobs[key]
+                    job.hits = [h for h in result if h not in job.results]
+                    if job.hits:
+                        submit(("hits", key, job.hits), _wiki_pageimages, job.hits)
+                    elif job.settle():
+                        settled(key)
+
+    def finish():
+        pool.shutdown(wait=False, cancel_futures=True)
+        if cache is not None:
+            with _in_flight_lock:
+                _in_flight.difference_update(key for key, job in jobs.items() if not job.done)
+
+    def drain_in_background():
+        try:
+            drain()
+        finally:
+            finish()
+
+    try:
+        for chunk in _chunks(list(slug_owners), batch_size):
+            submit(("pages", None, chunk), _wiki_pageimages, chunk)
+        drain(start + deadline)
+    except BaseException:
+        finish()
+        raise
+    if pending and cache is not None:
+        # Don't hold the page on stragglers; they finish into the cache
+        background = True
+        threading.Thread(target=drain_in_background, name="poster-drain", daemon=True).start()
+    else:
+        finish()
+    return resolved
@@ -0,0 +1,159 @@
+"""
+Background hot-reload of the model when the catalog changes on disk.
+
+A ``ModelReloader`` loads the model once, then polls the catalog's file
+signature (size and mtime of the CSV, or of every file in a columnar
+directory) from a daemon thread. When the signature changes and then holds
+for one more poll, so a half-written CSV is not picked up, the new model is
+built in that thread while the old one keeps serving. It is then published
+with a single attribute assignment. Callers take ``reloader.model`` once per
+request and use that snapshot throughout, so a swap never mixes two catalog
+versions within one rerun. A failed rebuild keeps the previous model and is
+reported through ``metrics()``.
+
+With an ``artifact_dir``, every successful load prunes the artifact
+directories of other fingerprints. A directory that some model still uses,
+in this process or another, holds a lease and is kept until a later swap.
+"""
+
+import os
+import threading
+import time
+
+from recommender.artifacts import catalog_version, prune_artifacts
+
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+def catalog_signature(path):
+    """``(name, size, mtime_ns)`` of the catalog file, or of each file in a catalog directory."""
+    if os.path.isdir(path):
+        entries = sorted(os.scandir(path), key=lambda e: e.name)
+        return tuple((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in entries)
+    st = os.stat(path)
+    return ((os.path.basename(path), st.st_size, st.st_mtime_ns),)
+
+
+class ModelReloader:
+    """Holds the current model for ``path`` and rebuilds it when the catalog changes.
+
+    ``load`` is called as ``load(path)`` and returns a ``RecommenderModel``;
+    ``artifact_dir`` is where it keeps its artifacts, if anywhere.
+    """
+
+    def __init__(self, path, load, poll_interval=DEFAULT_POLL_INTERVAL, artifact_dir=None):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.artifact_dir = artifact_dir
+        self._load = load
+        self._model = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loaded_signature = None
+        self._seen_signature = None
+        self.reloads = 0
+        self.last_build_seconds = None
+        self.last_error = None
+
+    @property
+    def model(self):
+        """The current model snapshot, or ``None`` before the first load."""
+        return self._model
+
+    @property
+    def ready(self):
+        """True once a model has been loaded."""
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the first model is loaded and return it.
+
+        Raises the load error if the first load failed, and ``TimeoutError``
+        if ``timeout`` seconds pass first.
+        """
+        while not self._ready.wait(0.05 if timeout is None else min(0.05, timeout)):
+            if self.last_error is not None:
+                raise self.last_error
+            if timeout is not None:
+                timeout -= 0.05
+                if timeout <= 0:
+                    raise TimeoutError(f"Model for {self.path} not ready")
+        return self._model
+
+    def reload(self):
+        """Build a model from the catalog as it is now and swap it in.
+
+        Returns True on success. On failure the previous model stays current
+        and the error is kept in ``last_error``.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                signature = catalog_signature(self.path)
+                model = self._load(self.path)
+                if model.catalog_version is None:
+                    model.catalog_version = catalog_version(self.path)
+            except Exception as e:
+                self.last_error = e
+                return False
+            self._model = model
+            self._loaded_signature = self._seen_signature = signature
+            self.last_build_seconds = time.perf_counter() - start
+            self.last_error = None
+            if self._ready.is_set():
+                self.reloads += 1
+            self._ready.set()
+            if self.artifact_dir is not None and model.fingerprint is not None:
+                prune_artifacts(self.artifact_dir, keep={model.fingerprint})
+            return True
+
+    def check(self):
+        """Reload if the catalog changed and has been stable since the last check.
+
+        Returns True if a new model was swapped in.
+        """
+        try:
+            signature = catalog_signature(self.path)
+        except OSError:
+            return False
+        stable = signature == self._seen_signature
+        self._seen_signature = signature
+        if signature == self._loaded_signature or not stable:
+            return False
+        return self.reload()
+
+    def start(self):
+        """Load the first model and watch the catalog from a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        if self._model is None:
+            self.reload()
+        while self.poll_interval and not self._stop.wait(self.poll_interval):
+            if self._model is None:
+                self.reload()
+            else:
+                self.check()
+
+    def metrics(self):
+        """Readiness and catalog version of the current model, plus reload counters."""
+        model = self._model
+        return {
+            "ready": self.ready,
+            "catalog_version": model.catalog_version if model is not None else None,
+            "movies": len(model) if model is not None else 0,
+            "reloads": self.reloads,
+            "last_build_seconds": self.last_build_seconds,
+            "last_error": str(self.last_error) if self.last_error is not None else None,
+        }
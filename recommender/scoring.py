@@ -0,0 +1,67 @@
+"""
+Hybrid scoring: genre similarity blended with rating and release-era proximity.
+"""
+
+import numpy as np
+
+
+def top_k_indices(scores, k):
+    """Indices of the ``k`` largest scores, highest first, ties by lower index.
+
+    Matches a stable descending sort of the whole array but only partitions
+    it (O(N)) and sorts the ``k`` survivors.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= len(scores):
+        return np.lexsort((np.arange(len(scores)), -scores))
+
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > kth)
+    # Fill the remaining slots with the lowest-index ties at the cut-off
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    candidates = np.concatenate((above, ties))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def hybrid_scores(seed_row, genre_sim, features, rating_weight=0.3, year_weight=0.1,
+                  genre_weight=0.6):
+    """Blend genre, rating and era similarity to the seed into one float64 array.
+
+    Pure NumPy over the precomputed ``FeatureArrays``; a signal only counts
+    when the seed itself has a value for it. Sums are float64 in the
+    original order of operations, so near-ties rank exactly as before.
+    """
+    combined = genre_weight * np.asarray(genre_sim, dtype=np.float64)
+
+    if features.ratings is not None and features.rating_known[seed_row]:
+        rating_diff = np.abs(features.ratings - features.ratings[seed_row])
+        combined += rating_weight * (1 - rating_diff / 10.0)
+
+    if features.years is not None and features.year_known[seed_row]:
+        year_diff = np.abs(features.years - features.years[seed_row])
+        combined += year_weight * np.clip(1 - year_diff / 100.0, 0, 1)
+
+    return combined
+
+
+def hybrid_recommendations(seed_row, catalog, neighbor_index, top_n=5,
+                           rating_weight=0.3, year_weight=0.1, genre_weight=0.6):
+    """Get movie recommendations using hybrid approach (genre + rating + recency).
+
+    ``seed_row`` is the positional row id of the selected movie, as returned
+    by ``TitleIndex.lookup``. ``neighbor_index`` supplies the genre similarity
+    through ``dense_row``; a ``TfidfSimilarity`` or ``BitsetSimilarity`` works
+    as well.
+    """
+    combined_sim = hybrid_scores(
+        seed_row, neighbor_index.dense_row(seed_row), catalog.features,
+        rating_weight=rating_weight, year_weight=year_weight, genre_weight=genre_weight,
+    )
+    combined_sim[seed_row] = -np.inf
+    sim_idx = top_k_indices(combined_sim, min(top_n, len(combined_sim) - 1))
+    sim_values = combined_sim[sim_idx]
+
+    result = catalog.movies.iloc[sim_idx].copy()
+    result['similarity_score'] = [round(score * 100, 1) for score in sim_values]
+    return result
@@ -0,0 +1,198 @@
+"""
+Trigram search over titles and directors.
+
+Each field is normalized once (accents stripped, case-folded, punctuation
+collapsed to single spaces), deduplicated, and indexed as a sorted array of
+trigram codes with a posting list of ``(string id, position)`` occurrences
+per trigram. Strings are padded with a start marker, so the same postings
+answer prefix, word-prefix and substring queries of any length exactly,
+without rescanning any strings:
+
+* three or more characters intersect the occurrences of the query's
+  trigrams, shifted back to a common start position (rarest first);
+* one or two characters take the contiguous run of trigrams that start
+  with them.
+
+Matches are ranked by class (exact, prefix, word prefix, substring), with
+title matches before director matches within a class; ties go to the higher
+rated film.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ("title", "director")
+START, END = "\x02", "\x03"
+_CHAR_BITS = 21
+_POS_BITS = 20
+_COMBINING = re.compile(r"[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def normalize_text(text):
+    """Accent-free, case-folded ``text`` with punctuation runs as single spaces."""
+    if not isinstance(text, str):
+        return ""
+    if text.isascii():
+        return _SEPARATORS.sub(" ", text.lower()).strip()
+    text = _COMBINING.sub("", unicodedata.normalize("NFKD", text)).casefold()
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def _intersect_sorted(a, b):
+    """Intersection of two sorted arrays, in ``O(len(a) log len(b))``."""
+    if not len(a) or not len(b):
+        return a[:0]
+    idx = np.searchsorted(b, a)
+    idx[idx == len(b)] = 0
+    return a[b[idx] == a]
+
+
+def _unique_sorted(a):
+    keep = np.ones(len(a), dtype=bool)
+    keep[1:] = a[1:] != a[:-1]
+    return a[keep]
+
+
+def _code(chars):
+    """Pack up to three characters into one int, left-aligned like a full trigram."""
+    code = 0
+    for ch in chars:
+        code = (code << _CHAR_BITS) | ord(ch)
+    return code << _CHAR_BITS * (3 - len(chars))
+
+
+class _FieldIndex:
+    """Positional trigram postings over the distinct normalized values of one column."""
+
+    def __init__(self, values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Already dictionary-encoded; missing values get a trailing slot
+            raw = list(values.cat.categories) + [None]
+            raw_ids = np.where(values.cat.codes < 0, len(raw) - 1, values.cat.codes)
+        else:
+            raw_ids, raw = pd.factorize(pd.Series(values, dtype="object"), use_na_sentinel=False)
+        norm_ids, uniques = pd.factorize(pd.Series([normalize_text(v) for v in raw], dtype="object"))
+        ids = norm_ids[raw_ids]
+        self.lengths = np.fromiter((len(s) for s in uniques), dtype=np.int64, count=len(uniques))
+
+        # String id -> catalog rows, as CSR
+        self.rows = np.argsort(ids, kind="stable").astype(np.int32)
+        self.row_offsets = np.concatenate(([0], np.cumsum(np.bincount(ids, minlength=len(uniques)))))
+
+        padded = "".join(f"{START}{s}{END}{END}" for s in uniques)
+        chars = np.frombuffer(padded.encode("utf-32-le"), dtype="<u4").astype(np.int64)
+        sizes = self.lengths + 3
+        owner = np.repeat(np.arange(len(uniques), dtype=np.int64), sizes)
+        pos = np.arange(len(chars), dtype=np.int64) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        codes = (chars[:-2] << 2 * _CHAR_BITS) | (chars[1:-1] << _CHAR_BITS) | chars[2:]
+        valid = (owner[:-2] == owner[2:]) & (pos[:-2] < (1 << _POS_BITS))
+        codes = codes[valid]
+        occurrences = (owner[:-2][valid] << _POS_BITS) | pos[:-2][valid]
+
+        # Occurrences are generated in (string, position) order; a stable sort
+        # by trigram keeps every posting list sorted
+        order = np.argsort(codes, kind="stable")
+        self.keys, starts = np.unique(codes[order], return_index=True)
+        self.offsets = np.append(starts, len(order))
+        self.postings = occurrences[order]
+
+    def _starting_with(self, chars):
+        # Trigram codes sharing a leading part form one contiguous run of keys
+        lo = _code(chars)
+        hi = lo | ((1 << _CHAR_BITS * (3 - len(chars))) - 1)
+        i = np.searchsorted(self.keys, lo, side="left")
+        j = np.searchsorted(self.keys, hi, side="right")
+        return self.postings[self.offsets[i]:self.offsets[j]]
+
+    def _posting(self, chars):
+        code = _code(chars)
+        i = np.searchsorted(self.keys, code)
+        if i == len(self.keys) or self.keys[i] != code:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def find(self, pattern):
+        """Ids of the strings whose padded form contains ``pattern``."""
+        if len(pattern) < 3:
+            return np.unique(self._starting_with(pattern) >> _POS_BITS)
+
+        # Non-overlapping trigrams plus the last one cover the whole pattern;
+        # shifting each occurrence back by its offset aligns them on the start
+        offsets = sorted(set(range(0, len(pattern) - 2, 3)) | {len(pattern) - 3})
+        aligned = []
+        for offset in offsets:
+            occ = self._posting(pattern[offset:offset + 3])
+            aligned.append(occ[(occ & ((1 << _POS_BITS) - 1)) >= offset] - offset)
+        aligned.sort(key=len)
+        starts = aligned[0]
+        for other in aligned[1:]:
+            starts = _intersect_sorted(starts, other)
+        return _unique_sorted(starts >> _POS_BITS)
+
+    def match(self, query):
+        """Matching string ids and their rank class."""
+        found = self.find(query)
+        if not len(found):
+            return found, found
+        prefix = self.find(START + query)
+        word = self.find(" " + query)
+
+        classes = np.full(len(found), SUBSTRING, dtype=np.int64)
+        classes[np.isin(found, word, assume_unique=True)] = WORD_PREFIX
+        is_prefix = np.isin(found, prefix, assume_unique=True)
+        classes[is_prefix] = PREFIX
+        classes[is_prefix & (self.lengths[found] == len(query))] = EXACT
+        return found, classes
+
+    def expand(self, ids, values):
+        """Catalog rows of the string ``ids``, with ``values`` repeated per row."""
+        starts = self.row_offsets[ids]
+        counts = self.row_offsets[ids + 1] - starts
+        total = int(counts.sum())
+        shift = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        return self.rows[np.arange(total) + shift], np.repeat(values, counts)
+
+
+class SearchIndex:
+    """Ranked title/director search over a movie table, built once per catalog."""
+
+    def __init__(self, movies):
+        self._n = len(movies)
+        self._fields = [_FieldIndex(movies[f]) for f in SEARCH_FIELDS if f in movies.columns]
+        if 'rating' in movies.columns:
+            ratings = movies['rating'].to_numpy(dtype=np.float64, na_value=np.nan)
+            order = np.lexsort((np.arange(self._n), -np.nan_to_num(ratings), np.isnan(ratings)))
+        else:
+            order = np.arange(self._n)
+        self._popularity = np.empty(self._n, dtype=np.int64)
+        self._popularity[order] = np.arange(self._n)
+
+    def __len__(self):
+        return self._n
+
+    def search(self, query, limit=None):
+        """Row ids matching ``query`` in any field, best match first."""
+        query = normalize_text(query)
+        if not query:
+            return np.empty(0, dtype=np.int64)
+
+        rows, keys = [], []
+        for field_no, field in enumerate(self._fields):
+            ids, classes = field.match(query)
+            field_rows, field_classes = field.expand(ids, classes)
+            rows.append(field_rows)
+            keys.append((field_classes * len(self._fields) + field_no) * self._n)
+        rows = np.concatenate(rows).astype(np.int64)
+        keys = np.concatenate(keys) + self._popularity[rows]
+
+        # A row matched in both fields keeps its best key
+        rows = rows[np.argsort(keys, kind="stable")]
+        _, first = np.unique(rows, return_index=True)
+        ranked = rows[np.sort(first)]
+        return ranked if limit is None else ranked[:limit]
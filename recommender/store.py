@@ -0,0 +1,52 @@
+"""
+Raw, page-aligned array store opened with ``np.memmap``.
+
+Arrays are written back to back into one binary file, each starting on an
+``ALIGNMENT`` boundary, and described by a small JSON-friendly layout
+(name → dtype, shape, offset). Readers map the file read-only, so every
+server process on a host shares one physical copy through the OS page cache
+and nothing is copied at load time.
+"""
+
+import os
+
+import numpy as np
+
+ALIGNMENT = 4096
+
+
+def write_store(path, arrays, alignment=ALIGNMENT):
+    """Write ``{name: ndarray}`` to ``path``; return the layout needed to map it."""
+    layout = {}
+    offset = 0
+    with open(path, "wb") as fh:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            pad = -offset % alignment
+            fh.write(b"\0" * pad)
+            offset += pad
+            layout[name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            fh.write(array.tobytes())
+            offset += array.nbytes
+        fh.flush()
+        os.fsync(fh.fileno())
+    return layout
+
+
+def open_store(path, layout):
+    """Map every array in ``layout`` read-only from ``path``."""
+    mapped = {}
+    for name, spec in layout.items():
+        shape = tuple(spec["shape"])
+        if 0 in shape:
+            # mmap cannot map zero bytes; an empty array needs no sharing
+            mapped[name] = np.empty(shape, dtype=np.dtype(spec["dtype"]))
+            mapped[name].setflags(write=False)
+            continue
+        mapped[name] = np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="r",
+                                 offset=spec["offset"], shape=shape)
+    return mapped
@@ -0,0 +1,141 @@
+"""
+Per-rerun timing spans and cache hit/miss counters.
+
+Every Streamlit interaction reruns app.py from the top. The script starts a
+``RerunTrace`` and closes each top-level stage with ``trace.mark(name)``.
+Nested work runs inside ``trace.span(name)``, and cache lookups are counted.
+``finish()`` then writes the trace as one JSON line to the
+``recommender.rerun`` logger and records it in the Prometheus rerun
+metrics (``recommender.metrics``); the app's debug panel shows the same data.
+
+The active trace lives in a context variable, so code inside a cached
+function can record a miss (``miss(name)``) without the trace being passed
+in. That body only runs on a cache miss. Outside a rerun every helper is a
+no-op. A span costs two ``perf_counter`` calls.
+
+Set ``RECOMMENDER_RERUN_LOG=0`` to silence the log lines.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+
+from recommender import metrics
+
+logger = logging.getLogger("recommender.rerun")
+if os.environ.get("RECOMMENDER_RERUN_LOG", "1") != "0" and not logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_current = contextvars.ContextVar("rerun_trace", default=None)
+
+
+class RerunTrace:
+    """Timings and cache counters of one script run; becomes the current trace."""
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.spans = {}
+        self.caches = {}
+        self.total = None
+        self._missed = {}
+        self._start = self._last = time.perf_counter()
+        _current.set(self)
+
+    def mark(self, name):
+        """Record the time since the previous mark (or the start) as stage ``name``."""
+        now = time.perf_counter()
+        self.spans[name] = self.spans.get(name, 0.0) + now - self._last
+        self._last = now
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Add the time spent in the block to ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, cache, hit, n=1):
+        """Record ``n`` hits (or misses) on ``cache``."""
+        counts = self.caches.setdefault(cache, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += n
+
+    @contextlib.contextmanager
+    def lookup(self, cache, histogram=None):
+        """Count one lookup on ``cache``: a miss if ``miss(cache)`` runs inside, else a hit.
+
+        With ``histogram`` the block's wall time is observed, labelled ``"hit"``
+        or ``"miss"``.
+        """
+        self._missed[cache] = False
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            hit = not self._missed.pop(cache)
+            self.count(cache, hit)
+            if histogram is not None:
+                histogram.observe(time.perf_counter() - start, "hit" if hit else "miss")
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def to_dict(self):
+        total = self.total if self.total is not None else self.elapsed()
+        return {
+            "event": "rerun",
+            **self.fields,
+            "total_ms": round(total * 1e3, 3),
+            "spans": {name: round(s * 1e3, 3) for name, s in self.spans.items()},
+            "caches": {name: dict(c) for name, c in self.caches.items()},
+        }
+
+    def finish(self):
+        """Stop the clock, log the trace as JSON and return it as a dict."""
+        if self.total is None:
+            self.total = self.elapsed()
+            if _current.get() is self:
+                _current.set(None)
+            stats = self.to_dict()
+            metrics.observe_rerun(stats)
+            logger.info(json.dumps(stats))
+        return self.to_dict()
+
+
+def current():
+    """The trace of the script run in progress on this thread, or ``None``."""
+    return _current.get()
+
+
+def miss(cache):
+    """Mark the enclosing ``lookup(cache)`` of the current trace as a miss."""
+    trace = _current.get()
+    if trace is not None and cache in trace._missed:
+        trace._missed[cache] = True
+
+
+class CountingCache:
+    """A poster cache whose ``get`` results are counted on the current trace."""
+
+    def __init__(self, cache, name):
+        self.cache = cache
+        self.name = name
+
+    def get(self, key):
+        found, url = self.cache.get(key)
+        trace = _current.get()
+        if trace is not None:
+            trace.count(self.name, found)
+        return found, url
+
+    def __getattr__(self, attr):
+        return getattr(self.cache, attr)
@@ -0,0 +1,84 @@
+"""
+Exact TF-IDF cosine rows, computed per query from the distinct descriptions.
+
+A top-K neighbor list cannot rank titles tied at its cut-off, and genre
+descriptions repeat so much that hundreds of titles often tie there. The
+hybrid scorer therefore reads the seed's full cosine row from here instead.
+Rows with the same description have the same vector, so only the distinct
+descriptions are stored (L2-normalized, once by description and once by
+term) plus the int32 description id of every row. A seed row is a sum over
+its few terms of the matching term columns, then one gather over the rows.
+
+The sums run in the order of the seed's terms, as in scipy's sparse
+product, so every row is bit-identical to ``cosine_similarity`` on the
+feature matrix.
+"""
+
+import numpy as np
+
+FIELDS = ("codes", "row_ptr", "row_terms", "row_values", "col_ptr", "col_rows", "col_values")
+
+
+class TfidfSimilarity:
+    """Cosine similarity between TF-IDF description vectors, one seed at a time.
+
+    Exposes ``dense_row`` like ``NeighborIndex``, so the hybrid scorer can use
+    either.
+    """
+
+    def __init__(self, codes, row_ptr, row_terms, row_values, col_ptr, col_rows, col_values):
+        self.codes = codes
+        # Distinct descriptions by description (CSR) and by term (CSC)
+        self.row_ptr = row_ptr
+        self.row_terms = row_terms
+        self.row_values = row_values
+        self.col_ptr = col_ptr
+        self.col_rows = col_rows
+        self.col_values = col_values
+
+    @classmethod
+    def from_matrix(cls, feature_matrix, codes):
+        """Build from the catalog's TF-IDF rows and per-row description ids.
+
+        ``codes`` may be any ids that are equal for equal descriptions, e.g.
+        ``GenreIndex.codes``.
+        """
+        from sklearn.preprocessing import normalize
+
+        _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        by_row = normalize(feature_matrix[first]).tocsr()
+        by_term = by_row.tocsc()
+        return cls(inverse.reshape(-1).astype(np.int32),
+                   by_row.indptr.astype(np.int64), by_row.indices.astype(np.int32),
+                   by_row.data.astype(np.float64),
+                   by_term.indptr.astype(np.int64), by_term.indices.astype(np.int32),
+                   by_term.data.astype(np.float64))
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def n_patterns(self):
+        return len(self.row_ptr) - 1
+
+    @property
+    def arrays(self):
+        """``{field: ndarray}`` for storing and restoring with ``TfidfSimilarity(**arrays)``."""
+        return {field: getattr(self, field) for field in FIELDS}
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays.values())
+
+    def pattern_scores(self, pattern):
+        """Cosine of every distinct description to description ``pattern``."""
+        scores = np.zeros(self.n_patterns, dtype=np.float64)
+        start, stop = self.row_ptr[pattern], self.row_ptr[pattern + 1]
+        for term, value in zip(self.row_terms[start:stop], self.row_values[start:stop]):
+            lo, hi = self.col_ptr[term], self.col_ptr[term + 1]
+            scores[self.col_rows[lo:hi]] += value * self.col_values[lo:hi]
+        return scores
+
+    def dense_row(self, row):
+        """Cosine of every title to ``row`` as a length-N float64 vector."""
+        return self.pattern_scores(self.codes[row])[self.codes]
@@ -0,0 +1,208 @@
+"""
+Card-sized poster thumbnails cached on disk.
+
+Wikipedia's ``originalimage`` is often several megabytes. ``ThumbnailCache``
+downloads each poster once, crops it to the 2:3 card shape at a couple of
+widths, encodes WebP (JPEG where Pillow lacks WebP support) and stores the
+results content-addressed by the SHA-256 of the source image::
+
+    <root>/ab/abcdef…-240.webp
+    <root>/ab/abcdef…-480.webp
+    <root>/refs/<sha256 of url>      # -> source digest
+    <root>/failed/<sha256 of url>    # download or decode failed (mtime)
+
+so the same image reached through two URLs is stored once, and a restart
+serves every known poster without touching the network.
+
+The default root lives under the app's ``static/`` folder, which Streamlit
+serves at ``app/static/`` when ``server.enableStaticServing`` is on. Cards
+link the thumbnails by URL (``ThumbnailCache.url``), so browsers cache them
+instead of receiving them with every rerun. File names are content
+addresses and never change.
+
+Sources that fail to download or decode are remembered for
+``FAILURE_TTL``, like misses in the SQLite poster cache, so a broken or
+slow image host is not retried on every rerun. Downloads never hold a page
+past its deadline: they finish in the background and a later rerun links
+the thumbnail.
+"""
+
+import hashlib
+import threading
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from PIL import Image, ImageOps, features
+
+from recommender.posters import (
+    DEFAULT_DEADLINE, DEFAULT_MAX_WORKERS, REQUEST_TIMEOUT, _get_bytes,
+)
+
+DEFAULT_THUMBNAIL_DIR = os.path.join("static", "thumbnails")
+THUMBNAIL_WIDTHS = (240, 480)
+ASPECT_RATIO = 1.5
+QUALITY = 80
+FAILURE_TTL = 86400
+FORMAT, EXTENSION = ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def render_thumbnail(image, width, fmt=FORMAT, quality=QUALITY):
+    """Crop ``image`` to the card aspect ratio at ``width`` pixels and encode it."""
+    width = min(width, image.width)
+    size = (width, round(width * ASPECT_RATIO))
+    thumb = ImageOps.fit(image, size, Image.LANCZOS)
+    out = io.BytesIO()
+    if fmt == "WEBP":
+        thumb.save(out, fmt, quality=quality, method=4)
+    else:
+        thumb.save(out, fmt, quality=quality, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+class ThumbnailCache:
+    """Content-addressed on-disk cache of poster thumbnails, keyed by source URL.
+
+    ``base_url`` is the URL under which ``root`` is served, e.g.
+    ``app/static/thumbnails``; without it ``url()`` always returns None.
+    """
+
+    def __init__(self, root=DEFAULT_THUMBNAIL_DIR, widths=THUMBNAIL_WIDTHS, base_url=None,
+                 failure_ttl=FAILURE_TTL):
+        self.root = root
+        self.widths = tuple(widths)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.failure_ttl = failure_ttl
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def _ref_path(self, url):
+        return os.path.join(self.root, "refs", _sha256(url.encode("utf-8")))
+
+    def _failure_path(self, url):
+        return os.path.join(self.root, "failed", _sha256(url.encode("utf-8")))
+
+    def _thumb_name(self, digest, width):
+        return f"{digest[:2]}/{digest}-{width}.{EXTENSION}"
+
+    def _thumb_path(self, digest, width):
+        return os.path.join(self.root, *self._thumb_name(digest, width).split("/"))
+
+    def _digest(self, url):
+        try:
+            with open(self._ref_path(url), encoding="ascii") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def path(self, url, width):
+        """Path of the cached ``width`` thumbnail for ``url``, or None."""
+        digest = self._digest(url)
+        if digest is None:
+            return None
+        path = self._thumb_path(digest, width)
+        return path if os.path.exists(path) else None
+
+    def url(self, url, width):
+        """URL of the cached ``width`` thumbnail for ``url`` under ``base_url``, or None."""
+        if self.base_url is None:
+            return None
+        digest = self._digest(url)
+        if digest is None or not os.path.exists(self._thumb_path(digest, width)):
+            return None
+        return f"{self.base_url}/{self._thumb_name(digest, width)}"
+
+    def failed(self, url, now=None):
+        """True while a failed download or decode of ``url`` is within ``failure_ttl``."""
+        try:
+            failed_at = os.path.getmtime(self._failure_path(url))
+        except OSError:
+            return False
+        return (time.time() if now is None else now) - failed_at <= self.failure_ttl
+
+    def record_failure(self, url):
+        _write_atomic(self._failure_path(url), b"")
+
+    def store(self, url, data):
+        """Render and store thumbnails for the image bytes ``data`` fetched from ``url``.
+
+        Raises whatever Pillow raises for data that is not a readable image.
+        """
+        digest = _sha256(data)
+        missing = [w for w in self.widths if not os.path.exists(self._thumb_path(digest, w))]
+        if missing:
+            with Image.open(io.BytesIO(data)) as img:
+                img = ImageOps.exif_transpose(img).convert("RGB")
+                for width in missing:
+                    _write_atomic(self._thumb_path(digest, width), render_thumbnail(img, width))
+        _write_atomic(self._ref_path(url), digest.encode("ascii"))
+        return digest
+
+    def ensure(self, urls, max_workers=DEFAULT_MAX_WORKERS, deadline=DEFAULT_DEADLINE):
+        """Download and thumbnail every URL in ``urls`` that is not cached yet.
+
+        Returns the set of URLs whose thumbnails are available. Downloads that
+        fail or are not images are recorded and skipped until ``failure_ttl``
+        has passed. ``deadline`` only bounds the wait: downloads not done by
+        then, including ones not started yet, finish in the background with
+        their own ``REQUEST_TIMEOUT``, and later calls neither wait for them
+        nor start them again. ``deadline=0`` just starts the downloads.
+        """
+        start = time.monotonic()
+        ready = set()
+        todo = []
+        with self._lock:
+            for url in dict.fromkeys(u for u in urls if u):
+                if all(self.path(url, w) for w in self.widths):
+                    ready.add(url)
+                elif url not in self._inflight and not self.failed(url):
+                    self._inflight.add(url)
+                    todo.append(url)
+        if not todo:
+            return ready
+
+        def fetch(url):
+            try:
+                data = _get_bytes(url, REQUEST_TIMEOUT)
+                self.store(url, data)
+            except Exception:
+                self.record_failure(url)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight.discard(url)
+            return url
+
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        pending = {pool.submit(fetch, url) for url in todo}
+        try:
+            while pending:
+                left = deadline - (time.monotonic() - start)
+                if left <= 0:
+                    break
+                finished, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    if fut.exception() is None:
+                        ready.add(fut.result())
+        finally:
+            # Don't hold the page on stragglers; they finish in the background
+            pool.shutdown(wait=False)
+        return ready
@@ -0,0 +1,137 @@
+"""
+Boot-time warmup, so the first visitor never pays for the model build.
+
+``run`` builds (or reuses) the model artifacts for the catalog and resolves
+the Top Rated posters into the durable poster cache. It also renders their
+thumbnails under a generous deadline. A Streamlit process started afterwards
+only memory-maps the artifacts, and its first Top Rated grid is served from
+disk. A marker file records what was warmed.
+
+``check`` is the readiness probe. It exits 0 once artifacts for the current
+catalog and parameters exist (or always, for the bitset engine, which has
+nothing to build), and 1 otherwise, printing the details as JSON.
+
+Defaults follow the app's environment variables.
+
+Usage:
+    python -m recommender.warmup run
+    python -m recommender.warmup check
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from recommender import artifacts
+from recommender.model import DEFAULT_ENGINE, load_model, model_params
+from recommender.poster_cache import DEFAULT_DB_PATH, SQLitePosterCache
+from recommender.posters import resolve_posters
+from recommender.thumbnails import DEFAULT_THUMBNAIL_DIR, ThumbnailCache
+
+TOP_RATED_COUNT = 10
+WARMUP_DEADLINE = 60.0
+DEFAULT_MARKER = os.path.join(".cache", "warmup.json")
+
+
+def top_rated_rows(movies, n=TOP_RATED_COUNT):
+    """Row labels of the ``n`` highest-rated titles, as shown in the Top Rated grid."""
+    return movies.nlargest(n, 'rating').index if 'rating' in movies.columns else movies.index[:0]
+
+
+def _write_marker(path, state):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=2)
+    os.replace(tmp, path)
+
+
+def run(csv_path="movies.csv", artifact_dir=artifacts.DEFAULT_ARTIFACT_DIR,
+        engine=DEFAULT_ENGINE, poster_db=DEFAULT_DB_PATH, thumbnail_dir=DEFAULT_THUMBNAIL_DIR,
+        posters=True, base_url=None, deadline=WARMUP_DEADLINE, marker=DEFAULT_MARKER):
+    """Build or load the model, prefetch Top Rated posters, and write the marker.
+
+    Returns the marker contents.
+    """
+    start = time.perf_counter()
+    model = load_model(csv_path, artifact_dir=artifact_dir, engine=engine)
+    state = {
+        "catalog_version": model.catalog_version,
+        "fingerprint": model.fingerprint,
+        "engine": model.engine,
+        "movies": len(model),
+        "model_seconds": round(time.perf_counter() - start, 3),
+    }
+
+    if posters:
+        keys = [model.titles.key(row) for row in top_rated_rows(model.movies)]
+        resolved = resolve_posters(keys, base_url=base_url, deadline=deadline,
+                                   cache=SQLitePosterCache(poster_db, model.catalog_version))
+        urls = [url for url in resolved.values() if url]
+        thumbnails = ThumbnailCache(thumbnail_dir).ensure(urls, deadline=deadline)
+        state["posters"] = {"titles": len(keys), "resolved": len(resolved),
+                            "found": len(urls), "thumbnails": len(thumbnails)}
+
+    state["seconds"] = round(time.perf_counter() - start, 3)
+    state["warmed_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    if marker:
+        _write_marker(marker, state)
+    return state
+
+
+def check(csv_path="movies.csv", artifact_dir=artifacts.DEFAULT_ARTIFACT_DIR,
+          engine=DEFAULT_ENGINE, marker=DEFAULT_MARKER):
+    """Readiness of this host for ``csv_path``: ``{"ready": bool, ...}``."""
+    if not os.path.exists(csv_path):
+        return {"ready": False, "reason": f"catalog not found: {csv_path}"}
+    version = artifacts.catalog_version(csv_path)
+    state = {"catalog_version": version, "engine": engine}
+    if engine == "bitset":
+        state["ready"] = True
+    else:
+        fingerprint = artifacts.catalog_fingerprint(csv_path, model_params(), version)
+        state["fingerprint"] = fingerprint
+        state["ready"] = artifacts.has_artifacts(artifact_dir, fingerprint)
+        if not state["ready"]:
+            state["reason"] = "no artifacts for the current catalog"
+    if marker and os.path.exists(marker):
+        with open(marker, encoding="utf-8") as fh:
+            warmed = json.load(fh)
+        state["warmed_at"] = warmed.get("warmed_at")
+        state["posters_warm"] = warmed.get("catalog_version") == version and "posters" in warmed
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm up the recommender before traffic arrives.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("run", "build the model and prefetch Top Rated posters"),
+                            ("check", "readiness probe; exit status 0 when ready")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--csv", default=os.environ.get("RECOMMENDER_CATALOG", "movies.csv"))
+        cmd.add_argument("--artifacts", default=os.environ.get(
+            "RECOMMENDER_ARTIFACT_DIR", artifacts.DEFAULT_ARTIFACT_DIR))
+        cmd.add_argument("--engine", default=os.environ.get("RECOMMENDER_ENGINE", DEFAULT_ENGINE))
+        cmd.add_argument("--marker", default=DEFAULT_MARKER)
+    run_cmd = sub.choices["run"]
+    run_cmd.add_argument("--poster-db", default=os.environ.get("POSTER_CACHE_PATH", DEFAULT_DB_PATH))
+    run_cmd.add_argument("--thumbnails", default=os.environ.get("THUMBNAIL_DIR", DEFAULT_THUMBNAIL_DIR))
+    run_cmd.add_argument("--no-posters", action="store_true", help="skip the poster prefetch")
+    run_cmd.add_argument("--deadline", type=float, default=WARMUP_DEADLINE)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        state = run(args.csv, args.artifacts, args.engine, args.poster_db, args.thumbnails,
+                    posters=not args.no_posters, deadline=args.deadline, marker=args.marker)
+        print(json.dumps(state))
+        return 0
+
+    state = check(args.csv, args.artifacts, args.engine, marker=args.marker)
+    print(json.dumps(state))
+    return 0 if state["ready"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
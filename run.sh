@@ -4,5 +4,9 @@
 # Activate virtual environment
 source venv/bin/activate
 
+# Build the model and prefetch Top Rated posters before serving traffic.
+# Readiness probe for orchestrators: python -m recommender.warmup check
+python -m recommender.warmup run || exit 1
+
 # Run the Streamlit app
 streamlit run app.py
@@ -0,0 +1,135 @@
+"""
+A local stand-in for the Wikipedia endpoints used by the poster resolver.
+
+Serves ``/api/rest_v1/page/summary/<slug>``, the ``/w/api.php``
+``list=search`` and ``prop=pageimages`` queries and raw image files from
+in-memory dictionaries over keep-alive HTTP/1.1, with an optional
+per-request delay so tests and benchmarks can exercise batching,
+concurrency and deadlines offline.
+"""
+
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up at their deadline close the socket mid-reply
+        pass
+
+
+class FakeWikipedia:
+    """Run with ``with FakeWikipedia(pages) as wiki:`` and point clients at ``wiki.url``.
+
+    ``pages`` maps page titles to image URLs (``None`` for a page without an
+    image); ``search`` maps search queries to lists of page titles and
+    ``redirects`` maps redirect titles to their target page. ``images`` maps
+    URL paths to raw image bytes served as-is.
+    """
+
+    def __init__(self, pages=None, search=None, delay=0.0, redirects=None, images=None):
+        self.pages = dict(pages or {})
+        self.images = dict(images or {})
+        self.search = dict(search or {})
+        self.redirects = dict(redirects or {})
+        self.delay = delay
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, prefix):
+        with self._lock:
+            return sum(1 for path in self.requests if path.startswith(prefix))
+
+    def _handler(self):
+        wiki = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with wiki._lock:
+                    wiki.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                with wiki._lock:
+                    wiki.requests.append(self.path)
+                if wiki.delay:
+                    time.sleep(wiki.delay)
+                parsed = urllib.parse.urlsplit(self.path)
+                summary_prefix = "/api/rest_v1/page/summary/"
+                if parsed.path.startswith(summary_prefix):
+                    slug = urllib.parse.unquote(parsed.path[len(summary_prefix):]).replace("_", " ")
+                    if slug not in wiki.pages:
+                        return self._send(404, {"title": "Not found."})
+                    body = {"title": slug}
+                    if wiki.pages[slug]:
+                        body["originalimage"] = {"source": wiki.pages[slug]}
+                    return self._send(200, body)
+                if parsed.path == "/w/api.php":
+                    query = urllib.parse.parse_qs(parsed.query)
+                    if query.get("prop") == ["pageimages"]:
+                        return self._send(200, wiki._pageimages(query["titles"][0].split("|")))
+                    hits = wiki.search.get(query.get("srsearch", [""])[0], [])
+                    return self._send(200, {"query": {"search": [{"title": h} for h in hits]}})
+                if parsed.path in wiki.images:
+                    payload = wiki.images[parsed.path]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/jpeg")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    return self.wfile.write(payload)
+                return self._send(404, {})
+
+        return Handler
+
+    def _pageimages(self, titles):
+        # Mirrors the formatversion=2 response shape of the action API
+        redirects, pages = [], []
+        for title in dict.fromkeys(titles):
+            target = self.redirects.get(title)
+            if target is not None:
+                redirects.append({"from": title, "to": target})
+                title = target
+            if title not in self.pages:
+                pages.append({"title": title, "missing": True})
+                continue
+            page = {"title": title}
+            if self.pages[title]:
+                page["original"] = {"source": self.pages[title]}
+            pages.append(page)
+        return {"batchcomplete": True, "query": {"redirects": redirects, "pages": pages}}
+
+    def __enter__(self):
+        self._server = _QuietServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,137 @@
+"""
+Unit tests for persistent model artifacts.
+"""
+
+import pytest
+import numpy as np
+import shutil
+import subprocess
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import load_model
+from recommender.artifacts import (
+    acquire_lease, catalog_fingerprint, has_artifacts, prune_artifacts,
+)
+from recommender.model import model_params
+from recommender.store import ALIGNMENT as STORE_ALIGNMENT
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    """A private copy of movies.csv that tests may modify."""
+    path = tmp_path / 'movies.csv'
+    shutil.copy(CSV_PATH, path)
+    return str(path)
+
+
+class TestArtifacts:
+    """Test suite for building and reusing artifact directories."""
+
+    def test_first_load_builds_then_reuses(self, csv_copy, tmp_path):
+        """The first load writes artifacts; the second one reads them back."""
+        out = str(tmp_path / 'artifacts')
+        built = load_model(csv_copy, artifact_dir=out)
+        assert not built.loaded_from_artifacts
+        assert has_artifacts(out, built.fingerprint)
+
+        reused = load_model(csv_copy, artifact_dir=out)
+        assert reused.loaded_from_artifacts
+        assert reused.fingerprint == built.fingerprint
+        np.testing.assert_array_equal(reused.neighbor_index.indices, built.neighbor_index.indices)
+        np.testing.assert_array_equal(reused.neighbor_index.scores, built.neighbor_index.scores)
+        assert reused.recommend('Inception', top_n=8).equals(built.recommend('Inception', top_n=8))
+
+    def test_restored_vectorizer_transforms_identically(self, csv_copy, tmp_path):
+        """Vocabulary and IDF weights round-trip without pickling the vectorizer."""
+        out = str(tmp_path / 'artifacts')
+        built = load_model(csv_copy, artifact_dir=out)
+        reused = load_model(csv_copy, artifact_dir=out)
+        docs = ['Action, Sci-Fi', 'Drama, Romance']
+        diff = built.vectorizer.transform(docs) - reused.vectorizer.transform(docs)
+        assert abs(diff).max() < 1e-12
+        assert abs(built.feature_matrix - reused.feature_matrix).max() == 0
+
+    def test_serving_from_artifacts_skips_sklearn(self, csv_copy, tmp_path):
+        """Loading from artifacts and recommending never imports sklearn or scipy."""
+        out = str(tmp_path / 'artifacts')
+        load_model(csv_copy, artifact_dir=out)
+        code = (
+            "import sys\n"
+            "from recommender import load_model\n"
+            f"model = load_model({csv_copy!r}, artifact_dir={out!r})\n"
+            "model.recommend('Inception')\n"
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'sklearn', 'scipy'}))\n"
+        )
+        root = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                                capture_output=True, text=True)
+        assert result.stdout.strip() == '[]'
+
+    def test_build_from_the_command_line(self, csv_copy, tmp_path):
+        """``python -m recommender artifacts build`` runs without runpy's double-import warning."""
+        out = str(tmp_path / 'artifacts')
+        root = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run(
+            [sys.executable, '-W', 'error::RuntimeWarning', '-m', 'recommender', 'artifacts',
+             'build', '--csv', csv_copy, '--out', out],
+            cwd=root, check=True, capture_output=True, text=True)
+        assert 'RuntimeWarning' not in result.stderr
+        assert result.stdout.startswith('built ')
+        assert load_model(csv_copy, artifact_dir=out).loaded_from_artifacts
+
+    def test_no_pickled_objects(self, csv_copy, tmp_path):
+        """Artifacts are plain JSON/npy/npz/raw files and load with pickling disabled."""
+        out = str(tmp_path / 'artifacts')
+        model = load_model(csv_copy, artifact_dir=out)
+        path = os.path.join(out, model.fingerprint)
+        for name in os.listdir(path):
+            assert name.endswith(('.json', '.npy', '.npz', '.bin'))
+            if name.endswith(('.npy', '.npz')):
+                np.load(os.path.join(path, name), allow_pickle=False)
+
+    def test_scoring_arrays_are_memory_mapped(self, csv_copy, tmp_path):
+        """Reused models score straight from read-only, page-aligned mappings."""
+        out = str(tmp_path / 'artifacts')
+        load_model(csv_copy, artifact_dir=out)
+        model = load_model(csv_copy, artifact_dir=out)
+        arrays = [model.neighbor_index.indices, model.neighbor_index.scores,
+                  model.similarity.codes, model.similarity.col_values,
+                  model.catalog.features.ratings, model.catalog.features.years]
+        for array in arrays:
+            assert isinstance(array, np.memmap)
+            assert not array.flags.writeable
+            assert array.offset % STORE_ALIGNMENT == 0
+        assert len(model.recommend('Alien', top_n=5)) == 5
+
+    def test_fingerprint_tracks_contents_and_params(self, csv_copy):
+        """Editing the CSV or changing a parameter changes the fingerprint."""
+        before = catalog_fingerprint(csv_copy, model_params())
+        assert catalog_fingerprint(csv_copy, model_params(top_k=10)) != before
+        with open(csv_copy, 'a') as fh:
+            fh.write('New Film,"Drama",2024,7.0,"Someone"\n')
+        assert catalog_fingerprint(csv_copy, model_params()) != before
+
+    def test_prune_keeps_leased_and_current(self, csv_copy, tmp_path):
+        """Old fingerprints are deleted unless a live model still holds their directory."""
+        out = str(tmp_path / 'artifacts')
+        old = load_model(csv_copy, artifact_dir=out, top_k=10)
+        older = load_model(csv_copy, artifact_dir=out, top_k=20).fingerprint
+        current = load_model(csv_copy, artifact_dir=out).fingerprint
+
+        assert prune_artifacts(out, keep={current}) == [older]
+        assert has_artifacts(out, old.fingerprint) and has_artifacts(out, current)
+
+        fingerprint = old.fingerprint
+        del old
+        assert prune_artifacts(out, keep={current}) == [fingerprint]
+        assert sorted(os.listdir(out)) == [current]
+
+    def test_lease_on_missing_directory(self, tmp_path):
+        assert acquire_lease(str(tmp_path), 'nope') is None
+        assert prune_artifacts(str(tmp_path / 'missing')) == []
@@ -0,0 +1,113 @@
+"""
+Unit tests for the columnar catalog format.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import subprocess
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import build_model, hybrid_recommendations, read_catalog
+from recommender.artifacts import catalog_version
+from recommender.columnar import is_columnar, main, read_columnar, write_columnar
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture
+def sample():
+    return pd.DataFrame({
+        'title': ['Heat', 'Alien', 'Amélie', 'Heat'],
+        'description': ['Action, Crime', 'Horror', None, 'Action, Crime'],
+        'year': [1995, 1979, None, 1986],
+        'rating': [8.3, np.nan, 8.3, 6.0],
+        'director': ['Michael Mann', 'Ridley Scott', 'Jean-Pierre Jeunet', None],
+    })
+
+
+class TestColumnar:
+    """Test suite for write_columnar / read_columnar."""
+
+    def test_round_trip_dtypes(self, sample, tmp_path):
+        path = write_columnar(sample, str(tmp_path / 'movies.cols'))
+        assert is_columnar(path)
+        movies = read_columnar(path)
+
+        assert list(movies.columns) == list(sample.columns)
+        assert movies['year'].dtype == 'Int16'
+        assert movies['rating'].dtype == np.float32
+        assert movies['director'].dtype == 'category'
+        assert movies['description'].dtype == 'category'
+        assert movies['title'].tolist() == sample['title'].tolist()
+
+    def test_missing_values_survive(self, sample, tmp_path):
+        movies = read_columnar(write_columnar(sample, str(tmp_path / 'movies.cols')))
+        assert movies['year'].isna().tolist() == [False, False, True, False]
+        assert movies['rating'].isna().tolist() == [False, True, False, False]
+        assert movies['director'].isna().tolist() == [False, False, False, True]
+        assert movies['description'].isna().tolist() == [False, False, True, False]
+
+    def test_empty_table(self, sample, tmp_path):
+        movies = read_columnar(write_columnar(sample.head(0), str(tmp_path / 'empty.cols')))
+        assert len(movies) == 0
+
+    def test_convert_cli(self, tmp_path, capsys):
+        out = str(tmp_path / 'movies.cols')
+        main(['convert', '--csv', CSV_PATH, '--out', out])
+        assert 'total' in capsys.readouterr().out
+        assert len(read_columnar(out)) == len(pd.read_csv(CSV_PATH))
+
+    def test_convert_from_the_command_line(self, tmp_path):
+        """``python -m recommender columnar convert`` runs without runpy's double-import warning."""
+        out = str(tmp_path / 'movies.cols')
+        root = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run(
+            [sys.executable, '-W', 'error::RuntimeWarning', '-m', 'recommender', 'columnar',
+             'convert', '--csv', CSV_PATH, '--out', out],
+            cwd=root, check=True, capture_output=True, text=True)
+        assert 'RuntimeWarning' not in result.stderr
+        assert len(read_columnar(out)) == len(pd.read_csv(CSV_PATH))
+
+
+class TestColumnarCatalog:
+    """read_catalog accepts a columnar directory in place of the CSV."""
+
+    @pytest.fixture
+    def catalogs(self, tmp_path):
+        path = write_columnar(pd.read_csv(CSV_PATH), str(tmp_path / 'movies.cols'))
+        return read_catalog(CSV_PATH), read_catalog(path)
+
+    def test_same_derived_structures(self, catalogs):
+        from_csv, from_cols = catalogs
+        assert from_cols.genres == from_csv.genres
+        assert from_cols.movies['genres'].tolist() == from_csv.movies['genres'].tolist()
+        assert from_cols.titles.key(5) == from_csv.titles.key(5)
+        np.testing.assert_array_equal(from_cols.genre_index.bits, from_csv.genre_index.bits)
+        assert from_cols.search_index.search('nolan').tolist() == \
+            from_csv.search_index.search('nolan').tolist()
+
+    def test_same_recommendations(self, catalogs):
+        from_csv, from_cols = (build_model(c) for c in catalogs)
+        for seed in (0, 17, 120):
+            a = hybrid_recommendations(seed, from_csv.catalog, from_csv.similarity)
+            b = hybrid_recommendations(seed, from_cols.catalog, from_cols.similarity)
+            assert a['title'].tolist() == b['title'].tolist()
+            assert a['similarity_score'].tolist() == b['similarity_score'].tolist()
+
+    def test_smaller_footprint(self, catalogs):
+        from_csv, from_cols = catalogs
+        assert from_cols.memory_footprint['total'] < from_csv.memory_footprint['total']
+        assert from_cols.memory_footprint['year'] < from_csv.memory_footprint['year']
+
+    def test_catalog_version_tracks_contents(self, sample, tmp_path):
+        path = write_columnar(sample, str(tmp_path / 'movies.cols'))
+        before = catalog_version(path)
+        assert catalog_version(path) == before
+        sample.loc[0, 'rating'] = 9.9
+        write_columnar(sample, path)
+        assert catalog_version(path) != before
@@ -0,0 +1,98 @@
+"""
+Unit tests for the bitset genre-similarity engine.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from recommender import BitsetSimilarity, build_model, load_model, read_catalog
+from recommender.genres import GenreIndex
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+def _dense(genre_index):
+    bits = genre_index.bits.astype('<u8').view(np.uint8)
+    return np.unpackbits(bits, axis=1, bitorder='little')[:, :len(genre_index.vocabulary)]
+
+
+class TestBitsetSimilarity:
+    """Test suite for BitsetSimilarity."""
+
+    @pytest.fixture
+    def genres(self):
+        return GenreIndex.from_descriptions(
+            ['Action, Crime', 'Crime, Drama', 'Drama', 'Action, Crime', 'Western'])
+
+    def test_cosine_matches_dense_reference(self, genres):
+        """Popcount scores equal IDF-weighted cosine on the multi-hot matrix."""
+        engine = BitsetSimilarity(genres)
+        weighted = _dense(genres) * engine.idf
+        expected = cosine_similarity(weighted)
+        got = np.stack([engine.dense_row(r) for r in range(len(genres))])
+        np.testing.assert_allclose(got, expected, atol=1e-6)
+
+    def test_jaccard_matches_dense_reference(self, genres):
+        engine = BitsetSimilarity(genres, metric='jaccard')
+        multi_hot = _dense(genres)
+        weighted = multi_hot * engine.idf
+        inter = weighted @ multi_hot.T
+        totals = weighted.sum(axis=1)
+        expected = inter / (totals[:, None] + totals[None, :] - inter)
+        got = np.stack([engine.dense_row(r) for r in range(len(genres))])
+        np.testing.assert_allclose(got, expected, atol=1e-6)
+
+    def test_no_shared_genres_scores_zero(self, genres):
+        np.testing.assert_allclose(BitsetSimilarity(genres).dense_row(4), [0, 0, 0, 0, 1], atol=1e-6)
+
+    def test_unknown_metric(self, genres):
+        with pytest.raises(ValueError):
+            BitsetSimilarity(genres, metric='dice')
+
+
+class TestBitsetEngine:
+    """Test suite for the "bitset" model engine."""
+
+    @pytest.fixture(scope='class')
+    def models(self):
+        catalog = read_catalog(CSV_PATH)
+        return build_model(catalog, engine='tfidf'), build_model(catalog, engine='bitset')
+
+    def test_nothing_fitted(self, models):
+        _, bitset = models
+        assert bitset.engine == 'bitset'
+        assert bitset.vectorizer is None and bitset.neighbor_index is None
+
+    def test_top_k_close_to_tfidf(self, models):
+        """The bitset top-10 carries most of the TF-IDF top-10 similarity."""
+        tfidf, bitset = models
+        captured = []
+        for seed in range(0, len(tfidf), 7):
+            exact = cosine_similarity(tfidf.feature_matrix[seed], tfidf.feature_matrix)[0]
+            approx = bitset.similarity.dense_row(seed)
+            exact[seed] = approx[seed] = -np.inf
+            best = np.sort(exact)[::-1][:10].sum()
+            top = np.argsort(-approx, kind='stable')[:10]
+            captured.append(exact[top].sum() / best if best > 0 else 1.0)
+        assert np.mean(captured) >= 0.9
+
+    def test_recommend(self, models):
+        _, bitset = models
+        recs = bitset.recommend('The Dark Knight', top_n=5)
+        assert len(recs) == 5 and 'The Dark Knight' not in recs['title'].values
+
+    def test_load_skips_artifacts(self, tmp_path):
+        model = load_model(CSV_PATH, artifact_dir=str(tmp_path), engine='bitset')
+        assert model.engine == 'bitset' and model.catalog_version
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_engine(self, models):
+        with pytest.raises(ValueError):
+            build_model(models[0].catalog, engine='bm25')
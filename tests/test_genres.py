@@ -0,0 +1,63 @@
+"""
+Unit tests for the packed genre bitmap index.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import read_catalog
+from recommender.genres import GenreIndex
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture
+def index():
+    return GenreIndex.from_descriptions(['Action, Crime', 'Drama', 'Crime,Drama ', None])
+
+
+class TestGenreIndex:
+    """Test suite for GenreIndex."""
+
+    def test_vocabulary_and_bits(self, index):
+        """Genres are stripped and sorted; a missing description has no bits set."""
+        assert index.vocabulary == ['Action', 'Crime', 'Drama']
+        assert index.bits.dtype == np.uint64
+        assert index.bits[3].tolist() == [0]
+
+    def test_any_and_all(self, index):
+        assert index.filter(['Crime', 'Drama']).tolist() == [True, True, True, False]
+        assert index.filter(['Crime', 'Drama'], match='all').tolist() == [False, False, True, False]
+
+    def test_filter_subset_of_rows(self, index):
+        assert index.filter(['Drama'], rows=np.array([2, 0])).tolist() == [True, False]
+
+    def test_counts(self, index):
+        assert index.counts() == {'Action': 1, 'Crime': 2, 'Drama': 2}
+        assert index.counts(np.array([1, 2])) == {'Action': 0, 'Crime': 1, 'Drama': 2}
+
+    def test_unknown_genre(self, index):
+        with pytest.raises(ValueError):
+            index.filter(['Western'])
+
+    def test_more_than_64_genres(self):
+        """Vocabularies wider than one word spill into further uint64 columns."""
+        genres = [f'G{i:03d}' for i in range(100)]
+        index = GenreIndex.from_descriptions([', '.join(genres), 'G099'])
+        assert index.bits.shape == (2, 2)
+        assert index.filter(['G099']).tolist() == [True, True]
+        assert index.counts()['G000'] == 1
+
+    def test_matches_list_column(self):
+        """Bitmap filtering agrees with the per-row genre lists of the catalog."""
+        catalog = read_catalog(CSV_PATH)
+        lists = catalog.movies['genres']
+        for genre in catalog.genres:
+            expected = lists.apply(lambda gs: genre in gs).to_numpy()
+            assert (catalog.genre_index.filter([genre]) == expected).all()
+            assert catalog.genre_index.counts()[genre] == expected.sum()
@@ -0,0 +1,115 @@
+"""
+Unit tests for incremental catalog edits.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import build_model, build_neighbor_index, read_catalog
+from recommender.columnar import write_columnar
+from recommender.incremental import REFIT_FRACTION
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+TOP_K = 20
+
+
+@pytest.fixture(scope='module')
+def model():
+    return build_model(read_catalog(CSV_PATH), top_k=TOP_K)
+
+
+@pytest.fixture
+def new_movies():
+    movies = pd.read_csv(CSV_PATH).iloc[[3, 10, 42]].reset_index(drop=True)
+    movies['title'] = movies['title'] + ' II'
+    return movies
+
+
+def assert_prefix_of_full_build(model):
+    """Every incremental list is a prefix of the exact top K of its row."""
+    full = build_neighbor_index(model.feature_matrix, top_k=model.top_k)
+    index = model.neighbor_index
+    for row in range(len(model)):
+        filled = int((index.indices[row] >= 0).sum())
+        np.testing.assert_array_equal(index.scores[row, :filled], full.scores[row, :filled])
+    return full
+
+
+class TestIncremental:
+    """Test suite for RecommenderModel.append / update / delete."""
+
+    def test_append_matches_full_build(self, model, new_movies):
+        edited = model.append(new_movies)
+        full = assert_prefix_of_full_build(edited)
+
+        assert len(edited) == len(model) + 3
+        assert edited.vectorizer is model.vectorizer
+        assert edited.changes_since_fit == 3
+        np.testing.assert_array_equal(edited.neighbor_index.scores, full.scores)
+        assert edited.titles.lookup('Pulp Fiction II') == len(model)
+        seed = edited.titles.lookup('Pulp Fiction II')
+        np.testing.assert_array_equal(edited.similarity.dense_row(seed),
+                                      cosine_similarity(edited.feature_matrix[seed],
+                                                        edited.feature_matrix)[0])
+
+    def test_original_model_untouched(self, model, new_movies):
+        before = model.neighbor_index.indices.copy()
+        model.append(new_movies)
+        assert len(model) == 291
+        np.testing.assert_array_equal(model.neighbor_index.indices, before)
+
+    def test_update_and_delete(self, model):
+        row = model.titles.lookup('Pulp Fiction')
+        update = model.movies.iloc[[row]].drop(columns='genres')
+        update['description'] = 'Comedy, Romance'
+        deleted = model.titles.lookup('The Godfather')
+
+        edited = model.apply_delta(update=update, delete=[deleted])
+        assert_prefix_of_full_build(edited)
+        assert 'The Godfather' not in edited.titles
+        assert edited.catalog.movies['genres'].iloc[row - (deleted < row)] == ['Comedy', 'Romance']
+        assert (edited.neighbor_index.indices < len(edited)).all()
+
+        recs = edited.recommend('Pulp Fiction', top_n=5)
+        assert all('Comedy' in genres or 'Romance' in genres for genres in recs['genres'])
+
+    def test_new_terms_force_refit(self, model, new_movies):
+        new_movies.loc[0, 'description'] = 'Documentary, Musical'
+        edited = model.append(new_movies)
+        assert edited.vectorizer is not model.vectorizer
+        assert edited.changes_since_fit == 0
+        assert 'documentary' in edited.vectorizer.vocabulary_
+
+    def test_refit_threshold(self, model):
+        many = int(REFIT_FRACTION * len(model)) + 1
+        assert model.delete(range(many)).changes_since_fit == 0
+        assert model.delete(range(many - 5)).changes_since_fit == many - 5
+
+    def test_invalid_edits(self, model, new_movies):
+        with pytest.raises(IndexError):
+            model.delete([len(model)])
+        with pytest.raises(ValueError, match='both updated and deleted'):
+            model.apply_delta(update=new_movies.set_index(pd.Index([1, 2, 3])), delete=[2])
+        with pytest.raises(ValueError, match='must contain columns'):
+            model.append(new_movies.drop(columns='description'))
+
+    def test_keeps_categorical_columns(self, new_movies, tmp_path):
+        path = write_columnar(pd.read_csv(CSV_PATH), str(tmp_path / 'movies.cols'))
+        edited = build_model(read_catalog(path), top_k=TOP_K).append(new_movies)
+        assert edited.movies['director'].dtype == 'category'
+        assert edited.movies['year'].dtype == 'Int16'
+        assert edited.movies['title'].iloc[-1] == new_movies['title'].iloc[-1]
+
+    def test_bitset_engine_rebuilds(self, new_movies):
+        model = build_model(read_catalog(CSV_PATH), engine='bitset', metric='jaccard')
+        edited = model.append(new_movies)
+        assert edited.engine == 'bitset'
+        assert edited.similarity.metric == 'jaccard'
+        assert len(edited.similarity) == len(model) + 3
@@ -0,0 +1,104 @@
+"""
+Unit tests for chunked streaming ingestion.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import read_catalog
+from recommender.columnar import ColumnarWriter, read_arrays, read_columnar
+from recommender.features import FeatureArrays, FeatureBuilder
+from recommender.ingest import ingest, iter_chunks, normalize_genres
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+class TestIngest:
+    """Test suite for ingest / iter_chunks."""
+
+    def test_chunk_size_does_not_change_output(self, tmp_path):
+        one = str(tmp_path / 'one.cols')
+        many = str(tmp_path / 'many.cols')
+        assert ingest(CSV_PATH, one, chunksize=10_000) == ingest(CSV_PATH, many, chunksize=7)
+        pd.testing.assert_frame_equal(read_columnar(one), read_columnar(many))
+        for name, array in read_arrays(one).items():
+            np.testing.assert_array_equal(array, read_arrays(many)[name])
+
+    def test_catalog_matches_csv(self, tmp_path):
+        path = str(tmp_path / 'movies.cols')
+        ingest(CSV_PATH, path, chunksize=50)
+        from_csv, ingested = read_catalog(CSV_PATH), read_catalog(path)
+
+        assert ingested.genres == from_csv.genres
+        assert ingested.movies['title'].tolist() == from_csv.movies['title'].tolist()
+        for field in ('ratings', 'rating_known', 'years', 'year_known'):
+            np.testing.assert_array_equal(getattr(ingested.features, field),
+                                          getattr(from_csv.features, field))
+
+    def test_missing_required_column(self, tmp_path):
+        csv = tmp_path / 'bad.csv'
+        csv.write_text('title,year\nHeat,1995\n')
+        with pytest.raises(ValueError, match='must contain columns'):
+            list(iter_chunks(str(csv)))
+
+    def test_missing_title_reports_row(self, tmp_path):
+        csv = tmp_path / 'bad.csv'
+        csv.write_text('title,description\nHeat,Crime\nAlien,Horror\n,Drama\n')
+        with pytest.raises(ValueError, match='Row 2'):
+            ingest(str(csv), str(tmp_path / 'out.cols'), chunksize=2)
+        assert not os.path.exists(tmp_path / 'out.cols')
+
+    def test_missing_description_reports_row(self, tmp_path):
+        csv = tmp_path / 'bad.csv'
+        csv.write_text('title,description\nHeat,Crime\nAlien,Horror\nUp,\n')
+        with pytest.raises(ValueError, match='Row 2 .* has no description'):
+            ingest(str(csv), str(tmp_path / 'out.cols'), chunksize=2)
+        assert not os.path.exists(tmp_path / 'out.cols')
+
+    def test_description_without_genres_is_rejected(self, tmp_path):
+        csv = tmp_path / 'bad.csv'
+        csv.write_text('title,description\nHeat,Crime\nBig," , "\n')
+        with pytest.raises(ValueError, match='Row 1 .* has no description'):
+            list(iter_chunks(str(csv)))
+
+    def test_normalize_genres(self):
+        descriptions = pd.Series(['Action ,Crime', 'Drama,', None, 'Action, Crime'])
+        assert normalize_genres(descriptions).tolist() == \
+            ['Action, Crime', 'Drama', None, 'Action, Crime']
+
+
+class TestStreamingPieces:
+    """FeatureBuilder and ColumnarWriter on hand-made chunks."""
+
+    def test_feature_builder_matches_from_frame(self):
+        frame = pd.DataFrame({'rating': [7.0, np.nan, 8.5, 6.0, np.nan],
+                              'year': [1990, 2001, np.nan, 1985, 2010]})
+        builder = FeatureBuilder()
+        for start in range(0, len(frame), 2):
+            builder.add(frame.iloc[start:start + 2])
+        built, expected = builder.build(), FeatureArrays.from_frame(frame)
+        for field in ('ratings', 'rating_known', 'years', 'year_known'):
+            np.testing.assert_array_equal(getattr(built, field), getattr(expected, field))
+
+    def test_writer_rejects_mismatched_chunk(self, tmp_path):
+        with pytest.raises(ValueError, match='do not match'):
+            with ColumnarWriter(str(tmp_path / 'out.cols')) as writer:
+                writer.append(pd.DataFrame({'title': ['A'], 'description': ['Drama']}))
+                writer.append(pd.DataFrame({'title': ['B']}))
+        assert not os.path.exists(tmp_path / 'out.cols')
+
+    def test_categories_span_chunks(self, tmp_path):
+        path = str(tmp_path / 'out.cols')
+        with ColumnarWriter(path) as writer:
+            writer.append(pd.DataFrame({'title': ['A', 'B'], 'director': ['X', None]}))
+            writer.append(pd.DataFrame({'title': ['C', 'D'], 'director': ['Y', 'X']}))
+        movies = read_columnar(path)
+        assert movies['title'].tolist() == ['A', 'B', 'C', 'D']
+        assert movies['director'].cat.codes.tolist() == [0, -1, 1, 0]
+        assert list(movies['director'].cat.categories) == ['X', 'Y']
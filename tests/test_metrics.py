@@ -0,0 +1,122 @@
+"""
+Unit tests for the Prometheus metrics registry and exposition.
+"""
+
+import urllib.request
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import metrics
+from recommender.metrics import Registry
+from recommender.posters import _wiki_search, _wiki_summary
+from recommender.telemetry import RerunTrace
+from tests.fake_wikipedia import FakeWikipedia
+
+
+class FakeReloader:
+    def __init__(self, **fields):
+        self.fields = dict(ready=True, catalog_version='v1', movies=291, reloads=2,
+                           last_build_seconds=1.5, last_error=None, **fields)
+
+    def metrics(self):
+        return self.fields
+
+
+class TestRegistry:
+    """Test suite for metric types and the text format."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        hist = registry.histogram('demo_seconds', 'Demo.', labels=('kind',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value, 'a')
+        text = registry.render()
+        assert '# TYPE demo_seconds histogram' in text
+        assert 'demo_seconds_bucket{kind="a",le="0.1"} 2' in text
+        assert 'demo_seconds_bucket{kind="a",le="1.0"} 3' in text
+        assert 'demo_seconds_bucket{kind="a",le="+Inf"} 4' in text
+        assert 'demo_seconds_count{kind="a"} 4' in text
+        assert 'demo_seconds_sum{kind="a"} 3.65' in text
+
+    def test_counter_and_same_name_reuse(self):
+        registry = Registry()
+        counter = registry.counter('demo_total', 'Demo.', labels=('result',))
+        assert registry.counter('demo_total', 'Demo.', labels=('result',)) is counter
+        counter.inc('hit', amount=3)
+        counter.inc('miss')
+        text = registry.render()
+        assert 'demo_total{result="hit"} 3' in text
+        assert 'demo_total{result="miss"} 1' in text
+
+    def test_reloader_gauges(self):
+        registry = Registry()
+        reloader = FakeReloader()
+        metrics.register_reloader(reloader, registry)
+        text = registry.render()
+        assert 'recommender_catalog_movies 291' in text
+        assert 'recommender_model_build_seconds 1.5' in text
+        assert 'recommender_model_reload_failing 0' in text
+        assert 'recommender_catalog_info{version="v1"} 1' in text
+
+        reloader.fields.update(movies=300, last_error='boom', catalog_version='v2')
+        text = registry.render()
+        assert 'recommender_catalog_movies 300' in text
+        assert 'recommender_catalog_info{version="v2"} 1' in text
+        assert 'version="v1"' not in text
+        assert 'recommender_model_reload_failing 1' in text
+
+        reloader.fields.update(ready=False, catalog_version=None)
+        assert 'recommender_catalog_info' not in registry.render()
+
+
+class TestInstrumentation:
+    """Test suite for the app-level metrics."""
+
+    def test_rerun_and_cache_metrics(self):
+        runs = metrics.RERUN_SECONDS.count()
+        hits = metrics.CACHE_LOOKUPS.value('posters', 'hit')
+        trace = RerunTrace()
+        trace.count('posters', hit=True, n=4)
+        trace.mark('css')
+        with trace.lookup('recommendations', metrics.RECOMMENDATION_SECONDS):
+            pass
+        trace.finish()
+        assert metrics.RERUN_SECONDS.count() == runs + 1
+        assert metrics.RERUN_STAGE_SECONDS.count('css') >= 1
+        assert metrics.CACHE_LOOKUPS.value('posters', 'hit') == hits + 4
+        assert metrics.RECOMMENDATION_SECONDS.count('hit') >= 1
+
+    def test_wiki_calls_are_timed(self):
+        before = (metrics.WIKI_REQUEST_SECONDS.count('summary'),
+                  metrics.WIKI_REQUEST_SECONDS.count('search'))
+        with FakeWikipedia({'Alien (film)': 'http://img/alien.jpg'}) as wiki:
+            _wiki_summary('Alien (film)', base_url=wiki.url)
+            _wiki_search('Alien film', base_url=wiki.url)
+        assert metrics.WIKI_REQUEST_SECONDS.count('summary') == before[0] + 1
+        assert metrics.WIKI_REQUEST_SECONDS.count('search') == before[1] + 1
+
+
+class TestExposition:
+    """Test suite for the sidecar endpoint and the textfile writer."""
+
+    def test_http_endpoint(self):
+        registry = Registry()
+        registry.counter('demo_total', 'Demo.').inc()
+        server = metrics.serve(0, host='127.0.0.1', registry=registry)
+        try:
+            url = f'http://127.0.0.1:{server.server_port}/metrics'
+            with urllib.request.urlopen(url) as response:
+                assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+                assert 'demo_total 1' in response.read().decode()
+        finally:
+            server.shutdown()
+
+    def test_write_file(self, tmp_path):
+        registry = Registry()
+        registry.counter('demo_total', 'Demo.').inc(amount=2)
+        path = tmp_path / 'metrics' / 'recommender.prom'
+        metrics.write_file(str(path), registry)
+        assert 'demo_total 2' in path.read_text()
@@ -0,0 +1,111 @@
+"""
+Unit tests for catalog loading and the shared recommender model.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import TitleIndex, load_model, read_catalog
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture(scope="module")
+def model():
+    """Build the model once from the bundled catalog."""
+    return load_model(CSV_PATH)
+
+
+class TestCatalog:
+    """Test suite for read_catalog."""
+
+    def test_genres_are_parsed(self):
+        """Genre lists and the sorted vocabulary are derived on load."""
+        catalog = read_catalog(CSV_PATH)
+        assert isinstance(catalog.movies.iloc[0]['genres'], list)
+        assert catalog.genres == sorted(catalog.genres)
+        assert 'Drama' in catalog.genres
+
+    def test_missing_file(self, tmp_path):
+        """A missing CSV raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            read_catalog(str(tmp_path / 'nope.csv'))
+
+    def test_missing_columns(self, tmp_path):
+        """A CSV without title/description is rejected."""
+        path = tmp_path / 'bad.csv'
+        path.write_text('name,year\nFoo,2000\n')
+        with pytest.raises(ValueError):
+            read_catalog(str(path))
+
+
+class TestTitleIndex:
+    """Test suite for the title -> row hash index."""
+
+    @pytest.fixture
+    def index(self):
+        """Two films called 'The Thing', one listed twice."""
+        return TitleIndex(
+            ['The Thing', 'Alien', 'The Thing', 'The Thing'],
+            [1982, 1979, 1951, 1982],
+        )
+
+    def test_unique_title(self, index):
+        """A title with one film resolves without a year."""
+        assert index.lookup('Alien') == 1
+
+    def test_year_disambiguates(self, index):
+        """(title, year) picks the right film; repeated listings map to the first row."""
+        assert index.lookup('The Thing', 1951) == 2
+        assert index.lookup('The Thing', 1982.0) == 0
+
+    def test_ambiguous_title_requires_year(self, index):
+        """Same-named films from different years are not silently collapsed."""
+        with pytest.raises(ValueError, match="ambiguous"):
+            index.lookup('The Thing')
+
+    def test_unknown_title(self, index):
+        """Unknown titles and years raise ValueError."""
+        with pytest.raises(ValueError, match="not found"):
+            index.lookup('Aliens')
+        with pytest.raises(ValueError, match="not found"):
+            index.lookup('Alien', 1986)
+
+    def test_labels(self, index):
+        """Labels carry the year only when the title is ambiguous."""
+        assert index.label(1) == 'Alien'
+        assert index.label(2) == 'The Thing (1951)'
+        assert index.key(3) == ('The Thing', 1982)
+
+
+class TestRecommenderModel:
+    """Test suite for the shared, read-only model."""
+
+    def test_index_is_read_only(self, model):
+        """Sessions cannot mutate the shared neighbor arrays."""
+        with pytest.raises(ValueError):
+            model.neighbor_index.scores[0, 0] = 1.0
+        assert not model.neighbor_index.indices.flags.writeable
+
+    def test_recommend(self, model):
+        """recommend returns top_n rows with scores, excluding the seed."""
+        recs = model.recommend('The Dark Knight', top_n=7)
+        assert len(recs) == 7
+        assert 'The Dark Knight' not in recs['title'].values
+        assert np.all(np.diff(recs['similarity_score'].to_numpy()) <= 0)
+
+    def test_recommend_unknown_title(self, model):
+        """Unknown seeds surface as ValueError."""
+        with pytest.raises(ValueError):
+            model.recommend('Not A Real Movie')
+
+    def test_recommend_is_deterministic(self, model):
+        """Repeated calls on the shared model give identical results."""
+        a = model.recommend('Inception', top_n=5, genre_weight=0.8)
+        b = model.recommend('Inception', top_n=5, genre_weight=0.8)
+        assert a.equals(b)
@@ -0,0 +1,129 @@
+"""
+Unit tests for the top-K neighbor index and hybrid scoring.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+import sys
+import os
+import tracemalloc
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import Catalog, build_neighbor_index, hybrid_recommendations
+from recommender.neighbors import block_rows
+
+
+@pytest.fixture
+def catalog():
+    """Load the bundled movies.csv with the same TF-IDF settings as the app."""
+    csv_path = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+    movies = pd.read_csv(csv_path)
+    tfidf = TfidfVectorizer(ngram_range=(1, 2), min_df=1, stop_words='english')
+    return movies, tfidf.fit_transform(movies['description'])
+
+
+class TestNeighborIndex:
+    """Test suite for the blockwise top-K index."""
+
+    def test_shape_and_padding(self):
+        """Small catalogs get K = N - 1 neighbors per row."""
+        matrix = TfidfVectorizer().fit_transform(['drama', 'drama crime', 'comedy'])
+        index = build_neighbor_index(matrix, top_k=10)
+        assert index.indices.shape == (3, 2)
+        assert index.indices.dtype == np.int32
+        assert index.scores.dtype == np.float64
+
+    def test_excludes_self(self, catalog):
+        """A title never appears in its own neighbor list."""
+        _, matrix = catalog
+        index = build_neighbor_index(matrix, top_k=20)
+        rows = np.arange(len(index))[:, None]
+        assert not (index.indices == rows).any()
+
+    def test_matches_dense_top_k(self, catalog):
+        """Neighbor scores equal the K best scores of the dense cosine row."""
+        _, matrix = catalog
+        dense = cosine_similarity(matrix)
+        np.fill_diagonal(dense, -np.inf)
+        index = build_neighbor_index(matrix, top_k=15)
+        for row in (0, 42, len(index) - 1):
+            expected = np.sort(dense[row])[::-1][:15]
+            np.testing.assert_allclose(index.scores[row], expected, rtol=1e-5)
+
+    def test_block_size_does_not_change_result(self, catalog):
+        """Blockwise building gives the same index as a single block."""
+        _, matrix = catalog
+        whole = build_neighbor_index(matrix, top_k=30, block_size=matrix.shape[0])
+        blocked = build_neighbor_index(matrix, top_k=30, block_size=7)
+        np.testing.assert_array_equal(whole.indices, blocked.indices)
+        np.testing.assert_array_equal(whole.scores, blocked.scores)
+
+    def test_block_rows_follow_byte_budget(self):
+        """Fewer rows per block as the catalog grows, never fewer than one."""
+        assert block_rows(1000, block_bytes=20 * 1000 * 50) == 50
+        assert block_rows(10**6, block_bytes=256 << 20) < block_rows(10**5, block_bytes=256 << 20)
+        assert block_rows(10**9, block_bytes=1) == 1
+
+    def test_peak_memory_stays_within_budget(self, catalog):
+        """Peak allocation tracks ``block_bytes``, not the catalog size."""
+        movies, _ = catalog
+        budget = 4 << 20
+        for rows in (2000, 8000):
+            descriptions = np.random.default_rng(rows).choice(movies['description'], rows)
+            matrix = TfidfVectorizer(ngram_range=(1, 2), stop_words='english').fit_transform(descriptions)
+            tracemalloc.start()
+            try:
+                index = build_neighbor_index(matrix, top_k=8, block_bytes=budget)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            assert peak - index.nbytes < 1.5 * budget
+
+    def test_ties_at_cutoff_keep_lowest_ids(self):
+        """Neighbors tied at the K-th score are kept lowest row id first."""
+        matrix = TfidfVectorizer().fit_transform(
+            ['drama crime'] + ['drama'] * 6 + ['drama crime'] + ['comedy'] * 4)
+        index = build_neighbor_index(matrix, top_k=4)
+        # Row 0: row 7 is identical, rows 1-6 tie below it
+        np.testing.assert_array_equal(index.indices[0], [7, 1, 2, 3])
+        # Row 6: rows 1-5 tie at 1.0
+        np.testing.assert_array_equal(index.indices[6], [1, 2, 3, 4])
+
+    def test_matches_stable_sort_of_dense_row(self, catalog):
+        """Each list equals the first K entries of a stable descending sort."""
+        _, matrix = catalog
+        dense = cosine_similarity(matrix)
+        np.fill_diagonal(dense, -np.inf)
+        index = build_neighbor_index(matrix, top_k=8, block_size=50)
+        expected = np.argsort(-dense, axis=1, kind='stable')[:, :8]
+        np.testing.assert_array_equal(index.indices, expected)
+
+    def test_hybrid_matches_dense_when_k_covers_catalog(self, catalog):
+        """With K >= N - 1 the sparse scorer reproduces the dense output exactly."""
+        movies, matrix = catalog
+        index = build_neighbor_index(matrix, top_k=len(movies))
+        dense = cosine_similarity(matrix)
+        ratings = movies['rating'].fillna(movies['rating'].mean())
+        years = movies['year'].fillna(movies['year'].median())
+        for seed in range(len(movies)):
+            recs = hybrid_recommendations(seed, Catalog(movies, []), index, top_n=10)
+
+            combined = (0.6 * dense[seed]
+                        + 0.3 * (1 - np.abs(ratings - movies.iloc[seed]['rating']) / 10.0)
+                        + 0.1 * np.clip(1 - np.abs(years - movies.iloc[seed]['year']) / 100.0, 0, 1))
+            ranked = sorted(enumerate(combined), key=lambda x: x[1], reverse=True)
+            expected = [(i, round(score * 100, 1)) for i, score in ranked if i != seed][:10]
+            assert list(zip(recs.index, recs['similarity_score'])) == expected
+
+    def test_seed_row_is_positional(self, catalog):
+        """The seed is addressed by row id and excluded from its own results."""
+        movies, matrix = catalog
+        index = build_neighbor_index(matrix, top_k=5)
+        recs = hybrid_recommendations(2, Catalog(movies, []), index, top_n=len(movies))
+        assert 2 not in recs.index
+        assert len(recs) == len(movies) - 1
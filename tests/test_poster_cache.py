@@ -0,0 +1,93 @@
+"""
+Unit tests for the durable SQLite poster cache.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender.poster_cache import SQLitePosterCache, main, warm
+from tests.fake_wikipedia import FakeWikipedia
+
+
+class TestSQLitePosterCache:
+    """Test suite for SQLitePosterCache."""
+
+    def test_hits_and_misses_persist(self, tmp_path):
+        """Both URLs and misses survive reopening the database."""
+        path = str(tmp_path / 'posters.sqlite3')
+        cache = SQLitePosterCache(path)
+        cache.put(('Alien', 1979), 'http://img/alien.jpg')
+        cache.put(('Nothing', None), None)
+        cache.close()
+
+        reopened = SQLitePosterCache(path)
+        assert reopened.get(('Alien', 1979)) == (True, 'http://img/alien.jpg')
+        assert reopened.get(('Nothing', None)) == (True, None)
+        assert reopened.get(('Unknown', 2000)) == (False, None)
+        assert reopened.stats() == {'hits': 1, 'misses': 1}
+
+    def test_separate_ttls(self, tmp_path):
+        """An expired miss TTL does not expire hits, and vice versa."""
+        path = str(tmp_path / 'posters.sqlite3')
+        cache = SQLitePosterCache(path, hit_ttl=3600, miss_ttl=-1)
+        cache.put_many([(('Alien', 1979), 'x'), (('Nothing', 2000), None)])
+        assert cache.get(('Alien', 1979)) == (True, 'x')
+        assert cache.get(('Nothing', 2000)) == (False, None)
+
+    def test_misses_retried_after_catalog_change(self, tmp_path):
+        """Misses recorded under an older catalog version are stale; hits are not."""
+        path = str(tmp_path / 'posters.sqlite3')
+        old = SQLitePosterCache(path, catalog_version='v1')
+        old.put_many([(('Alien', 1979), 'x'), (('Nothing', 2000), None)])
+        new = SQLitePosterCache(path, catalog_version='v2')
+        assert new.get(('Alien', 1979)) == (True, 'x')
+        assert new.get(('Nothing', 2000)) == (False, None)
+
+    def test_with_version_shares_connection(self, tmp_path):
+        """A versioned view writes its own version over the same connection."""
+        cache = SQLitePosterCache(str(tmp_path / 'posters.sqlite3'))
+        v1, v2 = cache.with_version('v1'), cache.with_version('v2')
+        assert v1._conn is cache._conn and v2._conn is cache._conn
+        v1.put(('Nothing', 2000), None)
+        assert v1.get(('Nothing', 2000)) == (True, None)
+        assert v2.get(('Nothing', 2000)) == (False, None)
+        assert cache.catalog_version is None
+
+    def test_shared_between_connections(self, tmp_path):
+        """A write from one process-level connection is visible to another."""
+        path = str(tmp_path / 'posters.sqlite3')
+        a, b = SQLitePosterCache(path), SQLitePosterCache(path)
+        a.put(('Alien', 1979), 'x')
+        assert b.get(('Alien', 1979)) == (True, 'x')
+
+
+class TestWarm:
+    """Test suite for bulk prewarming."""
+
+    def test_warm_skips_cached_and_records_results(self, tmp_path):
+        """Only uncached titles are fetched; hits and misses are both stored."""
+        cache = SQLitePosterCache(str(tmp_path / 'posters.sqlite3'))
+        cache.put(('Cached', 2001), 'http://img/cached.jpg')
+        pages = {'Alien (1979 film)': 'http://img/alien.jpg'}
+        keys = [('Alien', 1979), ('Nothing', 2000), ('Cached', 2001), ('Alien', 1979)]
+        with FakeWikipedia(pages) as wiki:
+            summary = warm(cache, keys, batch_size=1, base_url=wiki.url)
+            assert not any('Cached' in path for path in wiki.requests)
+        assert summary == {'titles': 3, 'cached': 1, 'hits': 1, 'misses': 1, 'unresolved': 0}
+        assert cache.get(('Nothing', 2000)) == (True, None)
+
+    def test_cli_warms_whole_catalog(self, tmp_path, capsys, monkeypatch):
+        """The warm command fills the database for every title in a CSV."""
+        csv_path = tmp_path / 'movies.csv'
+        csv_path.write_text('title,description,year,rating,director\n'
+                            'Alien,"Horror, Sci-Fi",1979,8.5,"Ridley Scott"\n'
+                            'Heat,"Crime, Drama",1995,8.3,"Michael Mann"\n')
+        db = str(tmp_path / 'posters.sqlite3')
+        with FakeWikipedia({'Alien (1979 film)': 'http://img/alien.jpg'}) as wiki:
+            monkeypatch.setattr('recommender.posters.WIKIPEDIA_BASE_URL', wiki.url)
+            main(['warm', '--csv', str(csv_path), '--db', db])
+        assert "'hits': 1" in capsys.readouterr().out
+        assert SQLitePosterCache(db).stats() == {'hits': 1, 'misses': 1}
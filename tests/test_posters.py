@@ -0,0 +1,138 @@
+"""
+Unit tests for poster resolution against a local fake Wikipedia.
+"""
+
+import time
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender.posters import (
+    MAX_TITLES_PER_QUERY, PosterCache, fetch_poster, resolve_posters,
+)
+from tests.fake_wikipedia import FakeWikipedia
+
+PAGES = {
+    'Dune (2021 film)': 'http://img/dune-2021.jpg',
+    'Dune (film)': 'http://img/dune-1984.jpg',
+    'Alien (film)': 'http://img/alien.jpg',
+    'Heat': None,
+    'Heat (1995 film)': None,
+    'Heat (movie)': 'http://img/heat.jpg',
+}
+SEARCH = {'Heat film 1995': ['Heat (movie)']}
+
+
+class TestFetchPoster:
+    """Test suite for the sequential single-title path."""
+
+    def test_prefers_year_specific_page(self):
+        """The '(YEAR film)' slug wins over the generic one."""
+        with FakeWikipedia(PAGES, SEARCH) as wiki:
+            assert fetch_poster('Dune', 2021, base_url=wiki.url) == 'http://img/dune-2021.jpg'
+
+    def test_search_fallback(self):
+        """When no slug has an image, search hits are tried."""
+        with FakeWikipedia(PAGES, SEARCH) as wiki:
+            assert fetch_poster('Heat', 1995, base_url=wiki.url) == 'http://img/heat.jpg'
+
+
+class TestResolvePosters:
+    """Test suite for the concurrent batch resolver."""
+
+    def test_matches_sequential_results(self):
+        """Batch results agree with fetch_poster, including misses."""
+        movies = [('Dune', 2021), ('Alien', 1979), ('Heat', 1995), ('Nothing', 2000)]
+        with FakeWikipedia(PAGES, SEARCH) as wiki:
+            result = resolve_posters(movies, base_url=wiki.url, cache=None)
+            expected = {m: fetch_poster(*m, base_url=wiki.url) for m in movies}
+        assert result == expected
+        assert result[('Nothing', 2000)] is None
+
+    def test_requests_run_concurrently(self):
+        """Ten slow titles resolve in about one round trip, not ten."""
+        pages = {f'Movie {i} ({2000 + i} film)': f'http://img/{i}.jpg' for i in range(10)}
+        movies = [(f'Movie {i}', 2000 + i) for i in range(10)]
+        with FakeWikipedia(pages, delay=0.3) as wiki:
+            start = time.monotonic()
+            result = resolve_posters(movies, base_url=wiki.url, max_workers=32,
+                                     deadline=5.0, cache=None)
+            elapsed = time.monotonic() - start
+        assert len(result) == 10
+        assert elapsed < 1.5
+
+    def test_deadline_leaves_stragglers_unresolved(self):
+        """Titles still in flight at the deadline are omitted from the result."""
+        with FakeWikipedia(PAGES, delay=1.0) as wiki:
+            start = time.monotonic()
+            result = resolve_posters([('Alien', 1979)], base_url=wiki.url,
+                                     deadline=0.2, cache=None)
+            elapsed = time.monotonic() - start
+        assert result == {}
+        assert elapsed < 0.8
+
+    def test_stragglers_finish_into_the_cache(self):
+        """A lookup cut off by the deadline is cached in the background, once."""
+        cache = PosterCache()
+        movies = [('Heat', 1995)]
+        with FakeWikipedia(PAGES, SEARCH, delay=0.3) as wiki:
+            start = time.monotonic()
+            assert resolve_posters(movies, base_url=wiki.url, deadline=0.4, cache=cache) == {}
+            assert time.monotonic() - start < 0.8
+            assert cache.get(('Heat', 1995)) == (False, None)
+            # Still in flight: a second render neither waits nor asks again
+            assert resolve_posters(movies, base_url=wiki.url, deadline=0.4, cache=cache) == {}
+            time.sleep(1.0)
+            lookups = len(wiki.requests)
+            result = resolve_posters(movies, base_url=wiki.url, deadline=0.4, cache=cache)
+            assert len(wiki.requests) == lookups
+        assert result == {('Heat', 1995): 'http://img/heat.jpg'}
+        assert lookups == 3
+
+    def test_cache_short_circuits_network(self):
+        """Cached hits and misses are served without any request."""
+        cache = PosterCache()
+        cache.put(('Alien', 1979), 'http://img/cached.jpg')
+        cache.put(('Nothing', None), None)
+        with FakeWikipedia(PAGES) as wiki:
+            result = resolve_posters([('Alien', 1979), ('Nothing', None)],
+                                     base_url=wiki.url, cache=cache)
+            assert wiki.requests == []
+        assert result == {('Alien', 1979): 'http://img/cached.jpg', ('Nothing', None): None}
+
+    def test_whole_catalog_is_batched(self):
+        """A few hundred titles take a handful of queries over reused connections."""
+        pages = {f'Movie {i} ({2000 + i % 20} film)': f'http://img/{i}.jpg' for i in range(300)}
+        movies = [(f'Movie {i}', 2000 + i % 20) for i in range(300)]
+        with FakeWikipedia(pages) as wiki:
+            result = resolve_posters(movies, base_url=wiki.url, max_workers=4,
+                                     deadline=10.0, cache=None)
+            queries = len(wiki.requests)
+            connections = wiki.connections
+        assert result == {m: f'http://img/{i}.jpg' for i, m in enumerate(movies)}
+        assert queries == -(-300 * 3 // MAX_TITLES_PER_QUERY)
+        assert connections <= 4
+
+    def test_redirects_are_followed(self):
+        """A candidate slug that redirects resolves to its target's image."""
+        with FakeWikipedia({'Alien (1979 film)': 'http://img/alien.jpg'},
+                           redirects={'Alien (film)': 'Alien (1979 film)'}) as wiki:
+            result = resolve_posters([('Alien', None)], base_url=wiki.url, cache=None)
+        assert result == {('Alien', None): 'http://img/alien.jpg'}
+
+    def test_only_leftovers_use_per_title_fallback(self):
+        """Search runs only for titles the batched queries could not resolve."""
+        movies = [('Dune', 2021), ('Alien', 1979), ('Heat', 1995)]
+        with FakeWikipedia(PAGES, SEARCH) as wiki:
+            result = resolve_posters(movies, base_url=wiki.url, cache=None)
+            searches = [p for p in wiki.requests if 'list=search' in p]
+        assert result[('Heat', 1995)] == 'http://img/heat.jpg'
+        assert len(searches) == 1 and 'Heat' in searches[0]
+
+    def test_cache_ttl(self):
+        """Entries older than the TTL are treated as missing."""
+        cache = PosterCache(ttl=-1)
+        cache.put(('Alien', 1979), 'x')
+        assert cache.get(('Alien', 1979)) == (False, None)
@@ -0,0 +1,117 @@
+"""
+Unit tests for background hot-reload of the model.
+"""
+
+import pytest
+import shutil
+import sys
+import os
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import load_model
+from recommender.reload import ModelReloader, catalog_signature
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'movies.csv'
+    shutil.copy(CSV_PATH, path)
+    return str(path)
+
+
+def append_movie(path, title):
+    with open(path, 'a') as fh:
+        fh.write(f'{title},"Drama",2024,7.0,Someone\n')
+    # Make sure the mtime moves even on coarse-grained filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestModelReloader:
+    """Test suite for ModelReloader."""
+
+    def test_not_ready_before_first_load(self, csv_path):
+        reloader = ModelReloader(csv_path, load_model)
+        assert not reloader.ready
+        assert reloader.model is None
+        assert reloader.metrics()['catalog_version'] is None
+
+    def test_swap_after_change_is_stable(self, csv_path):
+        reloader = ModelReloader(csv_path, load_model)
+        assert reloader.reload()
+        old = reloader.model
+        assert reloader.ready
+        assert old.catalog_version == reloader.metrics()['catalog_version']
+
+        assert not reloader.check()
+        append_movie(csv_path, 'Brand New')
+        # The first check only sees the change; the next one, if unchanged, swaps
+        assert not reloader.check()
+        assert reloader.check()
+
+        new = reloader.model
+        assert new is not old
+        assert len(new) == len(old) + 1
+        assert 'Brand New' not in old.titles and 'Brand New' in new.titles
+        assert reloader.metrics()['catalog_version'] == new.catalog_version != old.catalog_version
+        assert reloader.reloads == 1
+
+    def test_failed_reload_keeps_serving(self, csv_path):
+        calls = []
+
+        def load(path):
+            calls.append(path)
+            if len(calls) > 1:
+                raise ValueError('broken catalog')
+            return load_model(path)
+
+        reloader = ModelReloader(csv_path, load)
+        reloader.reload()
+        current = reloader.model
+        assert not reloader.reload()
+        assert reloader.model is current
+        assert reloader.metrics()['last_error'] == 'broken catalog'
+
+    def test_wait_raises_first_load_error(self, tmp_path):
+        reloader = ModelReloader(str(tmp_path / 'missing.csv'), load_model, poll_interval=0).start()
+        with pytest.raises(FileNotFoundError):
+            reloader.wait(timeout=5)
+
+    def test_background_thread_picks_up_changes(self, csv_path):
+        reloader = ModelReloader(csv_path, load_model, poll_interval=0.05).start()
+        try:
+            first = reloader.wait(timeout=30)
+            append_movie(csv_path, 'Later Addition')
+            deadline = time.monotonic() + 30
+            while reloader.model is first and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert 'Later Addition' in reloader.model.titles
+        finally:
+            reloader.stop()
+
+    def test_swap_prunes_unused_artifacts(self, csv_path, tmp_path):
+        out = str(tmp_path / 'artifacts')
+        reloader = ModelReloader(csv_path, lambda p: load_model(p, artifact_dir=out),
+                                 artifact_dir=out)
+        reloader.reload()
+        first = reloader.model
+        append_movie(csv_path, 'Brand New')
+        reloader.reload()
+        # A session may still be using the first snapshot
+        assert sorted(os.listdir(out)) == sorted([first.fingerprint, reloader.model.fingerprint])
+
+        del first
+        append_movie(csv_path, 'Newer Still')
+        reloader.reload()
+        assert os.listdir(out) == [reloader.model.fingerprint]
+
+    def test_directory_signature(self, tmp_path):
+        (tmp_path / 'a.npy').write_bytes(b'1')
+        before = catalog_signature(str(tmp_path))
+        (tmp_path / 'b.npy').write_bytes(b'2')
+        assert catalog_signature(str(tmp_path)) != before
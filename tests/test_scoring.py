@@ -0,0 +1,102 @@
+"""
+Unit tests for vectorized top-K selection in the hybrid scorer.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import FeatureArrays, hybrid_recommendations, hybrid_scores, load_model
+from recommender.scoring import top_k_indices
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+def legacy_top_k(scores, k, exclude):
+    """The original Python sort: stable descending, seed dropped afterwards."""
+    ranked = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+    return [i for i, _ in ranked if i != exclude][:k]
+
+
+class TestTopKIndices:
+    """Test suite for top_k_indices."""
+
+    def test_matches_stable_sort_with_ties(self):
+        """Heavy ties are broken by lower index, exactly like sorted()."""
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            scores = rng.integers(0, 5, size=200).astype(np.float64)
+            k = int(rng.integers(1, 30))
+            assert top_k_indices(scores, k).tolist() == legacy_top_k(scores, k, -1)
+
+    def test_k_larger_than_array(self):
+        """Asking for more than N returns a full ranking."""
+        scores = np.array([0.1, 0.5, 0.5, 0.2])
+        assert top_k_indices(scores, 10).tolist() == [1, 2, 3, 0]
+
+    def test_zero_k(self):
+        """k <= 0 yields an empty selection."""
+        assert len(top_k_indices(np.array([1.0, 2.0]), 0)) == 0
+
+
+class TestFeatureArrays:
+    """Test suite for the precomputed rating/year arrays."""
+
+    @pytest.fixture
+    def frame(self):
+        """Three movies, one missing its rating and one missing its year."""
+        return pd.DataFrame({
+            'title': ['A', 'B', 'C'],
+            'rating': [8.0, np.nan, 6.0],
+            'year': [2000, 1990, np.nan],
+        })
+
+    def test_imputation(self, frame):
+        """Ratings are mean-filled, years median-filled, as contiguous float64."""
+        features = FeatureArrays.from_frame(frame)
+        assert features.ratings.dtype == np.float64
+        assert features.ratings.flags.c_contiguous
+        np.testing.assert_allclose(features.ratings, [8.0, 7.0, 6.0])
+        np.testing.assert_allclose(features.years, [2000, 1990, 1995])
+        assert features.rating_known.tolist() == [True, False, True]
+
+    def test_missing_column(self):
+        """Catalogs without a year column carry no year array."""
+        features = FeatureArrays.from_frame(pd.DataFrame({'rating': [7.0]}))
+        assert features.years is None and features.year_known is None
+
+    def test_seed_without_rating_skips_signal(self, frame):
+        """A seed with no rating contributes no rating similarity."""
+        features = FeatureArrays.from_frame(frame)
+        genre_sim = np.zeros(3, dtype=np.float32)
+        scores = hybrid_scores(1, genre_sim, features, rating_weight=1.0, year_weight=0.0)
+        np.testing.assert_array_equal(scores, np.zeros(3))
+        scores = hybrid_scores(0, genre_sim, features, rating_weight=1.0, year_weight=0.0)
+        np.testing.assert_allclose(scores, [1.0, 0.9, 0.8], rtol=1e-6)
+
+
+class TestHybridOutput:
+    """The vectorized scorer must reproduce the original output exactly."""
+
+    def test_same_rows_and_scores_as_legacy(self):
+        """Rows and similarity_score match the list-sort implementation for every seed."""
+        model = load_model(CSV_PATH)
+        movies = model.movies
+        for idx in range(len(movies)):
+            genre_sim = model.neighbor_index.dense_row(idx).astype(np.float64)
+            ratings = movies['rating'].fillna(movies['rating'].mean())
+            years = movies['year'].fillna(movies['year'].median())
+            combined = (0.6 * genre_sim
+                        + 0.3 * (1 - np.abs(ratings - movies.iloc[idx]['rating']) / 10.0)
+                        + 0.1 * np.clip(1 - np.abs(years - movies.iloc[idx]['year']) / 100.0, 0, 1))
+            expected_idx = legacy_top_k(list(combined), 12, idx)
+            expected = movies.iloc[expected_idx].copy()
+            expected['similarity_score'] = [round(combined[i] * 100, 1) for i in expected_idx]
+
+            recs = hybrid_recommendations(idx, model.catalog, model.neighbor_index, top_n=12)
+            pd.testing.assert_frame_equal(recs, expected)
@@ -0,0 +1,72 @@
+"""
+Unit tests for the trigram title/director search index.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import read_catalog
+from recommender.search import SearchIndex, normalize_text
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture(scope="module")
+def movies():
+    return read_catalog(CSV_PATH).movies
+
+
+@pytest.fixture(scope="module")
+def index(movies):
+    return SearchIndex(movies)
+
+
+class TestNormalize:
+    """Test suite for normalize_text."""
+
+    def test_folds_case_accents_and_punctuation(self):
+        assert normalize_text('  Amélie — Le Fabuleux DESTIN! ') == 'amelie le fabuleux destin'
+
+    def test_missing_value(self):
+        assert normalize_text(np.nan) == ''
+
+
+class TestSearchIndex:
+    """Test suite for SearchIndex."""
+
+    @pytest.mark.parametrize('term', ['dark', 'Nolan', 'the', 'a', 'kn', 'Dark Kn',
+                                      'ark kni', 'Tarantino', 'zzz'])
+    def test_matches_substring_scan(self, movies, index, term):
+        """The index finds exactly the rows a case-insensitive scan finds."""
+        expected = movies[
+            movies['title'].str.contains(term, case=False, na=False) |
+            movies['director'].str.contains(term, case=False, na=False)
+        ].index
+        assert sorted(index.search(term).tolist()) == sorted(expected)
+
+    def test_accent_insensitive(self, movies, index):
+        """'amelie' finds 'Amélie'."""
+        assert movies.iloc[index.search('amelie')]['title'].tolist() == ['Amélie']
+
+    def test_ranking(self):
+        """Exact, prefix, word prefix, substring; titles before directors within a class."""
+        movies = pd.DataFrame({
+            'title': ['Superheat', 'Heat Wave', 'The Heat', 'Heat', 'Other'],
+            'director': ['A', 'B', 'C', 'D', 'Ben Heath'],
+            'rating': [9.0, 8.0, 7.0, 6.0, 9.5],
+        })
+        assert SearchIndex(movies).search('heat').tolist() == [3, 1, 2, 4, 0]
+
+    def test_ties_prefer_higher_rating(self):
+        movies = pd.DataFrame({'title': ['Alien', 'Aliens', 'Alien'], 'rating': [8.0, np.nan, 8.5]})
+        assert SearchIndex(movies).search('alien').tolist() == [2, 0, 1]
+
+    def test_limit_and_empty_query(self, index):
+        assert len(index.search('the', limit=5)) == 5
+        assert len(index.search('  !! ')) == 0
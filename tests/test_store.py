@@ -0,0 +1,38 @@
+"""
+Unit tests for the raw memory-mapped array store.
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender.store import open_store, write_store
+
+
+class TestStore:
+    """Test suite for write_store/open_store."""
+
+    def test_round_trip(self, tmp_path):
+        """Arrays of mixed dtypes come back equal, aligned and read-only."""
+        arrays = {
+            'a': np.arange(10, dtype=np.int32).reshape(2, 5),
+            'b': np.linspace(0, 1, 7, dtype=np.float32),
+            'c': np.array([True, False, True]),
+        }
+        path = str(tmp_path / 'store.bin')
+        layout = write_store(path, arrays, alignment=64)
+        mapped = open_store(path, layout)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(mapped[name], array)
+            assert mapped[name].dtype == array.dtype
+            assert layout[name]['offset'] % 64 == 0
+            assert not mapped[name].flags.writeable
+
+    def test_empty_array(self, tmp_path):
+        """Zero-length arrays survive even though they cannot be mapped."""
+        path = str(tmp_path / 'store.bin')
+        layout = write_store(path, {'x': np.zeros((3, 0), dtype=np.int32)})
+        assert open_store(path, layout)['x'].shape == (3, 0)
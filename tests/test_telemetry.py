@@ -0,0 +1,87 @@
+"""
+Unit tests for per-rerun timing spans and cache counters.
+"""
+
+import json
+import logging
+import sys
+import os
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender import telemetry
+from recommender.telemetry import CountingCache, RerunTrace
+
+
+class DictCache:
+    def __init__(self, entries):
+        self.entries = dict(entries)
+        self.puts = []
+
+    def get(self, key):
+        return (key in self.entries, self.entries.get(key))
+
+    def put(self, key, url):
+        self.puts.append(key)
+
+
+class TestRerunTrace:
+    """Test suite for RerunTrace."""
+
+    def test_marks_and_spans(self):
+        trace = RerunTrace(rerun=1)
+        with trace.span('nested'):
+            time.sleep(0.01)
+        trace.mark('first')
+        trace.mark('second')
+        stats = trace.finish()
+
+        assert list(stats['spans']) == ['nested', 'first', 'second']
+        assert stats['spans']['nested'] >= 10
+        assert stats['spans']['first'] >= stats['spans']['nested']
+        assert stats['total_ms'] >= stats['spans']['first'] + stats['spans']['second']
+        assert stats['rerun'] == 1
+
+    def test_lookup_counts_hits_and_misses(self):
+        trace = RerunTrace()
+        with trace.lookup('recommendations'):
+            telemetry.miss('recommendations')
+        with trace.lookup('recommendations'):
+            pass
+        # Outside a lookup a miss is ignored
+        telemetry.miss('recommendations')
+        assert trace.caches == {'recommendations': {'hits': 1, 'misses': 1}}
+
+    def test_counting_cache(self):
+        trace = RerunTrace()
+        cache = CountingCache(DictCache({('Alien', 1979): 'x'}), 'posters')
+        assert cache.get(('Alien', 1979)) == (True, 'x')
+        assert cache.get(('Heat', 1995)) == (False, None)
+        cache.put(('Heat', 1995), None)
+        assert cache.cache.puts == [('Heat', 1995)]
+        assert trace.caches['posters'] == {'hits': 1, 'misses': 1}
+
+    def test_finish_logs_one_json_line(self, caplog):
+        telemetry.logger.propagate = True
+        try:
+            with caplog.at_level(logging.INFO, logger='recommender.rerun'):
+                trace = RerunTrace(session='abc')
+                trace.mark('css')
+                trace.finish()
+                trace.finish()
+        finally:
+            telemetry.logger.propagate = False
+        assert len(caplog.records) == 1
+        line = json.loads(caplog.records[0].getMessage())
+        assert line['event'] == 'rerun' and line['session'] == 'abc'
+        assert 'css' in line['spans']
+        assert telemetry.current() is None
+
+    def test_helpers_without_trace(self):
+        RerunTrace().finish()
+        assert telemetry.current() is None
+        telemetry.miss('anything')
+        cache = CountingCache(DictCache({}), 'posters')
+        assert cache.get(('Heat', 1995)) == (False, None)
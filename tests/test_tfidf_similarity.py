@@ -0,0 +1,58 @@
+"""
+Unit tests for exact per-description TF-IDF cosine rows.
+"""
+
+import pytest
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from recommender import Catalog, build_model, hybrid_recommendations, read_catalog
+from synthetic_catalog import generate_catalog
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+@pytest.fixture(scope='module')
+def large():
+    """A synthetic catalog far larger than its neighbor lists are long."""
+    model = build_model(Catalog.from_frame(generate_catalog(3000, seed=3, missing=0)), top_k=16)
+    return model, cosine_similarity(model.feature_matrix)
+
+
+class TestTfidfSimilarity:
+    """Test suite for TfidfSimilarity."""
+
+    def test_rows_are_bit_identical_to_cosine_similarity(self):
+        model = build_model(read_catalog(CSV_PATH))
+        dense = cosine_similarity(model.feature_matrix)
+        for row in range(len(model)):
+            np.testing.assert_array_equal(model.similarity.dense_row(row), dense[row])
+
+    def test_stores_distinct_descriptions_once(self, large):
+        model, _ = large
+        similarity = model.similarity
+        assert len(similarity) == len(model)
+        assert similarity.n_patterns == model.movies['description'].nunique()
+        assert similarity.n_patterns < len(model) // 2
+
+    def test_hybrid_matches_dense_beyond_top_k(self, large):
+        """With N >> K and heavy ties at the cut-off, results still match the dense matrix."""
+        model, dense = large
+        movies = model.movies
+        ratings = movies['rating'].to_numpy(dtype=np.float64)
+        years = movies['year'].to_numpy(dtype=np.float64)
+        for seed in range(0, len(movies), 11):
+            recs = hybrid_recommendations(seed, model.catalog, model.similarity, top_n=10)
+
+            combined = (0.6 * dense[seed]
+                        + 0.3 * (1 - np.abs(ratings - ratings[seed]) / 10.0)
+                        + 0.1 * np.clip(1 - np.abs(years - years[seed]) / 100.0, 0, 1))
+            ranked = sorted(enumerate(combined), key=lambda x: x[1], reverse=True)
+            expected = [(i, round(score * 100, 1)) for i, score in ranked if i != seed][:10]
+            assert list(zip(recs.index, recs['similarity_score'])) == expected
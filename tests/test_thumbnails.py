@@ -0,0 +1,107 @@
+"""
+Unit tests for the on-disk poster thumbnail cache.
+"""
+
+import io
+import os
+import sys
+import time
+
+from PIL import Image
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from recommender.thumbnails import EXTENSION, FORMAT, ThumbnailCache
+from tests.fake_wikipedia import FakeWikipedia
+
+
+def _jpeg(size=(1000, 1500), color=(200, 30, 60)):
+    out = io.BytesIO()
+    Image.new('RGB', size, color).save(out, 'JPEG', quality=95)
+    return out.getvalue()
+
+
+class TestThumbnailCache:
+    """Test suite for ThumbnailCache."""
+
+    def test_renders_each_width(self, tmp_path):
+        """Every configured width is stored in the card aspect ratio and format."""
+        cache = ThumbnailCache(str(tmp_path), widths=(240, 480))
+        cache.store('http://img/a.jpg', _jpeg())
+        for width in (240, 480):
+            with Image.open(cache.path('http://img/a.jpg', width)) as img:
+                assert img.size == (width, width * 3 // 2)
+                assert img.format == FORMAT
+
+    def test_never_upscales(self, tmp_path):
+        """A source narrower than a width is kept at its own width."""
+        cache = ThumbnailCache(str(tmp_path), widths=(480,))
+        cache.store('http://img/small.jpg', _jpeg(size=(200, 300)))
+        with Image.open(cache.path('http://img/small.jpg', 480)) as img:
+            assert img.size == (200, 300)
+
+    def test_content_addressed(self, tmp_path):
+        """The same image under two URLs is stored once."""
+        cache = ThumbnailCache(str(tmp_path), widths=(240,))
+        data = _jpeg()
+        assert cache.store('http://a/x.jpg', data) == cache.store('http://b/y.jpg', data)
+        assert cache.path('http://a/x.jpg', 240) == cache.path('http://b/y.jpg', 240)
+
+    def test_ensure_downloads_once(self, tmp_path):
+        """A second ensure() is served from disk without any request."""
+        images = {f'/img/{i}.jpg': _jpeg(color=(i, 0, 0)) for i in range(5)}
+        with FakeWikipedia(images=images) as wiki:
+            urls = [wiki.url + path for path in images]
+            cache = ThumbnailCache(str(tmp_path))
+            assert cache.ensure(urls, deadline=5.0) == set(urls)
+            assert ThumbnailCache(str(tmp_path)).ensure(urls) == set(urls)
+            assert len(wiki.requests) == 5
+
+    def test_url_under_base_url(self, tmp_path):
+        """Cached thumbnails are linked by a stable URL under ``base_url``."""
+        cache = ThumbnailCache(str(tmp_path), widths=(240,), base_url='app/static/thumbs/')
+        digest = cache.store('http://img/a.jpg', _jpeg())
+        assert cache.url('http://img/a.jpg', 240) == f'app/static/thumbs/{digest[:2]}/{digest}-240.{EXTENSION}'
+        assert cache.url('http://img/other.jpg', 240) is None
+        assert ThumbnailCache(str(tmp_path), widths=(240,)).url('http://img/a.jpg', 240) is None
+
+    def test_failures_are_remembered(self, tmp_path):
+        """Missing and undecodable images are not downloaded again within the TTL."""
+        with FakeWikipedia(images={'/img/bad.jpg': b'not an image'}) as wiki:
+            urls = [wiki.url + '/img/bad.jpg', wiki.url + '/img/missing.jpg']
+            cache = ThumbnailCache(str(tmp_path))
+            assert cache.ensure(urls, deadline=5.0) == set()
+            assert cache.ensure(urls, deadline=5.0) == set()
+            assert len(wiki.requests) == 2
+            assert all(cache.failed(url) for url in urls)
+
+            expired = ThumbnailCache(str(tmp_path), failure_ttl=-1)
+            assert expired.ensure(urls, deadline=5.0) == set()
+            assert len(wiki.requests) == 4
+        assert cache.path(urls[0], 240) is None
+
+    def test_slow_download_finishes_in_the_background(self, tmp_path):
+        """A download still running at the deadline is neither waited for nor repeated."""
+        with FakeWikipedia(images={'/img/slow.jpg': _jpeg()}, delay=0.5) as wiki:
+            url = wiki.url + '/img/slow.jpg'
+            cache = ThumbnailCache(str(tmp_path))
+            start = time.monotonic()
+            assert cache.ensure([url], deadline=0.1) == set()
+            assert cache.ensure([url], deadline=5.0) == set()
+            assert time.monotonic() - start < 0.4
+            time.sleep(0.8)
+            assert cache.ensure([url], deadline=0) == {url}
+            assert len(wiki.requests) == 1
+        assert not cache.failed(url)
+
+    def test_zero_deadline_only_starts_downloads(self, tmp_path):
+        """With no time left the downloads still run and a later call finds them."""
+        images = {f'/img/{i}.jpg': _jpeg(color=(i, 0, 0)) for i in range(3)}
+        with FakeWikipedia(images=images) as wiki:
+            urls = [wiki.url + path for path in images]
+            cache = ThumbnailCache(str(tmp_path))
+            assert cache.ensure(urls, deadline=0) == set()
+            time.sleep(0.5)
+            assert cache.ensure(urls, deadline=0) == set(urls)
+            assert len(wiki.requests) == 3
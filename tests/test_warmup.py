@@ -0,0 +1,84 @@
+"""
+Unit tests for boot-time warmup and the readiness probe.
+"""
+
+import json
+import shutil
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from recommender.poster_cache import SQLitePosterCache
+from recommender.warmup import check, main, run, top_rated_rows
+from tests.fake_wikipedia import FakeWikipedia
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'movies.csv')
+
+
+def paths(tmp_path):
+    csv_path = str(tmp_path / 'movies.csv')
+    shutil.copy(CSV_PATH, csv_path)
+    return {
+        'csv_path': csv_path,
+        'artifact_dir': str(tmp_path / 'artifacts'),
+        'marker': str(tmp_path / 'warmup.json'),
+    }
+
+
+class TestWarmup:
+    """Test suite for recommender.warmup."""
+
+    def test_top_rated_rows(self):
+        movies = pd.read_csv(CSV_PATH)
+        rows = top_rated_rows(movies)
+        assert len(rows) == 10
+        assert movies.loc[rows, 'rating'].min() >= movies['rating'].drop(rows).max()
+
+    def test_check_before_and_after_run(self, tmp_path):
+        p = paths(tmp_path)
+        assert not check(**p)['ready']
+        state = run(**p, posters=False)
+        assert state['movies'] == 291
+
+        ready = check(**p)
+        assert ready['ready']
+        assert ready['fingerprint'] == state['fingerprint']
+        assert ready['posters_warm'] is False
+
+    def test_check_after_catalog_change(self, tmp_path):
+        p = paths(tmp_path)
+        run(**p, posters=False)
+        with open(p['csv_path'], 'a') as fh:
+            fh.write('Brand New,"Drama",2024,7.0,Someone\n')
+        assert not check(**p)['ready']
+
+    def test_prefetches_top_rated_posters(self, tmp_path):
+        p = paths(tmp_path)
+        db = str(tmp_path / 'posters.sqlite3')
+        movies = pd.read_csv(CSV_PATH)
+        top = movies.loc[top_rated_rows(movies)]
+        pages = {f"{t} ({int(y)} film)": None for t, y in zip(top['title'], top['year'])}
+        with FakeWikipedia(pages) as wiki:
+            state = run(**p, poster_db=db, thumbnail_dir=str(tmp_path / 'thumbs'),
+                        base_url=wiki.url)
+
+        assert state['posters']['titles'] == 10
+        # The catalog lists Shawshank twice; the duplicate key resolves once
+        assert state['posters']['resolved'] == len(pages) == 9
+        cache = SQLitePosterCache(db, catalog_version=state['catalog_version'])
+        title, year = top['title'].iloc[0], int(top['year'].iloc[0])
+        assert cache.get((title, year))[0]
+        assert check(**p)['posters_warm']
+
+    def test_cli_exit_status(self, tmp_path, capsys):
+        p = paths(tmp_path)
+        args = ['--csv', p['csv_path'], '--artifacts', p['artifact_dir'], '--marker', p['marker']]
+        assert main(['check'] + args) == 1
+        assert main(['run', '--no-posters'] + args) == 0
+        capsys.readouterr()
+        assert main(['check'] + args) == 0
+        assert json.loads(capsys.readouterr().out)['ready']